@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Controller - limit request in-flight per host
+Naik pelan selama latency stabil (additive increase), turun cepat saat
+latency naik atau server membalas 429/503/Retry-After (multiplicative decrease)
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Status yang berarti server minta kita pelan-pelan
+THROTTLE_STATUSES = {429, 503}
+
+def parse_retry_after(value):
+    """Parse header Retry-After (detik atau HTTP-date) jadi detik"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostState:
+    """State concurrency untuk satu host"""
+
+    def __init__(self, initial_limit):
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.ewma_latency = None
+        self.baseline_latency = None
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.peak_limit = float(initial_limit)
+
+class ConcurrencySlot:
+    """Hasil satu request yang dilaporkan balik ke controller"""
+
+    def __init__(self, host):
+        self.host = host
+        self.started = time.monotonic()
+        self.status = None
+        self.latency = None
+        self.retry_after = None
+
+    def record(self, status, latency=None, retry_after=None):
+        """Catat status, latency (detik) dan Retry-After dari response"""
+        self.status = status
+        self.latency = latency if latency is not None else time.monotonic() - self.started
+        self.retry_after = retry_after if isinstance(retry_after, (int, float)) else parse_retry_after(retry_after)
+
+    def record_response(self, response):
+        """Shortcut untuk requests.Response"""
+        self.record(
+            response.status_code,
+            latency=response.elapsed.total_seconds(),
+            retry_after=response.headers.get('Retry-After')
+        )
+
+class AdaptiveConcurrencyController:
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64,
+                 latency_tolerance=1.5, backoff_factor=0.5, smoothing=0.2):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.smoothing = smoothing
+
+        self.hosts = {}
+        self.condition = threading.Condition()
+
+    def get_state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(min(self.initial_limit, self.max_limit))
+            self.hosts[host] = state
+        return state
+
+    def try_acquire(self, host):
+        """Coba ambil slot tanpa blocking, return (berhasil, detik sebelum coba lagi)"""
+        with self.condition:
+            state = self.get_state(host)
+            now = time.monotonic()
+
+            if now < state.blocked_until:
+                return False, state.blocked_until - now
+            if state.in_flight >= int(state.limit):
+                return False, None
+
+            state.in_flight += 1
+            state.requests += 1
+            return True, 0.0
+
+    def acquire(self, host):
+        """Blocking sampai ada slot kosong untuk host ini"""
+        with self.condition:
+            while True:
+                acquired, wait_time = self.try_acquire(host)
+                if acquired:
+                    return
+                self.condition.wait(timeout=wait_time if wait_time else 1.0)
+
+    def release(self, host, status=None, latency=None, retry_after=None, error=False):
+        """Kembalikan slot dan sesuaikan limit berdasarkan hasil request"""
+        with self.condition:
+            state = self.get_state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+
+            if error or status in THROTTLE_STATUSES:
+                if status in THROTTLE_STATUSES:
+                    state.throttled += 1
+                if retry_after:
+                    state.blocked_until = max(state.blocked_until, now + retry_after)
+                self.decrease(state, now)
+
+            elif latency is not None:
+                if state.ewma_latency is None:
+                    state.ewma_latency = latency
+                    state.baseline_latency = latency
+                else:
+                    state.ewma_latency += self.smoothing * (latency - state.ewma_latency)
+                    # Baseline = latency terbaik, pelan-pelan ikut naik agar tidak basi
+                    state.baseline_latency = min(state.ewma_latency,
+                                                 state.baseline_latency + 0.01 * (state.ewma_latency - state.baseline_latency))
+
+                if state.ewma_latency > state.baseline_latency * self.latency_tolerance:
+                    self.decrease(state, now)
+                else:
+                    # +1 per "window" penuh request yang sukses (seperti TCP congestion avoidance)
+                    state.limit = min(self.max_limit, state.limit + 1.0 / state.limit)
+                    state.peak_limit = max(state.peak_limit, state.limit)
+
+            self.condition.notify_all()
+
+    def decrease(self, state, now):
+        """Multiplicative decrease, maksimal sekali per latency window"""
+        cooldown = state.ewma_latency or 1.0
+        if now - state.last_decrease < cooldown:
+            return
+        state.limit = max(self.min_limit, state.limit * self.backoff_factor)
+        state.last_decrease = now
+
+    @contextmanager
+    def slot(self, url):
+        """Context manager: acquire slot untuk host dari URL, release otomatis"""
+        host = urlparse(url).netloc
+        self.acquire(host)
+        slot = ConcurrencySlot(host)
+        try:
+            yield slot
+        except Exception:
+            self.release(host, status=slot.status, latency=slot.latency,
+                         retry_after=slot.retry_after, error=slot.status is None)
+            raise
+        else:
+            self.release(host, status=slot.status, latency=slot.latency, retry_after=slot.retry_after)
+
+    def current_limit(self, host):
+        with self.condition:
+            return int(self.get_state(host).limit)
+
+    def summary(self):
+        """Statistik per host untuk report"""
+        with self.condition:
+            return {
+                host: {
+                    'current_limit': int(state.limit),
+                    'peak_limit': int(state.peak_limit),
+                    'requests': state.requests,
+                    'throttled': state.throttled,
+                    'avg_latency_ms': round((state.ewma_latency or 0) * 1000, 1)
+                }
+                for host, state in self.hosts.items()
+            }
+
+class UnlimitedConcurrency:
+    """Pengganti no-op saat adaptive concurrency tidak dipakai"""
+
+    def try_acquire(self, host):
+        return True, 0.0
+
+    def release(self, host, status=None, latency=None, retry_after=None, error=False):
+        pass
+
+    @contextmanager
+    def slot(self, url):
+        yield ConcurrencySlot(urlparse(url).netloc)
+
+    def summary(self):
+        return {}
@@ -8,13 +8,25 @@ import os
 import sys
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import time
 import json
 import re
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_cache import HTTPCache, mark_not_modified
+from adaptive_concurrency import AdaptiveConcurrencyController
+from rate_limiter import HostRateLimiter
+from robots_cache import RobotsCache
+from retry_policy import RetryPolicy
+from singleflight import SingleFlight, flight_key
+from sitemap_discovery import SitemapDiscovery
+from probe_engine import ProbeEngine
+from svg_stream import SVGStream, DEFAULT_MAX_BYTES
+from seen_set import make_seen_set, ExactSeenSet, members, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
+from crawl_scope import SiteAllowlist
 
 # Try import Selenium for deep scanning
 SELENIUM_AVAILABLE = False
@@ -29,9 +41,15 @@ except ImportError:
     pass
 
 class AggressiveSVGDownloader:
-    def __init__(self, base_url, output_dir="all_svg_download"):
+    def __init__(self, base_url, output_dir="all_svg_download", use_cache=True, max_workers=32, probe_concurrency=100,
+                 max_svg_bytes=DEFAULT_MAX_BYTES, seen_set='exact', seen_error_rate=0.001, url_policy=None,
+                 allowed_hosts=None, asset_hosts=None, respect_robots=True):
+        # Semua URL halaman/SVG di-dedupe dalam bentuk canonical (template/ == template/index.html)
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-scan: situs awal + allowed_hosts, SVG juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -40,14 +58,43 @@ class AggressiveSVGDownloader:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-run
+        self.http_cache = HTTPCache(self.output_dir / '.http_cache.json') if use_cache else None
+        
+        # Thread pool sebesar max_workers, request in-flight per host diatur controller
+        self.max_workers = max_workers
+        self.concurrency = AdaptiveConcurrencyController(max_limit=max_workers)
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy()
+        
+        # Token bucket per host untuk semua request (probe, scan, download); Crawl-delay robots.txt diterapkan di sini
+        self.rate_limiter = HostRateLimiter()
+        
+        # robots.txt per host (cache dengan TTL), URL disallow tidak di-request
+        self.robots = RobotsCache(self.session, rate_limiter=self.rate_limiter) if respect_robots else None
+        
+        # URL yang sama (beda fragment / ditemukan dua strategi) hanya di-fetch sekali
+        self.inflight = SingleFlight()
+        
+        # Brute force discovery: probe paralel dalam jumlah besar
+        self.probe_concurrency = probe_concurrency
+        
+        # Body SVG divalidasi dari KB pertama, dibatasi max_svg_bytes
+        self.max_svg_bytes = max_svg_bytes
+        self.rejected_bodies = 0
+        
         # Collections
-        self.all_svg_urls = set()
+        # all_svg_urls di-iterate untuk download, selalu exact; set dedupe lain memakai backend pilihan
+        self.all_svg_urls = ExactSeenSet()
         self.downloaded_svgs = []
+        self.downloaded_svg_urls = ExactSeenSet()
         self.failed_downloads = []
-        self.visited_pages = set()
-        self.scanned_directories = set()
-        self.css_files = set()
-        self.js_files = set()
+        self.visited_pages = make_seen_set(seen_set, seen_error_rate)
+        self.sitemap_lastmod = {}
+        self.scanned_directories = make_seen_set(seen_set, seen_error_rate)
+        self.css_files = make_seen_set(seen_set, seen_error_rate)
+        self.js_files = make_seen_set(seen_set, seen_error_rate)
         
         # Selenium setup
         self.use_selenium = SELENIUM_AVAILABLE
@@ -58,8 +105,13 @@ class AggressiveSVGDownloader:
         print(f"🎯 Target: {base_url}")
         print(f"📁 Output: {self.output_dir.absolute()}")
         print(f"🔧 Selenium: {'✅ Available' if self.use_selenium else '❌ Not available'}")
+        print(f"🤖 robots.txt: {'respected' if self.robots else 'ignored'}")
         print("="*70)
     
+    def robots_allowed(self, url):
+        """Cek robots.txt (selalu True jika respect_robots=False); fetch pertama juga memasang Crawl-delay"""
+        return self.robots is None or self.robots.allowed(url)
+    
     def setup_selenium(self):
         """Setup Selenium WebDriver"""
         try:
@@ -86,43 +138,70 @@ class AggressiveSVGDownloader:
     def download_svg_file(self, svg_url):
         """Download single SVG file"""
         try:
-            if svg_url in [svg['url'] for svg in self.downloaded_svgs]:
+            if svg_url in self.downloaded_svg_urls:
                 return True
             
-            print(f"📥 Downloading: {svg_url}")
-            
-            response = self.session.get(svg_url, timeout=15)
-            response.raise_for_status()
-            
-            # Verify it's actually SVG content
-            content_type = response.headers.get('content-type', '').lower()
-            if 'svg' not in content_type and not response.text.strip().startswith('<svg'):
-                print(f"⚠️ Not SVG content: {svg_url}")
+            if not self.robots_allowed(svg_url):
+                print(f"🤖 Disallowed by robots.txt: {svg_url}")
                 return False
             
-            # Generate filename
-            url_path = urlparse(svg_url).path
-            filename = Path(url_path).name
-            if not filename or not filename.endswith('.svg'):
-                filename = f"svg_{len(self.downloaded_svgs) + 1}.svg"
-            
-            # Handle duplicates
-            svg_file = self.output_dir / filename
-            counter = 1
-            original_stem = svg_file.stem
-            while svg_file.exists():
-                svg_file = self.output_dir / f"{original_stem}_{counter}.svg"
-                counter += 1
-            
-            # Save SVG
-            with open(svg_file, 'wb') as f:
-                f.write(response.content)
+            print(f"📥 Downloading: {svg_url}")
+            self.rate_limiter.wait(svg_url)
+            
+            headers = self.http_cache.conditional_headers(svg_url) if self.http_cache else {}
+            with self.concurrency.slot(svg_url) as slot:
+                stream = SVGStream(self.session, svg_url, self.retry_policy, headers=headers,
+                                   max_bytes=self.max_svg_bytes)
+                slot.record_response(stream.response)
+            
+            # 304: SVG di disk masih sama, analisis dari file yang tersimpan
+            unchanged = stream.status == 304
+            if unchanged:
+                mark_not_modified(self.http_cache, svg_url)
+                svg_file = self.http_cache.cached_path(svg_url)
+                content = self.http_cache.read_cached(svg_url)
+                content_type = 'image/svg+xml'
+            else:
+                stream.response.raise_for_status()
+                
+                # Verify it's actually SVG content (header + KB pertama, sisa body tidak dibaca)
+                content_type = stream.content_type.lower()
+                if not stream.is_svg:
+                    stream.close()
+                    self.rejected_bodies += 1
+                    print(f"⚠️ Not SVG content: {svg_url}")
+                    return False
+                
+                # Timpa file lama jika URL ini sudah pernah didownload
+                svg_file = self.http_cache.cached_path(svg_url) if self.http_cache else None
+                
+                if svg_file is None:
+                    # Generate filename
+                    url_path = urlparse(svg_url).path
+                    filename = Path(url_path).name
+                    if not filename or not filename.endswith('.svg'):
+                        filename = f"svg_{len(self.downloaded_svgs) + 1}.svg"
+                    
+                    # Handle duplicates
+                    svg_file = self.output_dir / filename
+                    counter = 1
+                    original_stem = svg_file.stem
+                    while svg_file.exists():
+                        svg_file = self.output_dir / f"{original_stem}_{counter}.svg"
+                        counter += 1
+                
+                # Save SVG (stream ke disk, berhenti jika melebihi max_svg_bytes)
+                stream.save(svg_file)
+                content = svg_file.read_bytes()
+                
+                if self.http_cache:
+                    self.http_cache.store(svg_url, stream.headers, svg_file)
             
-            file_size = len(response.content)
+            file_size = len(content)
             
             # Analyze SVG content
             try:
-                svg_content = response.text
+                svg_content = content.decode('utf-8', errors='replace')
                 symbol_count = len(re.findall(r'<symbol', svg_content, re.IGNORECASE))
                 path_count = len(re.findall(r'<path', svg_content, re.IGNORECASE))
                 g_count = len(re.findall(r'<g\s', svg_content, re.IGNORECASE))
@@ -142,12 +221,14 @@ class AggressiveSVGDownloader:
                 'groups': g_count,
                 'circles': circle_count,
                 'rectangles': rect_count,
+                'unchanged': unchanged,
                 'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
             self.downloaded_svgs.append(svg_info)
+            self.downloaded_svg_urls.add(svg_url)
             
-            print(f"✅ Saved: {svg_file.name}")
+            print(f"{'♻️ Unchanged' if unchanged else '✅ Saved'}: {svg_file.name}")
             print(f"   Size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
             if symbol_count > 0:
                 print(f"   Symbols: {symbol_count}")
@@ -185,13 +266,13 @@ class AggressiveSVGDownloader:
         ]
         
         for dir_url in svg_directories:
-            if dir_url in self.scanned_directories:
+            dir_url = self.canonical.canonicalize(dir_url)
+            if not self.scanned_directories.add(dir_url) or not self.robots_allowed(dir_url):
                 continue
             
-            self.scanned_directories.add(dir_url)
-            
             try:
                 print(f"🔍 Checking directory: {dir_url}")
+                self.rate_limiter.wait(dir_url)
                 response = self.session.get(dir_url, timeout=10)
                 
                 if response.status_code == 200:
@@ -201,8 +282,8 @@ class AggressiveSVGDownloader:
                     for link in soup.find_all('a', href=True):
                         href = link['href']
                         if href.endswith('.svg') or '.svg' in href:
-                            svg_url = urljoin(dir_url, href)
-                            if urlparse(svg_url).netloc == self.domain:
+                            svg_url = self.canonical.join(dir_url, href)
+                            if self.sites.allows(svg_url, is_html=False):
                                 print(f"   📎 Found: {svg_url}")
                                 self.all_svg_urls.add(svg_url)
                     
@@ -211,8 +292,8 @@ class AggressiveSVGDownloader:
                     svg_mentions = re.findall(r'["\']([^"\']*\.svg[^"\']*)["\']', page_text)
                     for mention in svg_mentions:
                         if not mention.startswith('#'):
-                            svg_url = urljoin(dir_url, mention)
-                            if urlparse(svg_url).netloc == self.domain:
+                            svg_url = self.canonical.join(dir_url, mention)
+                            if self.sites.allows(svg_url, is_html=False):
                                 print(f"   📎 Found mention: {svg_url}")
                                 self.all_svg_urls.add(svg_url)
                                 
@@ -256,12 +337,13 @@ class AggressiveSVGDownloader:
     def scan_page_with_selenium(self, page_url):
         """Scan page using Selenium"""
         try:
-            if page_url in self.visited_pages:
+            page_url = self.canonical.canonicalize(page_url)
+            if not self.visited_pages.add(page_url) or not self.robots_allowed(page_url):
                 return
             
             print(f"🌐 [Selenium] Scanning: {page_url}")
-            self.visited_pages.add(page_url)
             
+            self.rate_limiter.wait(page_url)
             self.driver.get(page_url)
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
@@ -277,12 +359,13 @@ class AggressiveSVGDownloader:
     def scan_page_with_requests(self, page_url):
         """Scan page using requests"""
         try:
-            if page_url in self.visited_pages:
+            page_url = self.canonical.canonicalize(page_url)
+            if not self.visited_pages.add(page_url) or not self.robots_allowed(page_url):
                 return
             
             print(f"🌐 [Requests] Scanning: {page_url}")
-            self.visited_pages.add(page_url)
             
+            self.rate_limiter.wait(page_url)
             response = self.session.get(page_url, timeout=15)
             response.raise_for_status()
             
@@ -313,8 +396,8 @@ class AggressiveSVGDownloader:
                 url = element.get(attr, '').strip()
                 if url and '.svg' in url:
                     clean_url = url.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         self.all_svg_urls.add(absolute_url)
         
         # Method 2: CSS styles
@@ -333,8 +416,8 @@ class AggressiveSVGDownloader:
             for match in svg_matches:
                 if '/' in match:
                     clean_url = match.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         self.all_svg_urls.add(absolute_url)
         
         # Method 4: Data attributes
@@ -342,8 +425,8 @@ class AggressiveSVGDownloader:
             for attr, value in element.attrs.items():
                 if isinstance(value, str) and '.svg' in value:
                     clean_url = value.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         self.all_svg_urls.add(absolute_url)
         
         # Method 5: Text pattern matching
@@ -359,8 +442,8 @@ class AggressiveSVGDownloader:
             for match in matches:
                 if not match.startswith('#'):
                     clean_url = match.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         self.all_svg_urls.add(absolute_url)
     
     def extract_svg_from_css(self, css_content, base_url):
@@ -368,8 +451,8 @@ class AggressiveSVGDownloader:
         svg_matches = re.findall(r'url\(["\']?([^"\']*\.svg[^"\']*)["\']?\)', css_content)
         for match in svg_matches:
             clean_url = match.split('#')[0]
-            absolute_url = urljoin(base_url, clean_url)
-            if urlparse(absolute_url).netloc == self.domain:
+            absolute_url = self.canonical.join(base_url, clean_url)
+            if self.sites.allows(absolute_url, is_html=False):
                 self.all_svg_urls.add(absolute_url)
     
     def scan_css_files(self):
@@ -387,13 +470,14 @@ class AggressiveSVGDownloader:
         ]
         
         for css_url in css_urls:
-            if css_url in self.css_files:
+            css_url = self.canonical.canonicalize(css_url)
+            if not self.css_files.add(css_url) or not self.robots_allowed(css_url):
                 continue
             
             try:
                 print(f"🎨 Scanning CSS: {css_url}")
-                self.css_files.add(css_url)
                 
+                self.rate_limiter.wait(css_url)
                 response = self.session.get(css_url, timeout=10)
                 if response.status_code == 200:
                     self.extract_svg_from_css(response.text, css_url)
@@ -437,39 +521,33 @@ class AggressiveSVGDownloader:
             f"{self.base_url}/icons/",
         ]
         
-        total_tests = len(base_paths) * len(common_svg_names)
-        current_test = 0
+        # URL yang disallow di robots.txt tidak di-probe
+        probe_urls = [self.canonical.canonicalize(base_path + svg_name) for base_path in base_paths for svg_name in common_svg_names]
+        probe_urls = [url for url in probe_urls if self.robots_allowed(url)]
+        
+        total_tests = len(probe_urls)
+        progress = {'done': 0}
         
         print(f"🎯 Testing {total_tests} potential SVG URLs...")
         
-        # Use threading for faster testing
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = []
-            
-            for base_path in base_paths:
-                for svg_name in common_svg_names:
-                    svg_url = base_path + svg_name
-                    future = executor.submit(self.test_and_add_svg, svg_url)
-                    futures.append(future)
-            
-            for future in as_completed(futures):
-                current_test += 1
-                if current_test % 50 == 0:
-                    print(f"   📊 Progress: {current_test}/{total_tests} URLs tested")
-    
-    def test_and_add_svg(self, svg_url):
-        """Test SVG URL and add if exists"""
-        try:
-            response = self.session.head(svg_url, timeout=5)
-            if response.status_code == 200:
-                content_type = response.headers.get('content-type', '').lower()
-                if 'svg' in content_type or 'xml' in content_type:
-                    print(f"   ✅ Found SVG: {svg_url}")
-                    self.all_svg_urls.add(svg_url)
-                    return True
-        except:
-            pass
-        return False
+        def on_result(result):
+            """Hasil probe di-stream begitu selesai"""
+            progress['done'] += 1
+            if result.status == 200 and result.looks_like_svg():
+                print(f"   ✅ Found SVG: {result.url}")
+                self.all_svg_urls.add(result.url)
+            if progress['done'] % 200 == 0:
+                print(f"   📊 Progress: {progress['done']}/{total_tests} URLs tested")
+        
+        # Probe HEAD paralel lewat koneksi keep-alive (URL duplikat hanya di-probe sekali),
+        # tiap probe menunggu token host (Crawl-delay robots.txt membatasi laju probe)
+        engine = ProbeEngine(concurrency=self.probe_concurrency, headers=dict(self.session.headers),
+                             rate_limiter=self.rate_limiter)
+        engine.run(probe_urls, on_result)
+        
+        probe_stats = engine.summary()
+        print(f"   ⚡ {probe_stats['probes']} probes in {probe_stats['elapsed']}s "
+              f"({probe_stats['probes_per_second']} probes/s)")
     
     def crawl_all_pages_for_svgs(self):
         """Crawl all pages found to extract more SVG references"""
@@ -482,17 +560,33 @@ class AggressiveSVGDownloader:
             f"{self.base_url}/template/index.html",
         ]
         
+        # Seed dari sitemap.xml / robots.txt Sitemap: supaya tidak hanya satu hop per halaman
+        discovery = SitemapDiscovery(self.session, robots=self.robots)
+        for page_url, lastmod in discovery.discover(self.base_url):
+            page_url = self.canonical.canonicalize(page_url)
+            if self.sites.allows(page_url) and page_url not in self.visited_pages and self.robots_allowed(page_url):
+                pages_to_crawl.append(page_url)
+                if lastmod:
+                    self.sitemap_lastmod[page_url] = lastmod
+        if discovery.stats['urls_found']:
+            print(f"🗺️ Sitemap: {discovery.stats['urls_found']} pages from {discovery.stats['sitemaps_fetched']} sitemaps")
+        
         crawled_count = 0
         max_crawl = 50  # Limit to prevent infinite crawling
         
+        # Be nice to server: maksimal satu halaman per 0.3 detik per host (Crawl-delay lewat self.rate_limiter)
+        rate_limiter = HostRateLimiter(delay=0.3)
+        
         while pages_to_crawl and crawled_count < max_crawl:
-            page_url = pages_to_crawl.pop(0)
+            page_url = self.canonical.canonicalize(pages_to_crawl.pop(0))
             
-            if page_url in self.visited_pages:
+            if page_url in self.visited_pages or not self.robots_allowed(page_url):
                 continue
             
             try:
                 print(f"🕷️ Crawling: {page_url}")
+                rate_limiter.wait(page_url)
+                self.rate_limiter.wait(page_url)
                 response = self.session.get(page_url, timeout=15)
                 
                 if response.status_code == 200:
@@ -507,14 +601,12 @@ class AggressiveSVGDownloader:
                     for link in soup.find_all('a', href=True):
                         href = link['href']
                         if href and not href.startswith(('#', 'javascript:', 'mailto:')):
-                            absolute_url = urljoin(page_url, href)
-                            if (urlparse(absolute_url).netloc == self.domain and
+                            absolute_url = self.canonical.join(page_url, href)
+                            if (self.sites.allows(absolute_url) and
                                 absolute_url not in self.visited_pages and
                                 (absolute_url.endswith('.html') or '.' not in Path(urlparse(absolute_url).path).name)):
                                 pages_to_crawl.append(absolute_url)
                 
-                time.sleep(0.3)  # Be nice to server
-                
             except Exception as e:
                 print(f"❌ Crawl error on {page_url}: {e}")
         
@@ -531,9 +623,10 @@ class AggressiveSVGDownloader:
         
         print(f"🎯 Found {len(self.all_svg_urls)} potential SVG URLs")
         
-        # Download with threading for speed
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(self.download_svg_file, svg_url): svg_url 
+        # Download with threading for speed (in-flight per host diatur controller)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.inflight.do, ('download', flight_key(svg_url)),
+                                       self.download_svg_file, svg_url): svg_url
                       for svg_url in self.all_svg_urls}
             
             for future in as_completed(futures):
@@ -568,6 +661,9 @@ class AggressiveSVGDownloader:
         # Download all found SVGs
         self.download_all_found_svgs()
         
+        if self.http_cache:
+            self.http_cache.save()
+        
         # Final summary
         self.print_final_summary()
         
@@ -575,6 +671,10 @@ class AggressiveSVGDownloader:
         if hasattr(self, 'driver'):
             self.driver.quit()
     
+    def seen_sets_summary(self):
+        return seen_sets_summary(visited_pages=self.visited_pages, scanned_directories=self.scanned_directories,
+                                 css_files=self.css_files, js_files=self.js_files, all_svg_urls=self.all_svg_urls)
+    
     def print_final_summary(self):
         """Print comprehensive final summary"""
         print("\n" + "="*70)
@@ -586,10 +686,18 @@ class AggressiveSVGDownloader:
         print(f"   📁 Directories checked: {len(self.scanned_directories)}")
         print(f"   🎨 CSS files scanned: {len(self.css_files)}")
         print(f"   🔍 Total SVG URLs found: {len(self.all_svg_urls)}")
+        print(f"   🧮 Seen-sets: {format_seen_sets(self.seen_sets_summary())}")
         
         print(f"\n📥 DOWNLOAD RESULTS:")
         print(f"   ✅ Successfully downloaded: {len(self.downloaded_svgs)}")
         print(f"   ❌ Failed downloads: {len(self.failed_downloads)}")
+        print(f"   🚫 Non-SVG bodies dropped: {self.rejected_bodies}")
+        if self.robots:
+            print(f"   🤖 Disallowed by robots.txt: {self.robots.summary()['disallowed']}")
+        for host, host_stats in self.concurrency.summary().items():
+            print(f"   ⚙️ Concurrency {host}: limit {host_stats['current_limit']} (peak {host_stats['peak_limit']}), "
+                  f"{host_stats['throttled']} throttled")
+        print(f"   ♻️ Unchanged (304): {sum(1 for svg in self.downloaded_svgs if svg.get('unchanged'))}")
         
         if self.downloaded_svgs:
             total_size = sum(svg['size_bytes'] for svg in self.downloaded_svgs)
@@ -640,12 +748,22 @@ class AggressiveSVGDownloader:
             'download_results': {
                 'successful_downloads': len(self.downloaded_svgs),
                 'failed_downloads': len(self.failed_downloads),
+                'non_svg_dropped': self.rejected_bodies,
+                'unchanged_downloads': sum(1 for svg in self.downloaded_svgs if svg.get('unchanged')),
                 'total_size_bytes': sum(svg['size_bytes'] for svg in self.downloaded_svgs) if self.downloaded_svgs else 0
             },
+            'concurrency': self.concurrency.summary(),
+            'rate_limit': self.rate_limiter.summary(),
+            'robots': self.robots.summary() if self.robots else None,
+            'retries': self.retry_policy.summary(),
+            'coalesced': self.inflight.summary(),
+            'canonical_urls': self.canonical.summary(),
+            'sitemap_lastmod': self.sitemap_lastmod,
+            'seen_sets': self.seen_sets_summary(),
             'all_svg_urls_found': list(self.all_svg_urls),
             'downloaded_svgs': self.downloaded_svgs,
             'failed_downloads': self.failed_downloads,
-            'visited_pages': list(self.visited_pages)
+            'visited_pages': members(self.visited_pages)
         }
         
         report_file = self.output_dir / 'aggressive_svg_report.json'
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Async Web Scraper - engine asyncio untuk WebScraper
+Ratusan request in-flight dari satu process tanpa satu thread per worker
+"""
+
+import sys
+import asyncio
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from web_scraper import WebScraper
+from http_cache import mark_not_modified
+from adaptive_concurrency import ConcurrencySlot
+from retry_policy import CircuitOpenError
+from crawl_budget import BudgetExhaustedError
+from content_decoding import DecodingWriter
+from singleflight import AsyncSingleFlight, flight_key
+from crawl_priority import content_type
+from crawl_frontier import AsyncFrontier, FRONTIER_FILE, DONE, FAILED, DROPPED, SKIPPED
+
+# Try import aiohttp
+AIOHTTP_AVAILABLE = False
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    pass
+
+class AsyncWebScraper(WebScraper):
+    """Drop-in pengganti WebScraper: start_scraping() yang sama, backend asyncio"""
+
+    def __init__(self, base_url, download_dir="downloaded_site", max_workers=100, parse_workers=2, use_cache=True, adaptive=False,
+                 delay=0, burst=1, segments=0, priority_weights=None, respect_robots=True,
+                 max_bandwidth=None, bandwidth_shares=None, connect_timeout=10, read_timeout=30,
+                 total_timeout=300, time_budget=None, io_workers=2, resume=False, seen_set='exact',
+                 seen_error_rate=0.001, url_policy=None, max_depth=None, path_prefixes=None,
+                 exclude_prefixes=None, max_pages_per_prefix=None, allowed_hosts=None, asset_hosts=None,
+                 per_host_limit=None, host_scheduling='round_robin', host_weights=None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("Async engine butuh aiohttp: pip install aiohttp")
+
+        super().__init__(base_url, download_dir, max_workers=max_workers, use_cache=use_cache, adaptive=adaptive,
+                         delay=delay, burst=burst, segments=segments, priority_weights=priority_weights,
+                         respect_robots=respect_robots, max_bandwidth=max_bandwidth,
+                         bandwidth_shares=bandwidth_shares, connect_timeout=connect_timeout,
+                         read_timeout=read_timeout, total_timeout=total_timeout, time_budget=time_budget,
+                         io_workers=io_workers, resume=resume, seen_set=seen_set,
+                         seen_error_rate=seen_error_rate, url_policy=url_policy, max_depth=max_depth,
+                         path_prefixes=path_prefixes, exclude_prefixes=exclude_prefixes,
+                         max_pages_per_prefix=max_pages_per_prefix, allowed_hosts=allowed_hosts,
+                         asset_hosts=asset_hosts, per_host_limit=per_host_limit,
+                         host_scheduling=host_scheduling, host_weights=host_weights)
+
+        # Parsing HTML (BeautifulSoup) tetap CPU-bound, jalankan di thread terpisah
+        self.parse_workers = parse_workers
+        self.loop = None
+        self.loop_thread_id = None
+        self.frontier = None
+        self.http = None
+        self.parse_executor = None
+        self.slot_released = None
+
+        # Singleflight versi asyncio: coroutine lain await Future yang sama
+        self.inflight = AsyncSingleFlight()
+
+    def enqueue_url(self, url, is_html, hub_bonus=0, depth=0):
+        """Masukkan URL ke frontier asyncio (aman dipanggil dari thread parser)"""
+        if self.loop is None:
+            return
+
+        item = self.priority.entry(url, is_html, hub_bonus, depth)
+        if threading.get_ident() == self.loop_thread_id:
+            self.put_entry(item)
+        else:
+            self.loop.call_soon_threadsafe(self.put_entry, item)
+
+    def put_entry(self, item):
+        """Di event loop: jadwalkan entry ke frontier, hitung hanya jika frontier menerimanya"""
+        self.frontier.put_nowait(item).add_done_callback(lambda future: self.entry_added(future, item))
+
+    def entry_added(self, future, item):
+        if not future.cancelled() and future.exception() is None and future.result():
+            self.priority.accepted(item[2], item[3])
+
+    @asynccontextmanager
+    async def concurrency_slot(self, url):
+        """Versi async dari concurrency.slot() tanpa memblokir event loop"""
+        host = urlparse(url).netloc
+        while True:
+            acquired, wait_time = self.concurrency.try_acquire(host)
+            if acquired:
+                break
+            self.slot_released.clear()
+            try:
+                await asyncio.wait_for(self.slot_released.wait(), timeout=wait_time or 1.0)
+            except asyncio.TimeoutError:
+                pass
+
+        slot = ConcurrencySlot(host)
+        try:
+            yield slot
+        except Exception:
+            self.concurrency.release(host, status=slot.status, latency=slot.latency,
+                                     retry_after=slot.retry_after, error=slot.status is None)
+            raise
+        else:
+            self.concurrency.release(host, status=slot.status, latency=slot.latency, retry_after=slot.retry_after)
+        finally:
+            self.slot_released.set()
+
+    async def write_behind(self, f, data):
+        """Serahkan buffer ke thread I/O; backpressure ditunggu di executor supaya event loop tidak terblokir"""
+        if not f.try_write(data):
+            await self.loop.run_in_executor(None, f.write, data)
+
+    async def fetch_to_file_async(self, url, file_path, is_html=False):
+        """Satu percobaan request + tulis body, return True jika 304 (unchanged)"""
+        self.budget.check(url)
+
+        # Ada .part dari percobaan/run sebelumnya: lanjutkan dengan Range
+        partial = self.resumable.open(url, file_path)
+        headers = partial.request_headers()
+        if not headers and self.http_cache:
+            headers = self.http_cache.conditional_headers(url)
+
+        # Tunggu token host ini tanpa memblokir coroutine lain
+        wait_time = self.rate_limiter.reserve(url)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+        # Slot concurrency per host dipegang selama request + tulis body
+        # ClientTimeout per request: connect, sock_read, dan total (dipotong sisa budget crawl)
+        async with self.concurrency_slot(url) as slot, \
+                self.http.get(url, headers=headers, timeout=self.timeouts.aiohttp_timeout()) as response:
+            slot.record(response.status, retry_after=response.headers.get('Retry-After'))
+
+            # 304: file di disk masih sama, skip write
+            if response.status == 304:
+                mark_not_modified(self.http_cache, url)
+                return True
+
+            # Range .part tidak bisa dipenuhi: .part lengkap di-rename, atau dibuang lalu retry tanpa Range
+            if response.status == 416 and partial.offset:
+                partial.range_not_satisfiable(response.headers)
+                if self.http_cache:
+                    self.http_cache.store(url, response.headers, file_path)
+                return False
+
+            response.raise_for_status()
+
+            # Tulis ke .part, byte yang sudah diterima dicatat jika koneksi putus
+            with self.bandwidth.transfer(content_type(url, is_html)) as transfer:
+                if self.segmented.should_segment(response.status, response.headers):
+                    await self.segmented.download_async(self.http, url, response, partial, transfer,
+                                                        self.timeouts.deadline(url))
+                    total = int(response.headers['Content-Length'])
+                    self.transfer_stats.record('identity', total, total)
+                else:
+                    # auto_decompress=False: chunk masih ter-encode, decode sendiri
+                    # Tulis lewat thread I/O; saat antrian disk penuh tunggu di executor, bukan di event loop
+                    f = self.io_pool.open(partial.part_path, partial.prepare(response.status, response.headers))
+                    try:
+                        writer = DecodingWriter(f, response.headers.get('Content-Encoding'))
+                        async for chunk in response.content.iter_any():
+                            # Batas bandwidth global: tunggu tanpa memblokir coroutine lain
+                            wait_time = transfer.reserve(len(chunk))
+                            if wait_time > 0:
+                                await asyncio.sleep(wait_time)
+                            await self.write_behind(f, writer.decode(chunk))
+                        await self.write_behind(f, writer.flush())
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        await self.loop.run_in_executor(None, f.__exit__, Exception, None, None)
+                        partial.interrupted()
+                        raise
+                    except BaseException:
+                        await self.loop.run_in_executor(None, f.__exit__, Exception, None, None)
+                        raise
+                    await self.loop.run_in_executor(None, f.close)
+                    self.transfer_stats.record(writer.encoding, writer.wire_bytes, writer.decoded_bytes)
+            partial.finish()
+
+            if self.http_cache:
+                self.http_cache.store(url, response.headers, file_path)
+
+        return False
+
+    async def download_file_async(self, url, file_path, is_html=False, depth=0):
+        """Versi async dari download_file"""
+        if url in self.downloaded_urls:
+            return True
+
+        return await self.inflight.do(flight_key(url), self.download_file_once_async, url, file_path, is_html, depth)
+
+    async def download_file_once_async(self, url, file_path, is_html=False, depth=0):
+        """Versi async dari download_file_once"""
+        try:
+            self.logger.info(f"Downloading: {url}")
+
+            # Error transient di-retry dengan backoff, host yang down di-skip circuit breaker
+            unchanged = await self.retry_policy.execute_async(url, lambda: self.fetch_to_file_async(url, file_path, is_html))
+
+            self.downloaded_urls.add(url)
+            if unchanged:
+                self.logger.info(f"= Unchanged: {file_path}")
+            else:
+                self.logger.info(f"✓ Downloaded: {file_path}")
+
+            # Parse HTML di executor supaya event loop tidak terblokir
+            if is_html:
+                await self.loop.run_in_executor(
+                    self.parse_executor, self.parse_html_for_resources, file_path, url, depth
+                )
+
+            return True
+
+        except CircuitOpenError as e:
+            self.logger.warning(f"⏸ Skipped {url}: {e}")
+            self.failed_urls.add(url)
+            return False
+        except BudgetExhaustedError as e:
+            self.logger.warning(f"⏸ Skipped {url}: {e}")
+            return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"✗ Failed to download {url}: {e}")
+            self.failed_urls.add(url)
+            return False
+        except Exception as e:
+            self.logger.error(f"✗ Error downloading {url}: {e}")
+            self.failed_urls.add(url)
+            return False
+
+    async def worker(self):
+        """Coroutine worker untuk HTML dan resource"""
+        while True:
+            priority, _, url, is_html, depth = await self.frontier.get()
+            state = DROPPED
+            try:
+                # Budget menipis/habis: buang pekerjaan prioritas rendah, frontier tetap dikuras
+                if not self.budget.allows(-priority):
+                    continue
+
+                # Halaman yang di-readmit frontier (ditemukan lebih dangkal) sudah ada di disk
+                readmitted = is_html and url in self.downloaded_urls
+
+                # Kuota halaman prefix ini sudah habis (tidak antri lagi saat --resume)
+                if not readmitted and not self.scope.take(url, is_html):
+                    state = SKIPPED
+                    continue
+
+                file_path = self.create_directory_structure(url)
+
+                # Pastikan file HTML memiliki ekstensi
+                if is_html and not file_path.suffix:
+                    file_path = file_path.with_suffix('.html')
+
+                # Parse ulang file lokal dengan depth baru, tanpa fetch lagi
+                if readmitted:
+                    await self.loop.run_in_executor(
+                        self.parse_executor, self.parse_html_for_resources, file_path, url, depth
+                    )
+                    state = DONE
+                    continue
+
+                if await self.download_file_async(url, file_path, is_html=is_html, depth=depth):
+                    state = DONE
+                elif url in self.failed_urls:
+                    state = FAILED
+            except Exception as e:
+                # Error tak terduga hanya menggagalkan URL ini, worker tetap hidup
+                self.logger.error(f"✗ Worker error on {url}: {e}")
+                self.failed_urls.add(url)
+                state = FAILED
+            finally:
+                self.frontier.task_done(url, state)
+
+    async def monitor_progress(self):
+        """Log status frontier secara berkala"""
+        while True:
+            await asyncio.sleep(5)
+            self.logger.info(f"Queue status - Frontier: {self.frontier.qsize()}, In flight: {self.frontier.in_flight()}, "
+                             f"Downloaded: {len(self.downloaded_urls)}")
+
+    async def crawl(self):
+        """Jalankan crawl sampai frontier kosong dan semua worker idle"""
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.frontier = AsyncFrontier(self.download_dir / FRONTIER_FILE, resume=self.resume,
+                                      scheduler=self.host_scheduler, max_depth=self.scope.max_depth)
+        if self.frontier.store.resumed:
+            frontier_stats = self.frontier.summary()
+            self.logger.info(f"Resuming crawl: {frontier_stats['queued']} URLs queued, "
+                             f"{frontier_stats['done']} already done")
+            if self.scope.max_pages_per_prefix is not None:
+                self.scope.restore(self.frontier.store.urls(DONE, FAILED, html_only=True))
+        self.slot_released = asyncio.Event()
+        self.parse_executor = ThreadPoolExecutor(max_workers=self.parse_workers)
+
+        connector = aiohttp.TCPConnector(limit=self.max_workers, ttl_dns_cache=300)
+        timeout = self.timeouts.aiohttp_timeout()
+
+        try:
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout,
+                                             auto_decompress=False) as http:
+                self.http = http
+                self.enqueue_url(self.canonical.canonicalize(self.base_url), True)
+
+                tasks = [asyncio.create_task(self.worker()) for _ in range(self.max_workers)]
+                tasks.append(asyncio.create_task(self.monitor_progress()))
+
+                # join() raise jika SQLite frontier gagal (mis. commit): worker dihentikan, crawl berhenti
+                try:
+                    await self.frontier.join()
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.parse_executor.shutdown(wait=True)
+            self.frontier.close()
+            self.loop = None
+
+    def start_scraping(self):
+        """Mulai proses scraping (kontrak sama dengan WebScraper)"""
+        self.logger.info(f"Starting async scraping of {self.base_url}")
+        self.logger.info(f"Download directory: {self.download_dir.absolute()}")
+        self.logger.info(f"Concurrency: {self.max_workers} in-flight requests")
+
+        # Buat direktori download
+        self.download_dir.mkdir(exist_ok=True)
+        self.budget.start()
+
+        try:
+            asyncio.run(self.crawl())
+        except KeyboardInterrupt:
+            self.logger.info("Scraping interrupted by user")
+        except sqlite3.Error as e:
+            self.logger.error(f"Crawl aborted, frontier database error: {e}")
+
+        if self.http_cache:
+            self.http_cache.save()
+
+        self.print_summary()
+
+def main():
+    """Main function"""
+    base_url = "https://admin.pixelstrap.net/mofi/template/"
+    download_dir = "mofi_template_downloaded"
+
+    print("="*60)
+    print("ASYNC WEB SCRAPER - MOFI TEMPLATE")
+    print("="*60)
+    print(f"Target URL: {base_url}")
+    print(f"Download Directory: {download_dir}")
+    print("="*60)
+
+    try:
+        scraper = AsyncWebScraper(base_url, download_dir, max_workers=100)
+        scraper.start_scraping()
+        print("\n✓ Scraping completed successfully!")
+        print(f"Check the '{download_dir}' directory for downloaded files.")
+
+    except Exception as e:
+        print(f"\n✗ Error during scraping: {e}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark engine threaded (WebScraper) vs asyncio (AsyncWebScraper)
+terhadap test site lokal dengan latency buatan
+"""
+
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from web_scraper import WebScraper
+from async_scraper import AsyncWebScraper, AIOHTTP_AVAILABLE
+
+class TestSiteServer(ThreadingHTTPServer):
+    """HTTP server lokal: index -> N halaman -> M asset per halaman"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, pages, assets_per_page, asset_size, latency):
+        self.pages = pages
+        self.assets_per_page = assets_per_page
+        self.asset_body = b'x' * asset_size
+        self.latency = latency
+        super().__init__(('127.0.0.1', 0), TestSiteHandler)
+
+    def render_page(self, page_id):
+        links = ''.join(f'<a href="page_{i}.html">page {i}</a>' for i in range(self.pages))
+        assets = ''.join(f'<img src="assets/img_{page_id}_{j}.png">' for j in range(self.assets_per_page))
+        return f'<html><body>{links}{assets}</body></html>'.encode()
+
+class TestSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+
+        path = self.path.split('?')[0]
+        if path in ('', '/', '/index.html'):
+            body, content_type = self.server.render_page('index'), 'text/html'
+        elif path.startswith('/page_'):
+            body, content_type = self.server.render_page(path[len('/page_'):-len('.html')]), 'text/html'
+        elif path.startswith('/assets/'):
+            body, content_type = self.server.asset_body, 'image/png'
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_engine(scraper_class, base_url, workers):
+    """Jalankan satu engine ke direktori sementara, return (detik, berhasil, gagal)"""
+    download_dir = tempfile.mkdtemp(prefix='bench_')
+    try:
+        scraper = scraper_class(base_url, download_dir, max_workers=workers)
+        scraper.logger.setLevel(logging.WARNING)
+
+        start_time = time.perf_counter()
+        scraper.start_scraping()
+        elapsed = time.perf_counter() - start_time
+
+        return elapsed, len(scraper.downloaded_urls), len(scraper.failed_urls)
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark threaded vs asyncio crawl engine')
+    parser.add_argument('--pages', type=int, default=20,
+                       help='Jumlah halaman HTML di test site (default: 20)')
+    parser.add_argument('--assets', type=int, default=25,
+                       help='Jumlah asset per halaman (default: 25)')
+    parser.add_argument('--asset-size', type=int, default=16384,
+                       help='Ukuran tiap asset dalam bytes (default: 16384)')
+    parser.add_argument('--latency', type=float, default=0.05,
+                       help='Latency buatan per request dalam detik (default: 0.05)')
+    parser.add_argument('--threaded-workers', type=int, default=8,
+                       help='Worker threads untuk engine threaded (default: 8)')
+    parser.add_argument('--async-workers', type=int, default=200,
+                       help='Request in-flight untuk engine asyncio (default: 200)')
+
+    args = parser.parse_args()
+
+    if not AIOHTTP_AVAILABLE:
+        print("❌ aiohttp tidak terinstall: pip install aiohttp")
+        return 1
+
+    server = TestSiteServer(args.pages, args.assets, args.asset_size, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    # Index + N halaman, masing-masing dengan M asset sendiri (index juga punya asset)
+    total_urls = (1 + args.pages) * (1 + args.assets)
+
+    print("="*70)
+    print("CRAWL ENGINE BENCHMARK")
+    print("="*70)
+    print(f"Test site: {base_url}")
+    print(f"Expected URLs: {total_urls} ({1 + args.pages} pages x {args.assets} assets)")
+    print(f"Latency: {args.latency * 1000:.0f} ms/request")
+    print("="*70)
+
+    results = []
+    engines = [
+        (f"threaded ({args.threaded_workers} workers)", WebScraper, args.threaded_workers),
+        (f"asyncio ({args.async_workers} in-flight)", AsyncWebScraper, args.async_workers),
+    ]
+
+    try:
+        for name, scraper_class, workers in engines:
+            print(f"⏱️  Running {name}...")
+            elapsed, downloaded, failed = run_engine(scraper_class, base_url, workers)
+            results.append((name, elapsed, downloaded, failed))
+    finally:
+        server.shutdown()
+
+    print("\n" + "="*70)
+    print(f"{'Engine':<32} {'Time (s)':>10} {'Files':>8} {'Failed':>8} {'URL/s':>8}")
+    print("-"*70)
+    for name, elapsed, downloaded, failed in results:
+        print(f"{name:<32} {elapsed:>10.2f} {downloaded:>8} {failed:>8} {downloaded / elapsed:>8.1f}")
+    print("="*70)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark streaming writer: CPU time per MB
+iter_content / iter_raw 8 KB (sebelum) vs iter_chunks adaptif + buffer reusable (sesudah)
+"""
+
+import os
+import sys
+import gzip
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from content_decoding import iter_raw, DecodingWriter
+from chunk_reader import iter_chunks
+
+MB = 1024 * 1024
+
+class BodyServer(ThreadingHTTPServer):
+    """HTTP server lokal: /identity (Content-Length), /chunked, /gzip"""
+    daemon_threads = True
+
+    def __init__(self, size):
+        self.body = os.urandom(size // 2) + b'a' * (size - size // 2)
+        self.gzip_body = gzip.compress(self.body, compresslevel=1)
+        super().__init__(('127.0.0.1', 0), BodyHandler)
+
+class BodyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.server.gzip_body if self.path == '/gzip' else self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        if self.path == '/gzip':
+            self.send_header('Content-Encoding', 'gzip')
+
+        if self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for start in range(0, len(body), 65536):
+                piece = body[start:start + 65536]
+                self.wfile.write(b'%x\r\n' % len(piece) + piece + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+            return
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def read_iter_content(response):
+    return response.iter_content(chunk_size=8192)
+
+def read_iter_raw(response):
+    return iter_raw(response, 8192)
+
+def read_iter_chunks(response):
+    return iter_chunks(response)
+
+READERS = [
+    ('iter_content 8 KB (before)', read_iter_content, True),
+    ('iter_raw 8 KB (before)', read_iter_raw, False),
+    ('iter_chunks adaptive (after)', read_iter_chunks, False),
+]
+
+def run_reader(session, url, reader, decoded, sink):
+    """Satu download ke sink; return (cpu detik thread ini, jumlah chunk, byte hasil)"""
+    started = time.thread_time()
+    chunks = 0
+    with session.get(url, stream=True) as response:
+        # iter_content sudah decode sendiri; lainnya lewat DecodingWriter seperti WebScraper
+        writer = DecodingWriter(sink, None if decoded else response.headers.get('Content-Encoding'))
+        for chunk in reader(response):
+            chunks += 1
+            writer.write(chunk)
+        writer.finish()
+    return time.thread_time() - started, chunks, writer.decoded_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CPU time per MB of streaming body readers')
+    parser.add_argument('--size', type=int, default=64,
+                       help='Ukuran body dalam MB (default: 64)')
+    parser.add_argument('--rounds', type=int, default=5,
+                       help='Jumlah pengulangan per reader, diambil yang tercepat (default: 5)')
+
+    args = parser.parse_args()
+
+    server = BodyServer(args.size * MB)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print("="*78)
+    print("STREAMING WRITER BENCHMARK")
+    print("="*78)
+    print(f"Body: {args.size} MB, best of {args.rounds} rounds, CPU = thread_time of the reader thread")
+    print("="*78)
+
+    session = requests.Session()
+    results = []
+    try:
+        with open(os.devnull, 'wb') as sink:
+            for path in ('identity', 'chunked', 'gzip'):
+                for name, reader, decoded in READERS:
+                    runs = [run_reader(session, f"{base_url}/{path}", reader, decoded, sink) for _ in range(args.rounds)]
+                    cpu, chunks, size = min(runs)
+                    results.append((path, name, cpu, chunks, size))
+    finally:
+        server.shutdown()
+
+    print(f"{'Body':<10} {'Reader':<30} {'CPU ms/MB':>10} {'Chunks':>8} {'vs before':>10}")
+    print("-"*78)
+    baseline = {}
+    for path, name, cpu, chunks, size in results:
+        per_mb = cpu * 1000 / (size / MB)
+        baseline.setdefault(path, per_mb)
+        print(f"{path:<10} {name:<30} {per_mb:>10.3f} {chunks:>8} {baseline[path] / per_mb:>9.1f}x")
+    print("="*78)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
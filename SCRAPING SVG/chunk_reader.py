@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Chunk Reader - baca body streaming dengan ukuran chunk adaptif dan buffer yang dipakai ulang
+Body identity dibaca readinto ke buffer per thread (tanpa alokasi bytes per chunk)
+"""
+
+import time
+import threading
+import http.client
+
+import requests
+
+from content_decoding import iter_raw, ProtocolError, ReadTimeoutError, SSLError
+
+try:
+    from urllib3.exceptions import IncompleteRead
+except ImportError:
+    from requests.packages.urllib3.exceptions import IncompleteRead
+
+# Batas ukuran chunk: kecil untuk server lambat, besar untuk transfer cepat
+MIN_CHUNK_SIZE = 16 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+class ChunkSizer:
+    """Ukuran chunk mengikuti kecepatan transfer: kira-kira target_seconds data per read"""
+
+    def __init__(self, min_size=MIN_CHUNK_SIZE, max_size=MAX_CHUNK_SIZE, target_seconds=0.05, smoothing=0.3):
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.target_seconds = target_seconds
+        self.smoothing = smoothing
+        self.rate = None
+        self.size = min_size
+        self.filled = False
+        self.reads = 0
+        self.bytes = 0
+
+    @property
+    def fast(self):
+        """Read terakhir terisi penuh dan chunk berikutnya diperkirakan datang dalam target_seconds
+
+        Hanya saat itu readinto (blocking sampai buffer penuh) aman dipakai; byte yang kebetulan
+        sudah ada di buffer socket tidak cukup, server slow-drip tidak pernah mengisi satu chunk.
+        """
+        return self.filled and self.rate is not None and self.rate * self.target_seconds >= self.size
+
+    def update(self, nbytes, seconds, requested=None):
+        """Catat satu read; chunk naik maksimal 2x per read, turun langsung saat transfer melambat"""
+        self.reads += 1
+        self.bytes += nbytes
+        self.filled = requested is not None and nbytes >= requested
+        if not nbytes:
+            return
+
+        rate = nbytes / seconds if seconds > 0 else self.max_size / self.target_seconds
+        self.rate = rate if self.rate is None else self.rate + self.smoothing * (rate - self.rate)
+
+        wanted = self.min_size
+        while wanted * 2 <= self.rate * self.target_seconds and wanted < self.max_size:
+            wanted *= 2
+        self.size = min(wanted, self.size * 2, self.max_size)
+
+class BufferPool:
+    """Satu bytearray per thread, dipakai ulang untuk semua transfer di thread itu"""
+
+    def __init__(self, size=MAX_CHUNK_SIZE):
+        self.size = size
+        self.local = threading.local()
+
+    def view(self):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            buffer = self.local.buffer = memoryview(bytearray(self.size))
+        return buffer
+
+# Pool bersama untuk semua scraper di proses ini
+BUFFERS = BufferPool()
+
+def iter_chunks(response, deadline=None, decode_content=False, sizer=None, buffers=BUFFERS):
+    """Chunk body dari requests.Response (stream=True) dengan ukuran adaptif
+
+    Body tanpa Content-Encoding (atau decode_content=False) dibaca readinto ke buffer yang dipakai ulang: chunk berupa memoryview
+    yang hanya valid sampai iterasi berikutnya, salin (bytes(chunk)) jika perlu disimpan.
+    Selama transfer lambat dipakai read1 (satu recv) supaya deadline tetap dicek per chunk.
+    """
+    sizer = sizer or ChunkSizer(max_size=buffers.size)
+    raw = response.raw
+    fp = getattr(raw, '_fp', None)
+
+    try:
+        if not hasattr(raw, 'read1'):
+            # urllib3 lama: chunk tetap
+            yield from iter_raw(response, sizer.size, deadline, decode_content)
+            return
+        if (decode_content and response.headers.get('Content-Encoding')) or not isinstance(fp, http.client.HTTPResponse):
+            # urllib3 yang decode (gzip/br), ukuran chunk tetap adaptif
+            yield from iter_read1(raw, deadline, decode_content, sizer)
+            return
+
+        expected = raw.length_remaining
+        view = buffers.view()
+        received = 0
+        while True:
+            if deadline is not None:
+                deadline.check()
+
+            size = sizer.size
+            started = time.perf_counter()
+            if sizer.fast:
+                n = fp.readinto(view[:size])
+                chunk = view[:n]
+            else:
+                chunk = fp.read1(size)
+                n = len(chunk)
+            sizer.update(n, time.perf_counter() - started, size)
+
+            if not n:
+                break
+            received += n
+            yield chunk
+
+        # http.client tidak raise saat body identity terpotong; cek sendiri seperti urllib3
+        if expected is not None and received < expected:
+            raise IncompleteRead(received, expected - received)
+
+        # Body habis: koneksi kembali ke pool (keep-alive) seperti setelah raw.stream()
+        if fp.isclosed():
+            raw.release_conn()
+    except requests.exceptions.RequestException:
+        # TransferTimeout dari deadline dll. (RequestException juga turunan OSError)
+        raise
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except (ReadTimeoutError, TimeoutError) as e:
+        raise requests.exceptions.ConnectionError(e)
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e)
+    except (http.client.HTTPException, OSError) as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+
+def iter_read1(raw, deadline, decode_content, sizer):
+    """Loop read1 lewat urllib3 (decode, deadline per recv) dengan ukuran dari sizer"""
+    while True:
+        if deadline is not None:
+            deadline.check()
+
+        size = sizer.size
+        started = time.perf_counter()
+        chunk = raw.read1(size, decode_content=decode_content)
+        sizer.update(len(chunk), time.perf_counter() - started, size)
+        if not chunk:
+            break
+        yield chunk
@@ -8,16 +8,28 @@ import os
 import sys
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import time
 import json
 import re
+from http_cache import HTTPCache, mark_not_modified
+from retry_policy import RetryPolicy
+from svg_stream import SVGStream
+from seen_set import make_seen_set, ExactSeenSet, members, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
+from crawl_scope import SiteAllowlist
 
 class ComprehensiveSVGDownloader:
-    def __init__(self, base_url, output_dir="svg_complete"):
+    def __init__(self, base_url, output_dir="svg_complete", use_cache=True, seen_set='exact', seen_error_rate=0.001,
+                 url_policy=None,
+                 allowed_hosts=None, asset_hosts=None):
+        # URL halaman dan SVG di-dedupe dalam bentuk canonical
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-scan: situs awal + allowed_hosts, SVG juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -26,50 +38,79 @@ class ComprehensiveSVGDownloader:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-run
+        self.http_cache = HTTPCache(self.output_dir / '.http_cache.json') if use_cache else None
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy()
+        
         self.downloaded_svgs = []
-        self.visited_pages = set()
-        self.tested_urls = set()
+        self.downloaded_svg_urls = ExactSeenSet()
+        # Set dedupe memakai backend pilihan (exact / bloom)
+        self.visited_pages = make_seen_set(seen_set, seen_error_rate)
+        self.tested_urls = make_seen_set(seen_set, seen_error_rate)
         
         print(f"🎨 Comprehensive SVG Downloader")
         print(f"🎯 Target: {base_url}")
         print(f"📁 Output: {self.output_dir.absolute()}")
     
-    def download_svg_file(self, svg_url, custom_name=None):
-        """Download SVG file"""
+    def download_svg_file(self, svg_url, custom_name=None, probe=False):
+        """Download SVG file (probe=True: 404 / bukan SVG dilewati tanpa error)"""
         try:
-            if svg_url in [svg['url'] for svg in self.downloaded_svgs]:
+            if svg_url in self.downloaded_svg_urls:
                 return True
             
-            print(f"📥 Downloading: {svg_url}")
-            
-            response = self.session.get(svg_url, timeout=15)
-            response.raise_for_status()
+            headers = self.http_cache.conditional_headers(svg_url) if self.http_cache else {}
+            stream = SVGStream(self.session, svg_url, self.retry_policy, headers=headers)
             
-            # Determine filename
-            if custom_name:
-                filename = custom_name
+            # 304: SVG di disk masih sama, analisis dari file yang tersimpan
+            unchanged = stream.status == 304
+            if unchanged:
+                print(f"📥 Downloading: {svg_url}")
+                mark_not_modified(self.http_cache, svg_url)
+                svg_file = self.http_cache.cached_path(svg_url)
+                content = self.http_cache.read_cached(svg_url)
             else:
-                filename = Path(urlparse(svg_url).path).name
-                if not filename or not filename.endswith('.svg'):
-                    filename = f"svg_{len(self.downloaded_svgs) + 1}.svg"
-            
-            # Ensure unique filename
-            svg_file = self.output_dir / filename
-            counter = 1
-            original_stem = svg_file.stem
-            while svg_file.exists():
-                svg_file = self.output_dir / f"{original_stem}_{counter}.svg"
-                counter += 1
-            
-            # Save SVG
-            with open(svg_file, 'wb') as f:
-                f.write(response.content)
+                if probe and not stream.is_svg:
+                    # Bukan SVG: putus koneksi, sisa body tidak di-download
+                    stream.close()
+                    return False
+                stream.response.raise_for_status()
+                
+                print(f"📥 Downloading: {svg_url}")
+                
+                # Timpa file lama jika URL ini sudah pernah didownload
+                svg_file = self.http_cache.cached_path(svg_url) if self.http_cache else None
+                
+                if svg_file is None:
+                    # Determine filename
+                    if custom_name:
+                        filename = custom_name
+                    else:
+                        filename = Path(urlparse(svg_url).path).name
+                        if not filename or not filename.endswith('.svg'):
+                            filename = f"svg_{len(self.downloaded_svgs) + 1}.svg"
+                    
+                    # Ensure unique filename
+                    svg_file = self.output_dir / filename
+                    counter = 1
+                    original_stem = svg_file.stem
+                    while svg_file.exists():
+                        svg_file = self.output_dir / f"{original_stem}_{counter}.svg"
+                        counter += 1
+                
+                # Stream SVG langsung ke disk, lalu baca ulang untuk analisis
+                stream.save(svg_file)
+                content = svg_file.read_bytes()
+                
+                if self.http_cache:
+                    self.http_cache.store(svg_url, stream.headers, svg_file)
             
-            file_size = len(response.content)
+            file_size = len(content)
             
             # Analyze SVG content
             try:
-                svg_content = response.text
+                svg_content = content.decode('utf-8', errors='replace')
                 # Count symbols/icons in sprite
                 symbol_count = len(re.findall(r'<symbol', svg_content, re.IGNORECASE))
                 use_count = len(re.findall(r'<use', svg_content, re.IGNORECASE))
@@ -82,16 +123,18 @@ class ComprehensiveSVGDownloader:
                 'filename': svg_file.name,
                 'size_bytes': file_size,
                 'size_kb': round(file_size / 1024, 2),
-                'content_type': response.headers.get('content-type', ''),
+                'content_type': stream.content_type,
                 'symbols_count': symbol_count,
                 'use_count': use_count,
                 'path_count': path_count,
+                'unchanged': unchanged,
                 'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
             self.downloaded_svgs.append(svg_info)
+            self.downloaded_svg_urls.add(svg_url)
             
-            print(f"✅ Saved: {svg_file}")
+            print(f"{'♻️ Unchanged' if unchanged else '✅ Saved'}: {svg_file}")
             print(f"   Size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
             if symbol_count > 0:
                 print(f"   Contains: {symbol_count} symbols/icons")
@@ -103,21 +146,17 @@ class ComprehensiveSVGDownloader:
             return True
             
         except Exception as e:
-            print(f"❌ Failed to download {svg_url}: {e}")
+            if not probe:
+                print(f"❌ Failed to download {svg_url}: {e}")
             return False
     
     def test_svg_url(self, svg_url):
-        """Test if SVG URL exists"""
-        if svg_url in self.tested_urls:
+        """Probe + download dalam satu GET streaming (tanpa HEAD terpisah)"""
+        svg_url = self.canonical.canonicalize(svg_url)
+        if not self.tested_urls.add(svg_url):
             return False
         
-        self.tested_urls.add(svg_url)
-        
-        try:
-            response = self.session.head(svg_url, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+        return self.download_svg_file(svg_url, probe=True)
     
     def discover_svg_paths(self):
         """Discover SVG files using various strategies"""
@@ -150,7 +189,6 @@ class ComprehensiveSVGDownloader:
                 svg_url = base_path + svg_name
                 if self.test_svg_url(svg_url):
                     print(f"✅ Found: {svg_url}")
-                    self.download_svg_file(svg_url)
         
         # Strategy 2: Scan HTML pages for SVG references
         print(f"\n🔍 Strategy 2: Scanning HTML pages for SVG references...")
@@ -182,7 +220,6 @@ class ComprehensiveSVGDownloader:
             for svg_url in test_urls:
                 if self.test_svg_url(svg_url):
                     print(f"✅ Found numbered: {svg_url}")
-                    self.download_svg_file(svg_url)
         
         # Strategy 4: CSS scanning
         print(f"\n🔍 Strategy 4: Scanning CSS files for SVG references...")
@@ -191,11 +228,11 @@ class ComprehensiveSVGDownloader:
     def scan_page_for_svgs(self, page_url):
         """Scan single page for SVG references"""
         try:
-            if page_url in self.visited_pages:
+            page_url = self.canonical.canonicalize(page_url)
+            if not self.visited_pages.add(page_url):
                 return
             
             print(f"🌐 Scanning: {page_url}")
-            self.visited_pages.add(page_url)
             
             response = self.session.get(page_url, timeout=15)
             response.raise_for_status()
@@ -220,15 +257,14 @@ class ComprehensiveSVGDownloader:
                     if match and not match.startswith('#'):
                         # Clean URL (remove fragment)
                         clean_url = match.split('#')[0]
-                        absolute_url = urljoin(page_url, clean_url)
-                        if urlparse(absolute_url).netloc == self.domain:
+                        absolute_url = self.canonical.join(page_url, clean_url)
+                        if self.sites.allows(absolute_url, is_html=False):
                             found_svgs.add(absolute_url)
             
             # Test and download found SVGs
             for svg_url in found_svgs:
                 if self.test_svg_url(svg_url):
                     print(f"   ✅ Found SVG: {svg_url}")
-                    self.download_svg_file(svg_url)
                     
         except Exception as e:
             print(f"❌ Error scanning {page_url}: {e}")
@@ -253,11 +289,10 @@ class ComprehensiveSVGDownloader:
                         svg_matches = re.findall(r'url\(["\']?([^"\']*\.svg[^"\']*)["\']?\)', css_content)
                         
                         for match in svg_matches:
-                            absolute_url = urljoin(css_url, match)
-                            if urlparse(absolute_url).netloc == self.domain:
+                            absolute_url = self.canonical.join(css_url, match)
+                            if self.sites.allows(absolute_url, is_html=False):
                                 if self.test_svg_url(absolute_url):
                                     print(f"   ✅ Found in CSS: {absolute_url}")
-                                    self.download_svg_file(absolute_url)
                                     
                 except Exception as e:
                     print(f"   ❌ Error scanning CSS {css_url}: {e}")
@@ -272,6 +307,9 @@ class ComprehensiveSVGDownloader:
         
         self.discover_svg_paths()
         
+        if self.http_cache:
+            self.http_cache.save()
+        
         # Final summary
         self.print_final_summary()
     
@@ -281,6 +319,8 @@ class ComprehensiveSVGDownloader:
         print("🎨 SVG DOWNLOAD COMPLETED")
         print("="*60)
         
+        print(f"🧮 Seen-sets: {format_seen_sets(seen_sets_summary(visited_pages=self.visited_pages, tested_urls=self.tested_urls))}")
+        
         if self.downloaded_svgs:
             print(f"✅ Successfully downloaded {len(self.downloaded_svgs)} SVG files!")
             
@@ -307,10 +347,14 @@ class ComprehensiveSVGDownloader:
         report = {
             'download_completed': time.strftime('%Y-%m-%d %H:%M:%S'),
             'base_url': self.base_url,
-            'pages_scanned': list(self.visited_pages),
+            'pages_scanned': members(self.visited_pages),
             'urls_tested': len(self.tested_urls),
+            'canonical_urls': self.canonical.summary(),
+            'seen_sets': seen_sets_summary(visited_pages=self.visited_pages, tested_urls=self.tested_urls),
             'svgs_downloaded': len(self.downloaded_svgs),
+            'svgs_unchanged': sum(1 for svg in self.downloaded_svgs if svg.get('unchanged')),
             'total_size_bytes': sum(svg['size_bytes'] for svg in self.downloaded_svgs) if self.downloaded_svgs else 0,
+            'retries': self.retry_policy.summary(),
             'svg_files': self.downloaded_svgs
         }
         
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Content Decoding - negosiasi Accept-Encoding (br/zstd jika library tersedia)
+Body di-decode per chunk langsung ke disk, byte wire vs byte hasil decode dicatat
+"""
+
+import zlib
+import threading
+
+import requests
+
+# Try import brotli (brotli atau brotlicffi)
+BROTLI_AVAILABLE = False
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        pass
+
+# Try import zstandard
+ZSTD_AVAILABLE = False
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    from urllib3.exceptions import ProtocolError, ReadTimeoutError, SSLError
+except ImportError:
+    from requests.packages.urllib3.exceptions import ProtocolError, ReadTimeoutError, SSLError
+
+def accept_encoding():
+    """Nilai header Accept-Encoding sesuai decoder yang tersedia"""
+    encodings = []
+    if ZSTD_AVAILABLE:
+        encodings.append('zstd')
+    if BROTLI_AVAILABLE:
+        encodings.append('br')
+    encodings += ['gzip', 'deflate']
+    return ', '.join(encodings)
+
+class IdentityDecoder:
+    def decompress(self, data):
+        return data
+
+    def flush(self):
+        return b''
+
+class ZlibDecoder:
+    """gzip / deflate; deflate tanpa header zlib (raw) juga diterima"""
+
+    def __init__(self, wbits):
+        self.wbits = wbits
+        self.decoder = zlib.decompressobj(wbits)
+        self.first = True
+
+    def decompress(self, data):
+        if self.first and self.wbits == zlib.MAX_WBITS:
+            self.first = False
+            try:
+                return self.decoder.decompress(data)
+            except zlib.error:
+                self.decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.first = False
+        return self.decoder.decompress(data)
+
+    def flush(self):
+        return self.decoder.flush()
+
+class BrotliDecoder:
+    def __init__(self):
+        self.decoder = brotli.Decompressor()
+
+    def decompress(self, data):
+        if hasattr(self.decoder, 'process'):
+            return self.decoder.process(data)
+        return self.decoder.decompress(data)
+
+    def flush(self):
+        return b''
+
+class ZstdDecoder:
+    def __init__(self):
+        self.decoder = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data):
+        return self.decoder.decompress(data)
+
+    def flush(self):
+        return b''
+
+def make_decoder(encoding):
+    encoding = encoding.strip().lower()
+    if encoding in ('', 'identity'):
+        return IdentityDecoder()
+    if encoding in ('gzip', 'x-gzip'):
+        return ZlibDecoder(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return ZlibDecoder(zlib.MAX_WBITS)
+    if encoding == 'br' and BROTLI_AVAILABLE:
+        return BrotliDecoder()
+    if encoding == 'zstd' and ZSTD_AVAILABLE:
+        return ZstdDecoder()
+    raise requests.exceptions.ContentDecodingError(f"Unsupported Content-Encoding: {encoding}")
+
+class StreamDecoder:
+    """Decode body per chunk sesuai Content-Encoding (boleh berantai, misal 'gzip, br')"""
+
+    def __init__(self, content_encoding):
+        self.encoding = (content_encoding or 'identity').strip().lower()
+        # Encoding terakhir diterapkan terakhir oleh server, jadi di-decode pertama
+        self.decoders = [make_decoder(e) for e in reversed(self.encoding.split(','))]
+
+    def decompress(self, data):
+        try:
+            for decoder in self.decoders:
+                data = decoder.decompress(data)
+            return data
+        except Exception as e:
+            raise requests.exceptions.ContentDecodingError(f"Failed to decode {self.encoding} body: {e}")
+
+    def flush(self):
+        data = b''
+        try:
+            # Sisa output decoder luar masih harus lewat decoder berikutnya
+            for decoder in self.decoders:
+                data = (decoder.decompress(data) if data else b'') + decoder.flush()
+            return data
+        except Exception as e:
+            raise requests.exceptions.ContentDecodingError(f"Failed to decode {self.encoding} body: {e}")
+
+class DecodingWriter:
+    """Tulis body mentah ke file: decode per chunk, hitung byte wire dan byte hasil decode"""
+
+    def __init__(self, f, content_encoding):
+        self.f = f
+        self.decoder = StreamDecoder(content_encoding)
+        self.encoding = self.decoder.encoding
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def decode(self, chunk):
+        """Decode satu chunk tanpa menulis (caller async menulis sendiri)"""
+        self.wire_bytes += len(chunk)
+        data = self.decoder.decompress(chunk)
+        self.decoded_bytes += len(data)
+        return data
+
+    def flush(self):
+        data = self.decoder.flush()
+        self.decoded_bytes += len(data)
+        return data
+
+    def write(self, chunk):
+        self.f.write(self.decode(chunk))
+
+    def finish(self):
+        self.f.write(self.flush())
+
+def iter_raw(response, chunk_size=8192, deadline=None, decode_content=False):
+    """Chunk body mentah (belum di-decode) dari requests.Response, error dibungkus seperti iter_content
+
+    Dengan deadline (TransferDeadline) body dibaca pakai read1: kembali setelah satu recv,
+    jadi deadline tetap dicek walaupun server mengirim body sangat pelan.
+    """
+    try:
+        if deadline is None or not hasattr(response.raw, 'read1'):
+            for chunk in response.raw.stream(chunk_size, decode_content=decode_content):
+                if deadline is not None:
+                    deadline.check()
+                yield chunk
+            return
+
+        while True:
+            deadline.check()
+            chunk = response.raw.read1(chunk_size, decode_content=decode_content)
+            if not chunk:
+                break
+            yield chunk
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e)
+
+class TransferStats:
+    """Byte di wire vs byte setelah decode, per Content-Encoding"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.encodings = {}
+
+    def record(self, encoding, wire_bytes, decoded_bytes):
+        with self.lock:
+            stats = self.encodings.setdefault(encoding, {'files': 0, 'wire_bytes': 0, 'decoded_bytes': 0})
+            stats['files'] += 1
+            stats['wire_bytes'] += wire_bytes
+            stats['decoded_bytes'] += decoded_bytes
+
+    def summary(self):
+        with self.lock:
+            wire_bytes = sum(s['wire_bytes'] for s in self.encodings.values())
+            decoded_bytes = sum(s['decoded_bytes'] for s in self.encodings.values())
+            return {
+                'wire_bytes': wire_bytes,
+                'decoded_bytes': decoded_bytes,
+                'saved_percent': round(100.0 * (1 - wire_bytes / decoded_bytes), 1) if decoded_bytes else 0.0,
+                'by_encoding': {k: dict(v) for k, v in self.encodings.items()}
+            }
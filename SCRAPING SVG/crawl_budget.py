@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Crawl Budget - timeout connect/read/total per request + batas waktu seluruh crawl
+Saat sisa waktu menipis pekerjaan prioritas rendah dibuang, report tetap ditulis lengkap
+"""
+
+import math
+import time
+import threading
+
+import requests
+
+from retry_policy import RETRYABLE_STATUSES
+from chunk_reader import iter_chunks
+
+# Try import aiohttp (hanya untuk ClientTimeout engine async)
+AIOHTTP_AVAILABLE = False
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    pass
+
+# Timeout minimum supaya request terakhir sebelum deadline tidak langsung gagal
+MIN_TIMEOUT = 1.0
+
+class TransferTimeout(requests.exceptions.Timeout):
+    """Body tidak selesai dalam batas total transfer (server slow-drip)"""
+
+class BudgetExhaustedError(requests.exceptions.RequestException):
+    """Waktu crawl habis, request tidak dikirim (tidak di-retry)"""
+
+class CrawlBudget:
+    """Batas waktu seluruh crawl; low = sisa waktu <= reserve"""
+
+    def __init__(self, seconds=None, reserve_fraction=0.1, min_reserve=10, min_score=None):
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self.reserve = max(min_reserve, self.seconds * reserve_fraction) if self.seconds else 0
+        # Skor prioritas minimum yang masih dikerjakan saat budget low (None = semua)
+        self.min_score = min_score
+        self.started = None
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'dropped_low': 0,
+            'dropped_expired': 0
+        }
+
+    def start(self):
+        if self.started is None:
+            self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started if self.started is not None else 0.0
+
+    def remaining(self):
+        if self.seconds is None:
+            return math.inf
+        return self.seconds - self.elapsed()
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    @property
+    def low(self):
+        return self.remaining() <= self.reserve
+
+    def allows(self, score=None):
+        """Masih boleh dikerjakan? Budget low: hanya skor >= min_score, habis: tidak ada"""
+        if self.seconds is None:
+            return True
+
+        remaining = self.remaining()
+        if remaining <= 0:
+            with self.lock:
+                self.stats['dropped_expired'] += 1
+            return False
+
+        if remaining <= self.reserve and self.min_score is not None and score is not None and score < self.min_score:
+            with self.lock:
+                self.stats['dropped_low'] += 1
+            return False
+        return True
+
+    def check(self, url):
+        """Raise BudgetExhaustedError jika waktu crawl sudah habis"""
+        if self.seconds is not None and self.expired:
+            raise BudgetExhaustedError(f"Crawl budget of {self.seconds}s exhausted, skipping {url}")
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, budget_seconds=self.seconds, elapsed=round(self.elapsed(), 2))
+
+class TransferDeadline:
+    """Deadline total satu transfer; check() dipanggil per chunk"""
+
+    def __init__(self, url, seconds):
+        self.url = url
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def check(self):
+        if self.expires_at is not None and time.monotonic() > self.expires_at:
+            raise TransferTimeout(f"Transfer of {self.url} exceeded {self.seconds:.1f}s total deadline")
+
+class RequestTimeouts:
+    """Timeout connect / read (per socket read) / total (seluruh body), dipotong sisa budget"""
+
+    def __init__(self, connect=5, read=15, total=60, budget=None):
+        self.connect = connect
+        self.read = read
+        self.total = total
+        self.budget = budget
+
+    def cap(self, seconds):
+        """Timeout tidak boleh melewati sisa budget crawl"""
+        if self.budget is None or self.budget.seconds is None:
+            return seconds
+        remaining = max(MIN_TIMEOUT, self.budget.remaining())
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def requests_timeout(self):
+        """Tuple (connect, read) untuk requests"""
+        return (self.cap(self.connect), self.cap(self.read))
+
+    def aiohttp_timeout(self):
+        """ClientTimeout per request untuk aiohttp"""
+        return aiohttp.ClientTimeout(total=self.cap(self.total), sock_connect=self.cap(self.connect),
+                                     sock_read=self.cap(self.read))
+
+    def deadline(self, url):
+        """Deadline total transfer untuk satu response streaming"""
+        return TransferDeadline(url, self.cap(self.total))
+
+def get_with_deadline(session, url, retry_policy, timeouts, **kwargs):
+    """get_with_retry + timeout (connect, read) + deadline total body; response.content terisi"""
+    if timeouts.budget is not None:
+        timeouts.budget.check(url)
+
+    def attempt():
+        response = session.get(url, timeout=timeouts.requests_timeout(), stream=True, **kwargs)
+        if response.status_code in RETRYABLE_STATUSES:
+            response.close()
+            response.raise_for_status()
+
+        body = bytearray()
+        try:
+            for chunk in iter_chunks(response, timeouts.deadline(url), decode_content=True):
+                body += chunk
+        finally:
+            response.close()
+
+        # Body sudah dibaca: .content / .text bekerja seperti request non-stream
+        response._content = bytes(body)
+        return response
+
+    return retry_policy.execute(url, attempt)
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier - frontier + seen-set di SQLite supaya crawl bisa dilanjutkan setelah crash / Ctrl-C
+Commit dikumpulkan per batch; urutan operasi terjaga, jadi state yang ter-commit selalu konsisten
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from host_scheduler import HostScheduler, url_host
+
+# Nama file frontier di direktori download
+FRONTIER_FILE = '.frontier.sqlite3'
+
+# State URL di frontier
+QUEUED = 0
+LEASED = 1
+DONE = 2
+FAILED = 3
+DROPPED = 4
+SKIPPED = 5
+
+STATE_NAMES = {QUEUED: 'queued', LEASED: 'leased', DONE: 'done', FAILED: 'failed', DROPPED: 'dropped', SKIPPED: 'skipped'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    priority REAL NOT NULL,
+    is_html INTEGER NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0,
+    depth INTEGER NOT NULL DEFAULT 0,
+    host TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS urls_by_state ON urls (state, priority);
+"""
+
+# Dibuat setelah migrasi kolom host (frontier lama belum punya kolomnya)
+HOST_INDEX = 'CREATE INDEX IF NOT EXISTS urls_by_host ON urls (state, host, priority)'
+
+
+class CrawlFrontier:
+    """Store SQLite: satu baris per URL yang pernah dilihat (seen-set), antrian = baris QUEUED
+
+    Antrian di-shard per host (kolom host + queued_by_host); pop(host) mengambil prioritas terkecil
+    host itu (FIFO untuk prioritas sama), pop() tanpa host dari semua host, lalu menandainya LEASED.
+    Saat resume, LEASED (sedang dikerjakan waktu crash) dan DROPPED (dibuang budget) antri lagi;
+    SKIPPED (di luar kuota scope) tetap dilewati.
+
+    URL yang ditemukan lagi lewat jalur lebih pendek memakai depth terkecil selama masih QUEUED.
+    Dengan max_depth, halaman DONE yang dulu di-crawl di depth >= max_depth (link-nya terpotong batas)
+    antri lagi jika ditemukan di depth < max_depth, supaya link-nya ikut masuk.
+
+    defer_commit=True: operasi tidak pernah commit sendiri; pemilik store cek commit_due() dan
+    memanggil commit() (AsyncFrontier: di thread SQLite-nya, bukan event loop).
+    """
+
+    def __init__(self, path, resume=False, batch_size=500, commit_interval=1.0, defer_commit=False, max_depth=None):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.defer_commit = defer_commit
+        self.max_depth = max_depth
+        self.lock = threading.Lock()
+
+        if not resume:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # Frontier lama (sebelum ada depth/host): tambah kolom, URL lama dianggap depth 0, host diisi dari URL
+        columns = [column[1] for column in self.conn.execute('PRAGMA table_info(urls)')]
+        if 'depth' not in columns:
+            self.conn.execute('ALTER TABLE urls ADD COLUMN depth INTEGER NOT NULL DEFAULT 0')
+        if 'host' not in columns:
+            self.conn.execute("ALTER TABLE urls ADD COLUMN host TEXT NOT NULL DEFAULT ''")
+            self.conn.create_function('url_host', 1, url_host, deterministic=True)
+            self.conn.execute('UPDATE urls SET host = url_host(url)')
+        self.conn.execute(HOST_INDEX)
+
+        self.conn.execute('UPDATE urls SET state = ? WHERE state IN (?, ?)', (QUEUED, LEASED, DROPPED))
+        self.conn.commit()
+
+        self.counts = dict.fromkeys(STATE_NAMES, 0)
+        for state, count in self.conn.execute('SELECT state, COUNT(*) FROM urls GROUP BY state'):
+            self.counts[state] = count
+        self.queued_by_host = dict(self.conn.execute('SELECT host, COUNT(*) FROM urls WHERE state = ? GROUP BY host',
+                                                     (QUEUED,)))
+        self.resumed = resume and any(self.counts.values())
+
+        self.pending_ops = 0
+        self.last_commit = time.monotonic()
+        self.stats = {
+            'added': 0,
+            'duplicates': 0,
+            'depth_lowered': 0,
+            'readmitted': 0,
+            'commits': 0,
+            'resumed_queued': self.counts[QUEUED] if self.resumed else 0,
+            'resumed_done': self.counts[DONE] if self.resumed else 0
+        }
+
+    def maybe_commit(self):
+        """Commit tiap batch_size operasi atau commit_interval detik (dipanggil dengan lock)"""
+        self.pending_ops += 1
+        if not self.defer_commit and self.commit_due():
+            self.commit_locked()
+
+    def commit_due(self):
+        return bool(self.pending_ops) and (self.pending_ops >= self.batch_size or
+                                           time.monotonic() - self.last_commit >= self.commit_interval)
+
+    def commit_locked(self):
+        self.conn.commit()
+        self.pending_ops = 0
+        self.last_commit = time.monotonic()
+        self.stats['commits'] += 1
+
+    def add(self, url, priority=0, is_html=True, depth=0):
+        """Masukkan URL ke antrian; return False jika URL sudah pernah dilihat (kecuali di-readmit)"""
+        host = url_host(url)
+        with self.lock:
+            cursor = self.conn.execute('INSERT OR IGNORE INTO urls (url, priority, is_html, depth, host) '
+                                       'VALUES (?, ?, ?, ?, ?)', (url, priority, int(is_html), depth, host))
+            if not cursor.rowcount:
+                self.stats['duplicates'] += 1
+                return self.found_shallower(url, is_html, depth, host)
+
+            self.counts[QUEUED] += 1
+            self.queued_by_host[host] = self.queued_by_host.get(host, 0) + 1
+            self.stats['added'] += 1
+            self.maybe_commit()
+            return True
+
+    def found_shallower(self, url, is_html, depth, host):
+        """URL lama ditemukan lagi: turunkan depth yang masih QUEUED, readmit halaman DONE yang linknya terpotong
+        (dipanggil dengan lock); return True jika URL antri lagi"""
+        state, old_depth = self.conn.execute('SELECT state, depth FROM urls WHERE url = ?', (url,)).fetchone()
+        if depth >= old_depth:
+            return False
+
+        if state == QUEUED:
+            self.conn.execute('UPDATE urls SET depth = MIN(depth, ?) WHERE url = ?', (depth, url))
+            self.stats['depth_lowered'] += 1
+            self.maybe_commit()
+            return False
+
+        # LEASED sedang dikerjakan dengan depth lamanya; FAILED/DROPPED/SKIPPED tidak dikejar lagi
+        if (state != DONE or not is_html or self.max_depth is None
+                or not (old_depth >= self.max_depth > depth)):
+            return False
+
+        self.conn.execute('UPDATE urls SET state = ?, depth = ? WHERE url = ?', (QUEUED, depth, url))
+        self.counts[DONE] -= 1
+        self.counts[QUEUED] += 1
+        self.queued_by_host[host] = self.queued_by_host.get(host, 0) + 1
+        self.stats['readmitted'] += 1
+        self.maybe_commit()
+        return True
+
+    def pop(self, host=None):
+        """(priority, seq, url, is_html, depth) berikutnya (dari host tertentu jika diberikan), ditandai LEASED;
+        None jika antrian (host itu) kosong"""
+        with self.lock:
+            if not (self.queued_by_host.get(host) if host is not None else self.counts[QUEUED]):
+                return None
+
+            if host is not None:
+                row = self.conn.execute('SELECT rowid, url, priority, is_html, depth, host FROM urls '
+                                        'WHERE state = ? AND host = ? ORDER BY priority, rowid LIMIT 1',
+                                        (QUEUED, host)).fetchone()
+            else:
+                row = self.conn.execute('SELECT rowid, url, priority, is_html, depth, host FROM urls WHERE state = ? '
+                                        'ORDER BY priority, rowid LIMIT 1', (QUEUED,)).fetchone()
+            if row is None:
+                return None
+
+            rowid, url, priority, is_html, depth, host = row
+            self.conn.execute('UPDATE urls SET state = ? WHERE rowid = ?', (LEASED, rowid))
+            self.counts[QUEUED] -= 1
+            self.queued_by_host[host] -= 1
+            if not self.queued_by_host[host]:
+                del self.queued_by_host[host]
+            self.counts[LEASED] += 1
+            self.maybe_commit()
+            return priority, rowid, url, bool(is_html), depth
+
+    def finish(self, url, state=DONE):
+        """Tandai URL yang di-pop selesai (DONE / FAILED / DROPPED / SKIPPED)"""
+        with self.lock:
+            row = self.conn.execute('SELECT state FROM urls WHERE url = ?', (url,)).fetchone()
+            if row is None or row[0] == state:
+                return
+
+            self.conn.execute('UPDATE urls SET state = ? WHERE url = ?', (state, url))
+            self.counts[row[0]] -= 1
+            self.counts[state] += 1
+            self.maybe_commit()
+
+    def __contains__(self, url):
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM urls WHERE url = ?', (url,)).fetchone() is not None
+
+    def __len__(self):
+        """Jumlah URL yang masih antri"""
+        return self.counts[QUEUED]
+
+    @property
+    def unfinished(self):
+        return self.counts[QUEUED] + self.counts[LEASED]
+
+    def pop_next(self, scheduler):
+        """pop() dari host giliran scheduler (crawl sequential: tanpa lease/release)"""
+        host = scheduler.next_host(self.queued_by_host)
+        return self.pop(host) if host is not None else None
+
+    def urls(self, *states, html_only=False):
+        """Semua URL dengan state tertentu (untuk report / restore kuota scope)"""
+        placeholders = ', '.join('?' * len(states))
+        html_filter = ' AND is_html = 1' if html_only else ''
+        with self.lock:
+            return [url for url, in self.conn.execute(f'SELECT url FROM urls WHERE state IN ({placeholders}){html_filter} '
+                                                      'ORDER BY rowid', states)]
+
+    def commit(self):
+        with self.lock:
+            if self.conn is not None:
+                self.commit_locked()
+
+    def close(self):
+        """Commit sisa batch lalu tutup; dipanggil juga saat Ctrl-C"""
+        with self.lock:
+            if self.conn is not None:
+                self.commit_locked()
+                self.conn.close()
+                self.conn = None
+
+    def summary(self):
+        with self.lock:
+            counts = {STATE_NAMES[state]: count for state, count in self.counts.items()}
+            return dict(self.stats, **counts, path=self.path)
+
+class PersistentFrontier:
+    """CrawlFrontier dengan API seperti queue.PriorityQueue untuk worker thread
+
+    put(entry) menerima entry PriorityScorer (priority, seq, url, is_html, depth); seq diganti rowid SQLite.
+    task_done(url) wajib membawa URL supaya state-nya bisa dicatat.
+    get() hanya memberi URL host yang in-flight-nya di bawah per_host_limit scheduler (giliran antar host);
+    jika semua host yang antri sedang penuh, worker menunggu task_done host itu.
+    """
+
+    def __init__(self, path, resume=False, batch_size=500, commit_interval=1.0, scheduler=None, max_depth=None):
+        self.store = CrawlFrontier(path, resume, batch_size, commit_interval, max_depth=max_depth)
+        self.scheduler = scheduler or HostScheduler(per_host_limit=None)
+        self.changed = threading.Condition()
+        self.stopping = 0
+        self.stopped = False
+
+    def put(self, entry):
+        """Return True jika URL baru masuk antrian (False: sudah pernah dilihat)"""
+        priority, _, url, is_html, depth = entry
+        with self.changed:
+            accepted = False
+            if url is None:
+                # Sentinel stop worker: tidak disimpan, diambil setelah antrian habis
+                self.stopping += 1
+            else:
+                accepted = self.store.add(url, priority, is_html, depth)
+            self.changed.notify_all()
+            return accepted
+
+    def get(self, timeout=None):
+        """Entry berikutnya; sentinel (url None) jika worker diminta berhenti"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.changed:
+            while True:
+                host = None if self.stopped else self.scheduler.next_host(self.store.queued_by_host)
+                entry = self.store.pop(host) if host is not None else None
+                if entry is not None:
+                    self.scheduler.lease(host)
+                    return entry
+                if self.stopping:
+                    self.stopping -= 1
+                    return float('inf'), 0, None, False, 0
+
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Frontier empty")
+                self.changed.wait(remaining)
+
+    def task_done(self, url, state=DONE):
+        with self.changed:
+            self.store.finish(url, state)
+            # Slot host bebas: worker yang menunggu host penuh bisa jalan lagi
+            self.scheduler.release(url_host(url))
+            self.changed.notify_all()
+
+    def join(self, timeout=None):
+        """Tunggu sampai tidak ada URL yang antri atau sedang dikerjakan; False jika timeout lebih dulu
+
+        Dibangunkan setiap put/task_done, jadi selesai tepat saat worker terakhir menyelesaikan URL-nya.
+        """
+        with self.changed:
+            return self.changed.wait_for(self.quiescent, timeout)
+
+    def quiescent(self):
+        """Antrian kosong dan tidak ada URL LEASED (setelah stop(): cukup tidak ada yang LEASED)"""
+        return not (self.store.counts[LEASED] if self.stopped else self.store.unfinished)
+
+    def in_flight(self):
+        """Jumlah URL yang sedang dikerjakan worker"""
+        return self.store.counts[LEASED]
+
+    def stop(self):
+        """Ctrl-C: tidak ada pop baru, sisa antrian tetap di disk untuk --resume"""
+        with self.changed:
+            self.stopped = True
+            self.changed.notify_all()
+
+    def qsize(self):
+        return len(self.store)
+
+    def __contains__(self, url):
+        return url in self.store
+
+    def close(self):
+        self.store.close()
+
+    def summary(self):
+        with self.changed:
+            return dict(self.store.summary(), hosts=self.scheduler.summary())
+
+class AsyncFrontier:
+    """CrawlFrontier untuk engine asyncio; method dipanggil dari thread event loop
+    (giliran host + per_host_limit sama dengan PersistentFrontier)
+
+    Semua akses SQLite (add/pop/finish dan commit batch) berjalan berurutan di satu thread khusus,
+    jadi event loop tidak pernah menunggu lock store selama commit/fsync. put_nowait() dan task_done()
+    hanya menjadwalkan operasi; get() dan join() menunggu hasilnya tanpa memblokir coroutine lain.
+
+    Error SQLite (mis. commit gagal) disimpan dan di-raise dari get() dan join(), sehingga crawl berhenti
+    bersih; task_done() tidak pernah raise supaya URL tidak tertinggal LEASED.
+    """
+
+    def __init__(self, path, resume=False, batch_size=500, commit_interval=1.0, scheduler=None, max_depth=None):
+        self.store = CrawlFrontier(path, resume, batch_size, commit_interval, defer_commit=True, max_depth=max_depth)
+        self.scheduler = scheduler or HostScheduler(per_host_limit=None)
+        self.db = ThreadPoolExecutor(max_workers=1, thread_name_prefix='frontier')
+        # changed: ada URL baru / slot host bebas (untuk get); settled: satu operasi selesai (untuk join)
+        self.changed = asyncio.Event()
+        self.settled = asyncio.Event()
+        self.pending = 0
+        self.committing = None
+        self.error = None
+
+    def run(self, func, *args, notify=False):
+        """Jadwalkan operasi store di thread SQLite, return asyncio Future hasilnya"""
+        self.pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self.db, func, *args)
+        future.add_done_callback(lambda future: self.operation_finished(future, notify))
+        return future
+
+    def operation_finished(self, future, notify):
+        """Di event loop: catat error, bangunkan get()/join(), jadwalkan commit batch jika sudah waktunya"""
+        self.pending -= 1
+        if not future.cancelled() and future.exception() is not None:
+            self.fail(future.exception())
+        if notify:
+            self.changed.set()
+        self.settled.set()
+        self.maybe_commit()
+
+    def maybe_commit(self):
+        """Commit antri di thread SQLite setelah operasi sebelumnya; satu commit sekaligus"""
+        if self.committing is None and self.error is None and self.store.commit_due():
+            self.committing = asyncio.get_running_loop().run_in_executor(self.db, self.store.commit)
+            self.committing.add_done_callback(self.commit_finished)
+
+    def commit_finished(self, future):
+        self.committing = None
+        if not future.cancelled() and future.exception() is not None:
+            self.fail(future.exception())
+
+    def fail(self, error):
+        # Error pertama yang dipakai; worker dan join() yang menunggu dibangunkan supaya bisa raise
+        if self.error is None:
+            self.error = error
+        self.changed.set()
+        self.settled.set()
+
+    def check_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def put_nowait(self, entry):
+        """Jadwalkan add; return Future yang berisi True jika URL baru masuk antrian"""
+        priority, _, url, is_html, depth = entry
+        return self.run(self.store.add, url, priority, is_html, depth, notify=True)
+
+    def pop_next(self):
+        """Di thread SQLite: pop dari host giliran scheduler dan lease slot host-nya"""
+        host = self.scheduler.next_host(self.store.queued_by_host)
+        entry = self.store.pop(host) if host is not None else None
+        if entry is not None:
+            self.scheduler.lease(host)
+        return entry
+
+    def finish(self, url, state):
+        """Di thread SQLite: catat state URL lalu bebaskan slot host"""
+        try:
+            self.store.finish(url, state)
+        finally:
+            self.scheduler.release(url_host(url))
+
+    async def get(self):
+        while True:
+            self.check_error()
+            # Clear sebelum pop dijadwalkan: put/task_done sesudahnya pasti membangunkan wait() di bawah
+            self.changed.clear()
+            entry = await self.run(self.pop_next)
+            if entry is not None:
+                return entry
+            await self.changed.wait()
+
+    def task_done(self, url, state=DONE):
+        """Jadwalkan finish + release slot host; tidak raise (error muncul di get()/join())"""
+        self.run(self.finish, url, state, notify=True)
+
+    async def join(self):
+        """Tunggu sampai tidak ada URL antri/LEASED dan tidak ada operasi tertunda; raise error SQLite"""
+        while True:
+            self.check_error()
+            if not (self.pending or self.store.unfinished):
+                return
+            self.settled.clear()
+            await self.settled.wait()
+
+    def qsize(self):
+        return len(self.store)
+
+    def in_flight(self):
+        return self.store.counts[LEASED]
+
+    def __contains__(self, url):
+        return url in self.store
+
+    def close(self):
+        """Commit sisa batch dan tutup di thread SQLite setelah operasi yang masih antri"""
+        try:
+            self.db.submit(self.store.close).result()
+        finally:
+            self.db.shutdown(wait=True)
+
+    def summary(self):
+        return dict(self.store.summary(), hosts=self.scheduler.summary())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Crawl Priority - skor prioritas frontier per content type
+Halaman HTML (membuka URL baru) diambil dulu, media besar bernilai rendah terakhir
+"""
+
+import math
+import itertools
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+
+# Bobot default per content type (lebih besar = lebih dulu)
+DEFAULT_WEIGHTS = {
+    'html': 100,
+    'css': 80,
+    'js': 60,
+    'svg': 45,
+    'font': 40,
+    'image': 30,
+    'other': 20,
+    'document': 10,
+    'media': 5
+}
+
+CONTENT_TYPES = {
+    '.css': 'css',
+    '.js': 'js',
+    '.svg': 'svg',
+    '.woff': 'font', '.woff2': 'font', '.ttf': 'font', '.eot': 'font', '.otf': 'font',
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image',
+    '.ico': 'image', '.webp': 'image', '.bmp': 'image',
+    '.pdf': 'document', '.zip': 'document', '.rar': 'document',
+    '.mp3': 'media', '.mp4': 'media', '.avi': 'media', '.mov': 'media'
+}
+
+# Bonus maksimum untuk halaman yang ditemukan dari halaman "hub" (banyak URL baru)
+MAX_HUB_BONUS = 20
+
+def content_type(url, is_html=False):
+    """Content type dari flag HTML / ekstensi URL"""
+    if is_html:
+        return 'html'
+    extension = Path(unquote(urlparse(url).path)).suffix.lower()
+    return CONTENT_TYPES.get(extension, 'other')
+
+def parse_weights(spec):
+    """Parse 'html=100,image=10' jadi dict bobot"""
+    weights = {}
+    for part in (spec or '').split(','):
+        if not part.strip():
+            continue
+        name, _, value = part.partition('=')
+        weights[name.strip().lower()] = float(value)
+    return weights
+
+class PriorityScorer:
+    """Buat entry (priority, seq, url, is_html, depth) untuk PriorityQueue / asyncio.PriorityQueue"""
+
+    def __init__(self, weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.enqueued = {}
+
+    @staticmethod
+    def hub_bonus(new_urls):
+        """Bonus halaman dari referrer yang membuka new_urls URL baru (+5 per kelipatan 4x, maks MAX_HUB_BONUS)
+
+        Dihitung sekali per halaman referrer dari hasil akhirnya, jadi semua sibling dapat bonus yang sama
+        dan urutannya tetap FIFO.
+        """
+        if new_urls < 1:
+            return 0
+        return min(MAX_HUB_BONUS, 5 * int(math.log(new_urls, 4) + 1e-9))
+
+    def score(self, url, is_html, hub_bonus=0):
+        """Bobot content type (+ bonus hub untuk HTML); tanpa efek samping"""
+        score = self.weights.get(content_type(url, is_html), self.weights['other'])
+        return score + hub_bonus if is_html else score
+
+    def entry(self, url, is_html, hub_bonus=0, depth=0):
+        """Entry queue; seq menjaga urutan FIFO untuk skor yang sama"""
+        return (-self.score(url, is_html, hub_bonus), next(self.sequence), url, is_html, depth)
+
+    def accepted(self, url, is_html):
+        """Catat URL yang benar-benar diterima frontier (duplikat tidak dihitung)"""
+        kind = content_type(url, is_html)
+        with self.lock:
+            self.enqueued[kind] = self.enqueued.get(kind, 0) + 1
+
+    def sentinel(self):
+        """Entry stop worker, selalu diambil paling akhir"""
+        return (math.inf, next(self.sequence), None, False, 0)
+
+    def summary(self):
+        with self.lock:
+            return {'weights': dict(self.weights), 'enqueued': dict(self.enqueued)}
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Crawl Scope - batas kedalaman link, prefix path, jumlah halaman per prefix, dan host yang boleh di-crawl
+Untuk refresh dangkal situs besar tanpa masuk ke pohon arsip yang dalam
+"""
+
+import threading
+from fnmatch import fnmatchcase
+from urllib.parse import urlsplit
+
+class SiteAllowlist:
+    """Host yang masuk scope (pengganti netloc == domain)
+
+    Host situs awal selalu boleh. allowed_hosts: host lain yang di-crawl penuh (halaman + asset),
+    asset_hosts: host yang hanya diambil asset-nya (CDN), halamannya tidak di-crawl.
+    Pola: 'cdn.example.com', 'cdn.example.com:8080', '*.example.com' (cocok ke host atau host:port).
+    """
+
+    def __init__(self, base_url, allowed_hosts=None, asset_hosts=None):
+        self.base_host = urlsplit(base_url).netloc.lower()
+        self.allowed_hosts = tuple(host.lower() for host in allowed_hosts or ())
+        self.asset_hosts = tuple(host.lower() for host in asset_hosts or ())
+        self.decisions = {}
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'off_site': 0
+        }
+
+    @staticmethod
+    def matches(netloc, patterns):
+        hostname = netloc.rpartition('@')[2]
+        bare_host = hostname.rsplit(':', 1)[0] if not hostname.endswith(']') else hostname
+        return any(fnmatchcase(hostname, pattern) or fnmatchcase(bare_host, pattern) for pattern in patterns)
+
+    def allows(self, url, is_html=True):
+        """Cek host URL; halaman hanya dari situs awal + allowed_hosts, asset juga dari asset_hosts"""
+        netloc = urlsplit(url).netloc.lower()
+        key = (netloc, bool(is_html))
+        allowed = self.decisions.get(key)
+        if allowed is None:
+            allowed = (netloc == self.base_host or self.matches(netloc, self.allowed_hosts)
+                       or (not is_html and self.matches(netloc, self.asset_hosts)))
+            self.decisions[key] = allowed
+
+        if not allowed:
+            with self.lock:
+                self.stats['off_site'] += 1
+        return allowed
+
+    @property
+    def multi_host(self):
+        return bool(self.allowed_hosts or self.asset_hosts)
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, base_host=self.base_host, allowed_hosts=list(self.allowed_hosts),
+                        asset_hosts=list(self.asset_hosts))
+
+class CrawlScope:
+    """Kedalaman dan prefix dicek saat enqueue (frontier tidak membengkak),
+    kuota halaman per prefix dipakai saat halaman benar-benar akan di-fetch.
+
+    Depth: URL awal 0, link HTML +1, resource (CSS/JS/gambar) ikut depth halamannya.
+    Prefix dan kuota hanya berlaku untuk halaman HTML; asset halaman yang masuk scope tetap diambil.
+    """
+
+    def __init__(self, max_depth=None, path_prefixes=None, exclude_prefixes=None, max_pages_per_prefix=None,
+                 prefix_segments=1):
+        self.max_depth = max_depth
+        self.path_prefixes = tuple(self.normalize_prefix(prefix) for prefix in path_prefixes or ())
+        self.exclude_prefixes = tuple(self.normalize_prefix(prefix) for prefix in exclude_prefixes or ())
+        self.max_pages_per_prefix = max_pages_per_prefix
+        self.prefix_segments = prefix_segments
+        self.pages_per_prefix = {}
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'too_deep': 0,
+            'out_of_scope': 0,
+            'prefix_full': 0
+        }
+
+    @staticmethod
+    def normalize_prefix(prefix):
+        return prefix if prefix.startswith('/') else '/' + prefix
+
+    @property
+    def limited(self):
+        return (self.max_depth is not None or bool(self.path_prefixes) or bool(self.exclude_prefixes)
+                or self.max_pages_per_prefix is not None)
+
+    @staticmethod
+    def child_depth(depth, is_html):
+        """Depth URL yang ditemukan di halaman dengan depth tertentu"""
+        return depth + 1 if is_html else depth
+
+    def allows(self, url, depth, is_html=True):
+        """Cek depth + prefix sebelum URL masuk frontier"""
+        if self.max_depth is not None and depth > self.max_depth:
+            with self.lock:
+                self.stats['too_deep'] += 1
+            return False
+
+        if is_html and not self.in_scope(urlsplit(url).path or '/'):
+            with self.lock:
+                self.stats['out_of_scope'] += 1
+            return False
+        return True
+
+    def in_scope(self, path):
+        if any(path.startswith(prefix) for prefix in self.exclude_prefixes):
+            return False
+        return not self.path_prefixes or any(path.startswith(prefix) for prefix in self.path_prefixes)
+
+    def prefix_key(self, path):
+        """Prefix kuota: prefix include yang cocok, atau prefix_segments direktori pertama (/blog/)"""
+        for prefix in self.path_prefixes:
+            if path.startswith(prefix):
+                return prefix
+        directories = path.split('/')[1:-1][:self.prefix_segments]
+        return '/' + ''.join(directory + '/' for directory in directories)
+
+    def take(self, url, is_html=True):
+        """Pakai satu kuota halaman prefix URL ini; False jika prefix sudah penuh"""
+        if not is_html or self.max_pages_per_prefix is None:
+            return True
+
+        key = self.prefix_key(urlsplit(url).path or '/')
+        with self.lock:
+            count = self.pages_per_prefix.get(key, 0)
+            if count >= self.max_pages_per_prefix:
+                self.stats['prefix_full'] += 1
+                return False
+            self.pages_per_prefix[key] = count + 1
+            return True
+
+    def restore(self, urls):
+        """Resume: halaman yang sudah di-fetch run sebelumnya ikut menghabiskan kuota"""
+        for url in urls:
+            self.take(url)
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, max_depth=self.max_depth, path_prefixes=list(self.path_prefixes),
+                        exclude_prefixes=list(self.exclude_prefixes), max_pages_per_prefix=self.max_pages_per_prefix,
+                        pages_per_prefix=dict(self.pages_per_prefix))
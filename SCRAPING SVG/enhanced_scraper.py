@@ -9,7 +9,7 @@ import sys
 import time
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse, unquote
+from urllib.parse import urlparse, unquote
 from bs4 import BeautifulSoup
 import logging
 from selenium import webdriver
@@ -22,17 +22,33 @@ import threading
 from queue import Queue
 import json
 from collections import defaultdict
+from rate_limiter import HostRateLimiter, BandwidthLimiter
+from retry_policy import RetryPolicy, get_with_retry
+from crawl_priority import DEFAULT_WEIGHTS, content_type
+from crawl_budget import CrawlBudget, RequestTimeouts
+from chunk_reader import iter_chunks
+from seen_set import make_seen_set, ExactSeenSet, members, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
+from crawl_scope import SiteAllowlist
 
 class EnhancedWebScraper:
-    def __init__(self, base_url, download_dir="enhanced_download", headless=True):
+    def __init__(self, base_url, download_dir="enhanced_download", headless=True, max_bandwidth=None, bandwidth_shares=None,
+                 connect_timeout=10, read_timeout=15, total_timeout=120, time_budget=None,
+                 seen_set='exact', seen_error_rate=0.001, url_policy=None,
+                 allowed_hosts=None, asset_hosts=None):
+        # Link dan asset di-dedupe dalam bentuk canonical
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-crawl: situs awal + allowed_hosts, asset juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
-        self.visited_urls = set()
-        self.downloaded_files = set()
-        self.failed_urls = set()
+        # Set dedupe memakai backend pilihan (exact / bloom); failed_urls masuk report, selalu exact
+        self.visited_urls = make_seen_set(seen_set, seen_error_rate)
+        self.downloaded_files = make_seen_set(seen_set, seen_error_rate)
+        self.failed_urls = ExactSeenSet()
         self.url_queue = Queue()
         self.headless = headless
         
@@ -56,6 +72,18 @@ class EnhancedWebScraper:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy(logger=self.logger)
+        
+        # Batas byte/detik untuk semua download asset, dibagi per content type
+        self.bandwidth = BandwidthLimiter(max_bandwidth, bandwidth_shares)
+        
+        # Batas waktu crawl (time_budget detik): saat menipis hanya HTML/CSS/JS yang dikerjakan
+        self.budget = CrawlBudget(time_budget, min_score=DEFAULT_WEIGHTS['js'])
+        
+        # Timeout connect/read per request + deadline total body (slow-drip tidak menahan crawl)
+        self.timeouts = RequestTimeouts(connect_timeout, read_timeout, total_timeout, budget=self.budget)
+        
         # Statistics
         self.stats = {
             'pages_visited': 0,
@@ -158,10 +186,10 @@ class EnhancedWebScraper:
                 continue
             
             # Resolve to absolute URL
-            absolute_url = urljoin(base_url, href)
+            absolute_url = self.canonical.join(base_url, href)
             
-            # Check if same domain
-            if urlparse(absolute_url).netloc == self.domain:
+            # Check host ada di allowlist situs
+            if self.sites.allows(absolute_url):
                 links.append({
                     'url': absolute_url,
                     'text': a_tag.get_text(strip=True)[:100],
@@ -241,43 +269,52 @@ class EnhancedWebScraper:
     def download_asset(self, asset_url, base_url, asset_type):
         """Download single asset"""
         try:
+            # Resolve to absolute URL (canonical)
+            absolute_url = self.canonical.join(base_url, asset_url)
+            
             # Skip if already downloaded
-            if asset_url in self.downloaded_files:
+            if absolute_url in self.downloaded_files:
                 return
             
-            # Resolve to absolute URL
-            absolute_url = urljoin(base_url, asset_url)
-            
-            # Skip external domains
-            if urlparse(absolute_url).netloc != self.domain:
+            # Skip host di luar allowlist (asset boleh dari asset_hosts)
+            if not self.sites.allows(absolute_url, is_html=False):
                 return
             
             # Skip data URLs
             if absolute_url.startswith('data:'):
                 return
             
+            # Budget menipis: asset prioritas rendah (gambar, media) dilewati
+            if not self.budget.allows(DEFAULT_WEIGHTS.get(content_type(absolute_url))):
+                return
+            
             self.logger.info(f"📥 Downloading {asset_type}: {absolute_url}")
             
-            response = self.session.get(absolute_url, timeout=15, stream=True)
+            response = get_with_retry(self.session, absolute_url, self.retry_policy,
+                                      timeout=self.timeouts.requests_timeout(), stream=True)
             response.raise_for_status()
             
             # Determine file path
             url_path = urlparse(absolute_url).path
             if url_path:
-                file_path = self.download_dir / url_path.lstrip('/')
+                # Asset host lain (CDN) di subdirektori host supaya path yang sama tidak bertabrakan
+                netloc = urlparse(absolute_url).netloc
+                host_dir = netloc.replace(':', '_') if netloc != self.domain else ''
+                file_path = self.download_dir / host_dir / url_path.lstrip('/')
                 file_path.parent.mkdir(parents=True, exist_ok=True)
             else:
                 # Fallback filename
                 extension = self.get_extension_from_content_type(response.headers.get('content-type', ''))
                 file_path = self.download_dir / f"asset_{len(self.downloaded_files)}{extension}"
             
-            # Download file
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+            # Download file (dibatasi bandwidth global dan deadline total transfer)
+            with open(file_path, 'wb') as f, self.bandwidth.transfer(content_type(absolute_url)) as transfer:
+                for chunk in iter_chunks(response, self.timeouts.deadline(absolute_url), decode_content=True):
                     if chunk:
+                        transfer.consume(len(chunk))
                         f.write(chunk)
             
-            self.downloaded_files.add(asset_url)
+            self.downloaded_files.add(absolute_url)
             self.stats['assets_downloaded'] += 1
             self.logger.info(f"✅ Saved {asset_type}: {file_path}")
             
@@ -305,18 +342,28 @@ class EnhancedWebScraper:
         self.logger.info(f"📁 Download directory: {self.download_dir.absolute()}")
         
         # Add starting URL to queue
-        self.url_queue.put(self.base_url)
+        self.url_queue.put(self.canonical.canonicalize(self.base_url))
         
         pages_crawled = 0
         
+        # Delay antar halaman per host; waktu proses halaman ikut dihitung
+        self.rate_limiter = HostRateLimiter(delay=delay)
+        self.budget.start()
+        
         try:
             while not self.url_queue.empty() and pages_crawled < max_pages:
+                # Waktu crawl habis: berhenti, report tetap ditulis di cleanup()
+                if not self.budget.allows(DEFAULT_WEIGHTS['html']):
+                    self.logger.warning(f"⏰ Time budget exhausted, {self.url_queue.qsize()} URLs left in queue")
+                    break
+                
                 url = self.url_queue.get()
                 
                 if url in self.visited_urls:
                     continue
                 
                 # Visit page with browser
+                self.rate_limiter.wait(url)
                 page_data = self.visit_page(url)
                 
                 if page_data:
@@ -340,9 +387,6 @@ class EnhancedWebScraper:
                     if pages_crawled % 5 == 0:
                         self.print_progress()
                 
-                # Delay between requests
-                time.sleep(delay)
-                
         except KeyboardInterrupt:
             self.logger.info("⏹️ Crawling interrupted by user")
         
@@ -370,9 +414,14 @@ class EnhancedWebScraper:
             'base_url': self.base_url,
             'crawl_time': time.strftime('%Y-%m-%d %H:%M:%S'),
             'statistics': self.stats,
-            'visited_urls': list(self.visited_urls),
+            'visited_urls': members(self.visited_urls),
             'failed_urls': list(self.failed_urls),
-            'downloaded_files_count': len(self.downloaded_files)
+            'downloaded_files_count': len(self.downloaded_files),
+            'canonical_urls': self.canonical.summary(),
+            'seen_sets': self.seen_sets_summary(),
+            'retries': self.retry_policy.summary(),
+            'bandwidth': self.bandwidth.summary(),
+            'budget': self.budget.summary()
         }
         
         report_file = self.download_dir / 'crawling_report.json'
@@ -381,6 +430,10 @@ class EnhancedWebScraper:
         
         self.logger.info(f"📋 Report saved: {report_file}")
     
+    def seen_sets_summary(self):
+        return seen_sets_summary(visited_urls=self.visited_urls, downloaded_files=self.downloaded_files,
+                                 failed_urls=self.failed_urls)
+    
     def print_final_summary(self):
         """Print final summary"""
         self.logger.info("\n" + "="*60)
@@ -391,6 +444,7 @@ class EnhancedWebScraper:
         self.logger.info(f"📦 Assets Downloaded: {self.stats['assets_downloaded']}")
         self.logger.info(f"🔗 Links Found: {self.stats['links_found']}")
         self.logger.info(f"❌ Failed URLs: {len(self.failed_urls)}")
+        self.logger.info(f"🧮 Seen-sets: {format_seen_sets(self.seen_sets_summary())}")
         self.logger.info(f"📁 Output Directory: {self.download_dir.absolute()}")
         self.logger.info("="*60)
 
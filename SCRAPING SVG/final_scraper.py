@@ -152,7 +152,8 @@ Examples:
             scraper = WebScraper(
                 base_url=args.url,
                 download_dir=args.output,
-                max_workers=args.workers
+                max_workers=args.workers,
+                delay=args.delay
             )
             
             # Apply filters if specified
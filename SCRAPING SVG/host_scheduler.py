@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Host Scheduler - giliran antar host untuk frontier yang di-shard per host
+Banyak host di-crawl paralel, tapi tidak ada satu host yang dibanjiri request (per_host_limit in-flight)
+"""
+
+from urllib.parse import urlsplit
+
+# Policy giliran host
+SCHEDULING_POLICIES = ('round_robin', 'deficit')
+
+def url_host(url):
+    """Key shard frontier: netloc URL (host:port)"""
+    return urlsplit(url).netloc
+
+class HostScheduler:
+    """Pilih host berikutnya yang punya URL antri dan in-flight-nya < per_host_limit
+
+    round_robin: host bergiliran satu URL per giliran.
+    deficit: deficit round robin berbobot; tiap giliran host dapat quantum = bobotnya (default 1),
+    satu URL memakai 1, jadi host berbobot 3 mendapat ~3x jatah host berbobot 1.
+
+    Tidak punya lock sendiri: dipanggil dengan lock frontier (atau dari satu thread/event loop).
+    """
+
+    def __init__(self, per_host_limit=2, policy='round_robin', host_weights=None):
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(f"Unknown host scheduling policy: {policy} (choose from {', '.join(SCHEDULING_POLICIES)})")
+
+        if any(weight <= 0 for weight in (host_weights or {}).values()):
+            raise ValueError("Host weights must be positive")
+
+        self.per_host_limit = per_host_limit
+        self.policy = policy
+        self.host_weights = dict(host_weights or {})
+        self.ring = []
+        self.position = 0
+        self.in_flight = {}
+        self.deficit = {}
+        self.served = {}
+        self.peak_in_flight = {}
+
+        self.stats = {
+            'picks': 0,
+            'saturated': 0
+        }
+
+    def add_host(self, host):
+        if host not in self.in_flight:
+            self.ring.append(host)
+            self.in_flight[host] = 0
+            self.deficit[host] = 0
+            self.served[host] = 0
+            self.peak_in_flight[host] = 0
+
+    def eligible(self, host, queued):
+        return queued.get(host, 0) > 0 and (self.per_host_limit is None or self.in_flight[host] < self.per_host_limit)
+
+    def next_host(self, queued):
+        """Host giliran berikutnya dari {host: jumlah antri}; None jika kosong atau semua host penuh"""
+        for host in queued:
+            self.add_host(host)
+        if not self.ring:
+            return None
+
+        if self.policy == 'deficit':
+            host = self.next_deficit_host(queued)
+        else:
+            host = self.next_round_robin_host(queued)
+
+        if host is None:
+            if any(queued.values()):
+                self.stats['saturated'] += 1
+            return None
+
+        self.stats['picks'] += 1
+        self.served[host] += 1
+        return host
+
+    def next_round_robin_host(self, queued):
+        count = len(self.ring)
+        for step in range(count):
+            index = (self.position + step) % count
+            host = self.ring[index]
+            if self.eligible(host, queued):
+                self.position = (index + 1) % count
+                return host
+        return None
+
+    def next_deficit_host(self, queued):
+        # Host yang antriannya kosong kehilangan sisa deficit (DRR klasik)
+        for host in self.ring:
+            if not queued.get(host):
+                self.deficit[host] = 0
+
+        eligible = [host for host in self.ring if self.eligible(host, queued)]
+        if not eligible:
+            return None
+
+        count = len(self.ring)
+        while True:
+            for step in range(count):
+                index = (self.position + step) % count
+                host = self.ring[index]
+                if host in eligible and self.deficit[host] >= 1:
+                    self.deficit[host] -= 1
+                    # Host tetap di giliran selama deficit-nya masih cukup untuk satu URL lagi
+                    self.position = index if self.deficit[host] >= 1 else (index + 1) % count
+                    return host
+            for host in eligible:
+                self.deficit[host] += self.host_weights.get(host, 1)
+
+    def lease(self, host):
+        """URL host ini mulai dikerjakan"""
+        self.add_host(host)
+        self.in_flight[host] += 1
+        self.peak_in_flight[host] = max(self.peak_in_flight[host], self.in_flight[host])
+
+    def release(self, host):
+        """URL host ini selesai (apapun hasilnya)"""
+        if self.in_flight.get(host):
+            self.in_flight[host] -= 1
+
+    def summary(self):
+        hosts = {host: {'served': self.served[host], 'peak_in_flight': self.peak_in_flight[host]}
+                 for host in list(self.ring)}
+        return dict(self.stats, policy=self.policy, per_host_limit=self.per_host_limit, hosts=hosts)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+HTTP Revalidation Cache - simpan ETag/Last-Modified per URL di disk
+Re-crawl mengirim conditional GET, response 304 berarti file tidak berubah
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+class NotModifiedWithoutCache(Exception):
+    """Server/proxy membalas 304 padahal tidak ada salinan di cache yang bisa dipakai"""
+
+def mark_not_modified(http_cache, url):
+    """Catat response 304; raise NotModifiedWithoutCache jika cache mati atau file-nya tidak ada"""
+    if http_cache is None or http_cache.cached_path(url) is None:
+        raise NotModifiedWithoutCache(f"304 Not Modified for {url} without a cached copy")
+    http_cache.mark_unchanged(url)
+
+class HTTPCache:
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        self.stats = {
+            'unchanged': 0,
+            'stored': 0,
+            'bytes_saved': 0
+        }
+
+        self.load()
+
+    def load(self):
+        """Load cache index dari disk"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            # Cache rusak tidak fatal, mulai dari kosong
+            self.entries = {}
+
+    def save(self):
+        """Simpan cache index ke disk (atomic replace)"""
+        with self.lock:
+            snapshot = dict(self.entries)
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
+
+    def get_entry(self, url):
+        """Ambil entry cache, hanya jika file hasil download masih ada di disk"""
+        with self.lock:
+            entry = self.entries.get(url)
+
+        if not entry:
+            return None
+
+        path = Path(entry['path'])
+        if not path.exists() or path.stat().st_size != entry.get('size'):
+            return None
+
+        return entry
+
+    def cached_path(self, url):
+        """Path file yang tersimpan untuk URL ini (atau None)"""
+        entry = self.get_entry(url)
+        return Path(entry['path']) if entry else None
+
+    def read_cached(self, url):
+        """Baca isi file yang tersimpan untuk URL ini"""
+        path = self.cached_path(url)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, url):
+        """Header If-None-Match / If-Modified-Since untuk conditional GET"""
+        entry = self.get_entry(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response_headers, file_path):
+        """Catat validator dari response 200 yang baru ditulis ke file_path"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+
+        # Tanpa validator tidak ada yang bisa direvalidasi
+        if not etag and not last_modified:
+            return
+
+        file_path = Path(file_path)
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'path': str(file_path),
+            'size': file_path.stat().st_size,
+            'stored_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        with self.lock:
+            self.entries[url] = entry
+            self.stats['stored'] += 1
+
+    def mark_unchanged(self, url):
+        """Catat response 304 (file di disk masih valid)"""
+        with self.lock:
+            entry = self.entries.get(url)
+            self.stats['unchanged'] += 1
+            if entry:
+                self.stats['bytes_saved'] += entry.get('size', 0)
+                entry['checked_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def summary(self):
+        """Ringkasan statistik cache untuk report"""
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries))
@@ -9,11 +9,24 @@ import sys
 import time
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse, unquote
+from urllib.parse import urlparse, unquote
 from bs4 import BeautifulSoup
 import logging
 import json
 from collections import defaultdict
+from http_cache import HTTPCache, mark_not_modified
+from rate_limiter import HostRateLimiter, BandwidthLimiter
+from retry_policy import RetryPolicy, get_with_retry
+from crawl_budget import CrawlBudget, RequestTimeouts, get_with_deadline
+from chunk_reader import iter_chunks
+from robots_cache import RobotsCache
+from sitemap_discovery import SitemapDiscovery
+from crawl_priority import DEFAULT_WEIGHTS, content_type, parse_weights
+from crawl_frontier import CrawlFrontier, FRONTIER_FILE, QUEUED, LEASED, DONE, FAILED, SKIPPED
+from crawl_scope import CrawlScope, SiteAllowlist
+from host_scheduler import HostScheduler, SCHEDULING_POLICIES
+from seen_set import make_seen_set, ExactSeenSet, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
 
 # Try import Selenium
 SELENIUM_AVAILABLE = False
@@ -29,16 +42,36 @@ except ImportError:
     pass
 
 class HybridWebScraper:
-    def __init__(self, base_url, download_dir="hybrid_download", use_selenium=True):
+    def __init__(self, base_url, download_dir="hybrid_download", use_selenium=True, use_cache=True, respect_robots=True, use_sitemaps=True,
+                 max_bandwidth=None, bandwidth_shares=None, connect_timeout=10, read_timeout=15,
+                 total_timeout=120, time_budget=None, resume=False, seen_set='exact', seen_error_rate=0.001,
+                 url_policy=None, max_depth=None, path_prefixes=None, exclude_prefixes=None, max_pages_per_prefix=None,
+                 allowed_hosts=None, asset_hosts=None, host_scheduling='round_robin', host_weights=None):
+        # Link, asset dan URL sitemap di-dedupe dalam bentuk canonical
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-crawl: situs awal + allowed_hosts, asset juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
-        self.visited_urls = set()
-        self.downloaded_files = set()
-        self.failed_urls = set()
-        self.pending_urls = set([base_url])
+        # Set dedupe memakai backend pilihan (exact / bloom); failed_urls masuk report, selalu exact
+        self.visited_urls = make_seen_set(seen_set, seen_error_rate)
+        self.downloaded_files = make_seen_set(seen_set, seen_error_rate)
+        self.failed_urls = ExactSeenSet()
+        
+        # URL pending + yang sudah dilihat disimpan di SQLite (dibuka di crawl_website, jadi membuat scraper tidak menghapus frontier lama)
+        # resume=True melanjutkan crawl sebelumnya
+        self.start_url = self.canonical.canonicalize(base_url)
+        self.resume = resume
+        self.frontier = None
+        
+        # Halaman diambil bergiliran per host: delay per host satu host tertutup fetch host lain
+        self.host_scheduler = HostScheduler(None, host_scheduling, host_weights)
+        
+        # Batas kedalaman link / prefix path / halaman per prefix
+        self.scope = CrawlScope(max_depth, path_prefixes, exclude_prefixes, max_pages_per_prefix)
         
         # Determine scraping method
         self.use_selenium = use_selenium and SELENIUM_AVAILABLE
@@ -65,12 +98,39 @@ class HybridWebScraper:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-crawl
+        self.http_cache = HTTPCache(self.download_dir / '.http_cache.json') if use_cache else None
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy(logger=self.logger)
+        
+        # robots.txt per host (cache dengan TTL), URL disallow tidak masuk frontier
+        self.robots = RobotsCache(self.session, logger=self.logger) if respect_robots else None
+        
+        # Token bucket per host untuk halaman dan asset; delay diatur saat crawl mulai
+        self.rate_limiter = HostRateLimiter()
+        
+        # Batas byte/detik untuk semua download asset, dibagi per content type
+        self.bandwidth = BandwidthLimiter(max_bandwidth, bandwidth_shares)
+        
+        # Batas waktu crawl (time_budget detik): saat menipis hanya HTML/CSS/JS yang dikerjakan
+        self.budget = CrawlBudget(time_budget, min_score=DEFAULT_WEIGHTS['js'])
+        
+        # Timeout connect/read per request + deadline total body (slow-drip tidak menahan crawl)
+        self.timeouts = RequestTimeouts(connect_timeout, read_timeout, total_timeout, budget=self.budget)
+        
+        # Seed dari sitemap.xml supaya halaman diketahui sejak awal (lastmod disimpan untuk report)
+        self.use_sitemaps = use_sitemaps
+        self.sitemap_lastmod = {}
+        
         # Statistics
         self.stats = {
             'pages_visited': 0,
             'pages_downloaded': 0,
             'assets_downloaded': 0,
+            'assets_unchanged': 0,
             'links_found': 0,
+            'sitemap_urls': 0,
             'errors': 0,
             'method_used': self.method
         }
@@ -101,6 +161,10 @@ class HybridWebScraper:
             self.method = "Requests + BeautifulSoup (Fallback)"
             self.stats['method_used'] = self.method
     
+    def robots_allowed(self, url):
+        """Cek robots.txt (selalu True jika respect_robots=False)"""
+        return self.robots is None or self.robots.allowed(url)
+    
     def get_page_content(self, url):
         """Get page content menggunakan method yang tersedia"""
         if self.use_selenium:
@@ -143,7 +207,7 @@ class HybridWebScraper:
         try:
             self.logger.info(f"🌐 [Requests] Fetching: {url}")
             
-            response = self.session.get(url, timeout=15)
+            response = get_with_deadline(self.session, url, self.retry_policy, self.timeouts)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -176,10 +240,10 @@ class HybridWebScraper:
             if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
                 continue
             
-            absolute_url = urljoin(base_url, href)
+            absolute_url = self.canonical.join(base_url, href)
             
-            # Check if same domain
-            if urlparse(absolute_url).netloc == self.domain:
+            # Check host ada di allowlist situs
+            if self.sites.allows(absolute_url):
                 links.append({
                     'url': absolute_url,
                     'text': a_tag.get_text(strip=True)[:100],
@@ -199,8 +263,8 @@ class HybridWebScraper:
             for a_tag in soup.select(selector):
                 href = a_tag.get('href', '').strip()
                 if href and not href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
-                    absolute_url = urljoin(base_url, href)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, href)
+                    if self.sites.allows(absolute_url):
                         links.append({
                             'url': absolute_url,
                             'text': a_tag.get_text(strip=True)[:100],
@@ -238,7 +302,8 @@ class HybridWebScraper:
                 clean_path = ''.join(c for c in clean_path if c.isalnum() or c in '._-')
                 filename = f"{clean_path}.html" if clean_path else f"page_{len(self.visited_urls)}.html"
             
-            file_path = self.download_dir / filename
+            file_path = self.download_dir / self.host_dir(page_data['url']) / filename
+            file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save HTML
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -321,31 +386,53 @@ class HybridWebScraper:
     def download_single_asset(self, asset_url, base_url, asset_type, description):
         """Download single asset file"""
         try:
+            # Resolve URL (canonical: relatif dari halaman berbeda tetap satu key)
+            absolute_url = self.canonical.join(base_url, asset_url)
+            
             # Skip if already downloaded
-            if asset_url in self.downloaded_files:
+            if absolute_url in self.downloaded_files:
                 return
             
-            # Resolve URL
-            absolute_url = urljoin(base_url, asset_url)
-            
-            # Skip external domains
-            if urlparse(absolute_url).netloc != self.domain:
+            # Skip host di luar allowlist (asset boleh dari asset_hosts)
+            if not self.sites.allows(absolute_url, is_html=False):
                 return
             
             # Skip data URLs
             if absolute_url.startswith('data:'):
                 return
             
+            # Skip asset yang disallow di robots.txt
+            if not self.robots_allowed(absolute_url):
+                return
+            
+            # Budget menipis: asset prioritas rendah (gambar, media) dilewati
+            if not self.budget.allows(DEFAULT_WEIGHTS.get(content_type(absolute_url))):
+                return
+            
             self.logger.info(f"📥 Downloading {description}: {absolute_url}")
             
-            response = self.session.get(absolute_url, timeout=15, stream=True)
+            # --delay / Crawl-delay berlaku juga untuk asset, bukan hanya halaman
+            self.rate_limiter.wait(absolute_url)
+            headers = self.http_cache.conditional_headers(absolute_url) if self.http_cache else {}
+            response = get_with_retry(self.session, absolute_url, self.retry_policy,
+                                      timeout=self.timeouts.requests_timeout(), stream=True, headers=headers)
+            
+            # 304: asset di disk masih sama, skip write
+            if response.status_code == 304:
+                response.close()
+                mark_not_modified(self.http_cache, absolute_url)
+                self.downloaded_files.add(absolute_url)
+                self.stats['assets_unchanged'] += 1
+                self.logger.info(f"♻️ Unchanged: {self.http_cache.cached_path(absolute_url)}")
+                return
+            
             response.raise_for_status()
             
             # Determine save path
             url_path = urlparse(absolute_url).path
             if url_path:
                 # Preserve directory structure
-                save_path = self.download_dir / url_path.lstrip('/')
+                save_path = self.download_dir / self.host_dir(absolute_url) / url_path.lstrip('/')
                 save_path.parent.mkdir(parents=True, exist_ok=True)
             else:
                 # Generate filename
@@ -353,19 +440,27 @@ class HybridWebScraper:
                 save_path = self.download_dir / f"assets/asset_{len(self.downloaded_files)}{ext}"
                 save_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Download
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+            # Download (dibatasi bandwidth global dan deadline total transfer)
+            with open(save_path, 'wb') as f, self.bandwidth.transfer(content_type(absolute_url)) as transfer:
+                for chunk in iter_chunks(response, self.timeouts.deadline(absolute_url), decode_content=True):
                     if chunk:
+                        transfer.consume(len(chunk))
                         f.write(chunk)
             
-            self.downloaded_files.add(asset_url)
+            self.downloaded_files.add(absolute_url)
             self.stats['assets_downloaded'] += 1
+            if self.http_cache:
+                self.http_cache.store(absolute_url, response.headers, save_path)
             self.logger.info(f"✅ Saved: {save_path}")
             
         except Exception as e:
             self.logger.warning(f"⚠️ Failed to download {absolute_url}: {e}")
     
+    def host_dir(self, url):
+        """Subdirektori host lain (allowed_hosts / CDN) supaya path yang sama tidak bertabrakan"""
+        netloc = urlparse(url).netloc
+        return netloc.replace(':', '_') if netloc != self.domain else ''
+    
     def guess_extension(self, content_type, url):
         """Guess file extension"""
         # From content type
@@ -391,6 +486,21 @@ class HybridWebScraper:
         
         return ''
     
+    def seed_from_sitemaps(self):
+        """Isi frontier dari sitemap (robots.txt Sitemap: + /sitemap.xml) sebelum crawl"""
+        discovery = SitemapDiscovery(self.session, robots=self.robots, logger=self.logger)
+        
+        for url, lastmod in discovery.discover(self.base_url):
+            url = self.canonical.canonicalize(url)
+            if not self.sites.allows(url) or not self.robots_allowed(url):
+                continue
+            # Entry sitemap dihitung satu link dari halaman awal
+            if not self.scope.allows(url, 1) or not self.frontier.add(url, depth=1):
+                continue
+            if lastmod:
+                self.sitemap_lastmod[url] = lastmod
+            self.stats['sitemap_urls'] += 1
+    
     def crawl_website(self, max_pages=30, delay=1):
         """Main crawling function"""
         self.logger.info(f"🚀 Starting hybrid crawling of {self.base_url}")
@@ -399,20 +509,49 @@ class HybridWebScraper:
         
         pages_processed = 0
         
+        # Delay antar halaman per host; waktu proses halaman ikut dihitung
+        self.rate_limiter = HostRateLimiter(delay=delay)
+        if self.robots:
+            self.robots.rate_limiter = self.rate_limiter
+        
+        self.budget.start()
+        self.frontier = CrawlFrontier(self.download_dir / FRONTIER_FILE, resume=self.resume,
+                                      max_depth=self.scope.max_depth)
+        self.frontier.add(self.start_url)
+        if self.frontier.resumed:
+            self.logger.info(f"♻️ Resuming crawl: {len(self.frontier)} URLs pending, "
+                             f"{self.frontier.counts[DONE]} pages already visited")
+            if self.scope.max_pages_per_prefix is not None:
+                self.scope.restore(self.frontier.urls(DONE, FAILED))
+        elif self.use_sitemaps:
+            self.seed_from_sitemaps()
+        
         try:
-            while self.pending_urls and pages_processed < max_pages:
-                # Get next URL
-                url = self.pending_urls.pop()
+            while len(self.frontier) and pages_processed < max_pages:
+                # Waktu crawl habis: berhenti, sisa frontier tetap masuk report
+                if not self.budget.allows(DEFAULT_WEIGHTS['html']):
+                    self.logger.warning(f"⏰ Time budget exhausted, {len(self.frontier)} URLs left pending")
+                    break
+                
+                # Get next URL (giliran host, FIFO per host; URL yang sudah dilihat hanya masuk lagi jika di-readmit)
+                entry = self.frontier.pop_next(self.host_scheduler)
+                if entry is None:
+                    break
+                url, depth = entry[2], entry[4]
                 
-                if url in self.visited_urls:
+                # Kuota halaman prefix ini sudah habis (tidak antri lagi saat --resume);
+                # halaman yang di-readmit (ditemukan lebih dangkal) sudah memakai kuotanya
+                if url not in self.visited_urls and not self.scope.take(url):
+                    self.frontier.finish(url, SKIPPED)
                     continue
                 
                 # Visit page
+                self.rate_limiter.wait(url)
                 page_data = self.get_page_content(url)
                 
                 if page_data:
-                    self.visited_urls.add(url)
-                    self.stats['pages_visited'] += 1
+                    if self.visited_urls.add(url):
+                        self.stats['pages_visited'] += 1
                     
                     # Save HTML page
                     self.save_page_html(page_data)
@@ -425,9 +564,10 @@ class HybridWebScraper:
                     
                     # Add new URLs to pending
                     for link in links:
-                        if link['url'] not in self.visited_urls:
-                            self.pending_urls.add(link['url'])
+                        if self.scope.allows(link['url'], depth + 1) and self.robots_allowed(link['url']):
+                            self.frontier.add(link['url'], depth=depth + 1)
                     
+                    self.frontier.finish(url, DONE)
                     pages_processed += 1
                     
                     # Progress report
@@ -436,13 +576,11 @@ class HybridWebScraper:
                 
                 else:
                     self.failed_urls.add(url)
+                    self.frontier.finish(url, FAILED)
                     self.stats['errors'] += 1
                 
-                # Delay between requests
-                time.sleep(delay)
-                
         except KeyboardInterrupt:
-            self.logger.info("⏹️ Crawling interrupted by user")
+            self.logger.info("⏹️ Crawling interrupted by user (continue with --resume)")
         
         finally:
             self.cleanup()
@@ -451,15 +589,19 @@ class HybridWebScraper:
         """Print progress"""
         self.logger.info(f"📊 Progress: {self.stats['pages_visited']} pages, "
                         f"{self.stats['assets_downloaded']} assets, "
-                        f"{len(self.pending_urls)} pending URLs")
+                        f"{len(self.frontier)} pending URLs")
     
     def cleanup(self):
         """Cleanup and final report"""
         if hasattr(self, 'driver'):
             self.driver.quit()
         
+        if self.http_cache:
+            self.http_cache.save()
+        
         self.save_final_report()
         self.print_final_summary()
+        self.frontier.close()
     
     def save_final_report(self):
         """Save final crawling report"""
@@ -468,10 +610,22 @@ class HybridWebScraper:
             'crawl_completed': time.strftime('%Y-%m-%d %H:%M:%S'),
             'method_used': self.method,
             'statistics': self.stats,
-            'pages_visited': list(self.visited_urls),
+            'pages_visited': self.frontier.urls(DONE),
             'failed_urls': list(self.failed_urls),
-            'pending_urls': list(self.pending_urls),
-            'total_files_downloaded': len(self.downloaded_files)
+            'pending_urls': self.frontier.urls(QUEUED, LEASED),
+            'frontier': self.frontier.summary(),
+            'canonical_urls': self.canonical.summary(),
+            'scope': self.scope.summary(),
+            'sites': self.sites.summary(),
+            'hosts': self.host_scheduler.summary(),
+            'seen_sets': self.seen_sets_summary(),
+            'total_files_downloaded': len(self.downloaded_files),
+            'http_cache': self.http_cache.summary() if self.http_cache else None,
+            'robots': self.robots.summary() if self.robots else None,
+            'sitemap_lastmod': self.sitemap_lastmod,
+            'retries': self.retry_policy.summary(),
+            'bandwidth': self.bandwidth.summary(),
+            'budget': self.budget.summary()
         }
         
         report_file = self.download_dir / 'hybrid_crawling_report.json'
@@ -480,6 +634,10 @@ class HybridWebScraper:
         
         self.logger.info(f"📋 Report saved: {report_file}")
     
+    def seen_sets_summary(self):
+        return seen_sets_summary(visited_urls=self.visited_urls, downloaded_files=self.downloaded_files,
+                                 failed_urls=self.failed_urls)
+    
     def print_final_summary(self):
         """Print final summary"""
         self.logger.info("\n" + "="*60)
@@ -489,8 +647,18 @@ class HybridWebScraper:
         self.logger.info(f"🌐 Pages Visited: {self.stats['pages_visited']}")
         self.logger.info(f"💾 HTML Files: {self.stats['pages_downloaded']}")
         self.logger.info(f"📦 Assets Downloaded: {self.stats['assets_downloaded']}")
+        self.logger.info(f"♻️ Assets Unchanged (304): {self.stats['assets_unchanged']}")
         self.logger.info(f"🔗 Links Found: {self.stats['links_found']}")
+        self.logger.info(f"🗺️ Sitemap URLs: {self.stats['sitemap_urls']}")
         self.logger.info(f"❌ Errors: {self.stats['errors']}")
+        self.logger.info(f"🧮 Seen-sets: {format_seen_sets(self.seen_sets_summary())}")
+        if self.scope.limited:
+            scope_stats = self.scope.summary()
+            self.logger.info(f"🔭 Scope: {scope_stats['too_deep']} links too deep, {scope_stats['out_of_scope']} outside path prefixes, "
+                             f"{scope_stats['prefix_full']} over the per-prefix page limit")
+        host_stats = self.host_scheduler.summary()['hosts']
+        if len(host_stats) > 1:
+            self.logger.info("🌍 Hosts: " + ", ".join(f"{host} {stats['served']} pages" for host, stats in host_stats.items()))
         self.logger.info(f"📁 Output: {self.download_dir.absolute()}")
         
         if self.use_selenium:
@@ -520,6 +688,46 @@ def main():
     parser.add_argument('--no-selenium',
                        action='store_true',
                        help='Force use requests only (no Selenium)')
+    parser.add_argument('--time-budget',
+                       type=float, default=None,
+                       help='Batas waktu seluruh crawl dalam detik (default: unlimited)')
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Lanjutkan crawl sebelumnya dari frontier di output directory')
+    parser.add_argument('--seen-set',
+                       choices=['exact', 'bloom'], default='exact',
+                       help='Backend dedupe URL: exact atau bloom (hemat memori, ada false positive)')
+    parser.add_argument('--seen-error-rate',
+                       type=float, default=0.001,
+                       help='False positive rate maksimum untuk --seen-set bloom (default: 0.001)')
+    parser.add_argument('--depth',
+                       type=int, default=None,
+                       help='Kedalaman link maksimum dari URL awal (default: unlimited)')
+    parser.add_argument('--path-prefix',
+                       nargs='+', default=None,
+                       help='Hanya crawl halaman dengan path berawalan ini, contoh: /docs/ /blog/')
+    parser.add_argument('--exclude-prefix',
+                       nargs='+', default=None,
+                       help='Lewati halaman dengan path berawalan ini, contoh: /archive/')
+    parser.add_argument('--max-pages-per-prefix',
+                       type=int, default=None,
+                       help='Maksimum halaman per prefix (direktori pertama atau --path-prefix yang cocok)')
+    
+    parser.add_argument('--allow-host',
+                       nargs='+', default=None,
+                       help='Host lain yang ikut di-crawl, contoh: blog.example.com *.example.com')
+    
+    parser.add_argument('--asset-host',
+                       nargs='+', default=None,
+                       help='Host yang hanya diambil asset-nya (CDN), contoh: cdn.example.com')
+    
+    parser.add_argument('--host-scheduling',
+                       choices=SCHEDULING_POLICIES, default='round_robin',
+                       help='Giliran halaman antar host: round_robin atau deficit berbobot (default: round_robin)')
+    
+    parser.add_argument('--host-weights',
+                       default=None,
+                       help="Bobot host untuk --host-scheduling deficit, contoh: 'example.com=3,blog.example.com=1'")
     
     args = parser.parse_args()
     
@@ -538,7 +746,19 @@ def main():
         scraper = HybridWebScraper(
             base_url=args.url,
             download_dir=args.output,
-            use_selenium=not args.no_selenium
+            use_selenium=not args.no_selenium,
+            time_budget=args.time_budget,
+            resume=args.resume,
+            seen_set=args.seen_set,
+            seen_error_rate=args.seen_error_rate,
+            max_depth=args.depth,
+            path_prefixes=args.path_prefix,
+            exclude_prefixes=args.exclude_prefix,
+            max_pages_per_prefix=args.max_pages_per_prefix,
+            allowed_hosts=args.allow_host,
+            asset_hosts=args.asset_host,
+            host_scheduling=args.host_scheduling,
+            host_weights=parse_weights(args.host_weights)
         )
         
         scraper.crawl_website(
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Probe Engine - ribuan probe HEAD / ranged GET paralel lewat koneksi keep-alive
+Hasil di-stream lewat callback saat selesai, throughput dilaporkan dalam probes/s
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Try import aiohttp (engine utama); fallback ke thread pool + requests
+AIOHTTP_AVAILABLE = False
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    pass
+
+# Server yang tidak mendukung HEAD: ulangi dengan ranged GET
+HEAD_UNSUPPORTED = {405, 501}
+
+# Byte pertama yang diambil ranged GET (cukup untuk sniff '<svg')
+SNIFF_BYTES = 1024
+
+class ProbeResult:
+    """Hasil satu probe"""
+
+    def __init__(self, url, status=None, content_type='', size=None, head=b'', error=None):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.size = size
+        self.head = head
+        self.error = error
+
+    @property
+    def exists(self):
+        return self.status in (200, 206)
+
+    def looks_like_svg(self):
+        """Content-Type svg/xml, atau byte pertama berisi <svg"""
+        if 'svg' in self.content_type or 'xml' in self.content_type:
+            return True
+        return b'<svg' in self.head[:SNIFF_BYTES].lower()
+
+class ProbeEngine:
+    def __init__(self, concurrency=200, method='head', timeout=10, headers=None, rate_limiter=None):
+        self.concurrency = concurrency
+        self.method = method
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.rate_limiter = rate_limiter
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'probes': 0,
+            'hits': 0,
+            'errors': 0,
+            'elapsed': 0.0
+        }
+
+    def record(self, result):
+        with self.lock:
+            self.stats['probes'] += 1
+            if result.error:
+                self.stats['errors'] += 1
+            elif result.exists:
+                self.stats['hits'] += 1
+
+    def run(self, urls, on_result=None):
+        """Probe semua URL, panggil on_result(result) per probe yang selesai; return list hit"""
+        urls = list(dict.fromkeys(urls))
+        hits = []
+
+        def collect(result):
+            self.record(result)
+            if result.exists:
+                hits.append(result)
+            if on_result:
+                on_result(result)
+
+        start_time = time.perf_counter()
+        if AIOHTTP_AVAILABLE:
+            asyncio.run(self.run_async(urls, collect))
+        else:
+            self.run_threaded(urls, collect)
+
+        with self.lock:
+            self.stats['elapsed'] += time.perf_counter() - start_time
+        return hits
+
+    async def probe_async(self, http, url, method):
+        """Satu probe aiohttp; HEAD yang ditolak diulang sebagai ranged GET"""
+        if self.rate_limiter is not None:
+            wait_time = self.rate_limiter.reserve(url)
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+        try:
+            if method == 'head':
+                async with http.head(url, allow_redirects=True) as response:
+                    if response.status not in HEAD_UNSUPPORTED:
+                        return ProbeResult(url, response.status, response.headers.get('Content-Type', '').lower(),
+                                           response.headers.get('Content-Length'))
+                return await self.probe_async(http, url, 'get')
+
+            headers = {'Range': f'bytes=0-{SNIFF_BYTES - 1}'}
+            async with http.get(url, headers=headers, allow_redirects=True) as response:
+                head = await response.content.read(SNIFF_BYTES) if response.status in (200, 206) else b''
+                return ProbeResult(url, response.status, response.headers.get('Content-Type', '').lower(),
+                                   response_size(response.headers), head)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ProbeResult(url, error=str(e) or type(e).__name__)
+
+    async def run_async(self, urls, collect):
+        """Semua probe lewat satu ClientSession; connector membatasi koneksi keep-alive"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with semaphore:
+                return await self.probe_async(http, url, self.method)
+
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as http:
+            for task in asyncio.as_completed([bounded(url) for url in urls]):
+                collect(await task)
+
+    def probe_threaded(self, session, url, method):
+        """Versi requests dari probe_async"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(url)
+
+        try:
+            if method == 'head':
+                response = session.head(url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code not in HEAD_UNSUPPORTED:
+                    return ProbeResult(url, response.status_code, response.headers.get('Content-Type', '').lower(),
+                                       response.headers.get('Content-Length'))
+                return self.probe_threaded(session, url, 'get')
+
+            headers = {'Range': f'bytes=0-{SNIFF_BYTES - 1}'}
+            with session.get(url, timeout=self.timeout, headers=headers, stream=True) as response:
+                head = response.raw.read(SNIFF_BYTES, decode_content=True) if response.status_code in (200, 206) else b''
+                return ProbeResult(url, response.status_code, response.headers.get('Content-Type', '').lower(),
+                                   response_size(response.headers), head)
+        except requests.exceptions.RequestException as e:
+            return ProbeResult(url, error=str(e))
+
+    def run_threaded(self, urls, collect):
+        """Fallback tanpa aiohttp: thread pool dengan connection pool sebesar concurrency"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concurrency)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, 64)) as executor:
+            futures = [executor.submit(self.probe_threaded, session, url, self.method) for url in urls]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    def summary(self):
+        with self.lock:
+            elapsed = self.stats['elapsed']
+            return dict(self.stats, elapsed=round(elapsed, 2),
+                        probes_per_second=round(self.stats['probes'] / elapsed, 1) if elapsed else 0.0)
+
+def response_size(headers):
+    """Ukuran total dari Content-Range (ranged GET) atau Content-Length"""
+    content_range = headers.get('Content-Range', '')
+    if '/' in content_range and not content_range.endswith('*'):
+        return content_range.rsplit('/', 1)[1]
+    return headers.get('Content-Length')
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - token bucket per host dengan dukungan burst
+Hanya thread yang meminta host tersebut yang menunggu; host lain tetap jalan
+BandwidthLimiter memakai TokenBucket yang sama dengan token = byte
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Porsi bandwidth default per content type (dibandingkan antar content type yang sedang aktif)
+DEFAULT_BANDWIDTH_SHARES = {
+    'html': 8,
+    'css': 6,
+    'js': 6,
+    'svg': 4,
+    'font': 4,
+    'image': 3,
+    'other': 2,
+    'document': 1,
+    'media': 1
+}
+
+class TokenBucket:
+    """Token bucket thread-safe; rate token/detik, kapasitas burst token"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        # Bucket tanpa rate (delay 0) selalu penuh
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate) if self.rate else float(self.burst)
+        self.last = now
+
+    def reserve(self, tokens=1):
+        """Ambil token sekarang (boleh berhutang), return detik yang harus ditunggu"""
+        if not self.rate:
+            return 0.0
+
+        with self.lock:
+            self.refill(time.monotonic())
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            # Token negatif = antrian; tiap pemanggil dapat giliran sendiri
+            return -self.tokens / self.rate
+
+    def time_until_ready(self, tokens=1):
+        """Detik sampai token tersedia, tanpa mengambil token"""
+        if not self.rate:
+            return 0.0
+
+        with self.lock:
+            self.refill(time.monotonic())
+            missing = tokens - self.tokens
+            return max(0.0, missing / self.rate)
+
+    def consume(self, tokens=1):
+        """Blocking sampai token tersedia"""
+        wait_time = self.reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def set_rate(self, rate, burst=None):
+        """Ganti rate (dan kapasitas burst) di bawah lock, aman saat reserve() jalan di thread lain"""
+        with self.lock:
+            self.refill(time.monotonic())
+            self.rate = rate
+            if burst is not None:
+                self.burst = max(1, burst)
+                self.tokens = min(self.tokens, self.burst)
+
+class HostRateLimiter:
+    """Satu TokenBucket per host, dipakai bersama oleh semua worker"""
+
+    def __init__(self, delay=0, burst=1):
+        # delay detik antar request = rate 1/delay request per detik
+        self.default_rate = 1.0 / delay if delay and delay > 0 else None
+        self.burst = burst
+        self.buckets = {}
+        self.host_rates = {}
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,
+            'total_wait': 0.0
+        }
+
+    def bucket_for(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.default_rate), self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def set_host_delay(self, host, delay):
+        """Override delay untuk satu host (misal dari Crawl-delay robots.txt)"""
+        rate = 1.0 / delay if delay and delay > 0 else self.default_rate
+        with self.lock:
+            self.host_rates[host] = rate
+            bucket = self.buckets.get(host)
+        if bucket is not None:
+            bucket.set_rate(rate)
+
+    def reserve(self, url):
+        """Reservasi satu request untuk host URL ini, return detik yang harus ditunggu"""
+        wait_time = self.bucket_for(url).reserve()
+        with self.lock:
+            self.stats['requests'] += 1
+            if wait_time > 0:
+                self.stats['throttled'] += 1
+                self.stats['total_wait'] += wait_time
+        return wait_time
+
+    def wait(self, url):
+        """Blocking sampai boleh request ke host URL ini"""
+        wait_time = self.reserve(url)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def time_until_ready(self, url):
+        return self.bucket_for(url).time_until_ready()
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, total_wait=round(self.stats['total_wait'], 2))
+
+class BandwidthTransfer:
+    """Satu body yang sedang di-stream; tiap chunk dipotong dari bucket content type-nya"""
+
+    def __init__(self, limiter, content_type):
+        self.limiter = limiter
+        self.content_type = content_type
+
+    def reserve(self, nbytes):
+        """Ambil token sebanyak nbytes, return detik yang harus ditunggu (untuk asyncio.sleep)"""
+        return self.limiter.reserve(self.content_type, nbytes)
+
+    def consume(self, nbytes):
+        """Blocking sampai nbytes boleh diteruskan"""
+        wait_time = self.reserve(nbytes)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+class BandwidthLimiter:
+    """Batas byte/detik untuk semua worker, dibagi per content type
+
+    Tiap content type punya TokenBucket dengan rate = porsinya dari content type
+    yang sedang aktif, jadi totalnya selalu sama dengan batas dan porsi content
+    type yang idle dipakai yang lain. Token dipotong per chunk (boleh berhutang),
+    sehingga throughput rata tanpa sleep besar per request.
+    """
+
+    def __init__(self, max_bytes_per_second=None, shares=None, burst_seconds=0.05):
+        self.rate = max_bytes_per_second if max_bytes_per_second and max_bytes_per_second > 0 else None
+        self.shares = dict(DEFAULT_BANDWIDTH_SHARES, **(shares or {}))
+        self.burst_seconds = burst_seconds
+        self.buckets = {}
+        self.active = {}
+        self.lock = threading.Lock()
+        self.started = None
+
+        self.stats = {
+            'bytes': 0,
+            'throttled': 0,
+            'total_wait': 0.0,
+            'by_type': {}
+        }
+
+    def share(self, content_type):
+        return self.shares.get(content_type, self.shares['other'])
+
+    def rebalance(self):
+        """Bagi ulang rate antar content type aktif (dipanggil dengan self.lock)"""
+        total_share = sum(self.share(kind) for kind, count in self.active.items() if count)
+        for kind, bucket in self.buckets.items():
+            if self.active.get(kind):
+                rate = self.rate * self.share(kind) / total_share
+                bucket.set_rate(rate, burst=rate * self.burst_seconds)
+
+    @contextmanager
+    def transfer(self, content_type):
+        """Daftarkan satu transfer aktif selama body di-stream"""
+        if not self.rate:
+            yield BandwidthTransfer(self, content_type)
+            return
+
+        with self.lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            if content_type not in self.buckets:
+                self.buckets[content_type] = TokenBucket(self.rate, burst=1)
+            self.active[content_type] = self.active.get(content_type, 0) + 1
+            self.rebalance()
+
+        try:
+            yield BandwidthTransfer(self, content_type)
+        finally:
+            with self.lock:
+                # Content type yang selesai: porsinya langsung dibagi ke yang masih aktif
+                self.active[content_type] -= 1
+                if not self.active[content_type]:
+                    del self.active[content_type]
+                if self.active:
+                    self.rebalance()
+
+    def reserve(self, content_type, nbytes):
+        """Potong nbytes dari bucket content type ini, return detik yang harus ditunggu"""
+        wait_time = self.buckets[content_type].reserve(nbytes) if self.rate else 0.0
+        with self.lock:
+            self.stats['bytes'] += nbytes
+            by_type = self.stats['by_type']
+            by_type[content_type] = by_type.get(content_type, 0) + nbytes
+            if wait_time > 0:
+                self.stats['throttled'] += 1
+                self.stats['total_wait'] += wait_time
+        return wait_time
+
+    def summary(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started if self.started else 0.0
+            return dict(self.stats, by_type=dict(self.stats['by_type']), total_wait=round(self.stats['total_wait'], 2),
+                        limit_bytes_per_second=self.rate,
+                        bytes_per_second=round(self.stats['bytes'] / elapsed, 1) if elapsed else 0.0)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Resumable Download - download parsial disimpan sebagai <file>.part + <file>.part.json
+Retry / run berikutnya melanjutkan dengan Range + If-Range, bukan mulai dari byte 0
+"""
+
+import os
+import re
+import json
+import threading
+from pathlib import Path
+
+CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+UNSATISFIED_RANGE_RE = re.compile(r'bytes\s+\*/(\d+)')
+
+class ResumeError(Exception):
+    """File .part tidak bisa dipakai; layak di-retry, tapi bukan tanda host bermasalah (circuit breaker)"""
+
+class ResumeMismatchError(ResumeError):
+    """Range dari server tidak cocok dengan file .part; .part dibuang, retry dari awal"""
+
+class IntegrityError(ResumeError):
+    """Ukuran file hasil download tidak sama dengan yang diiklankan server"""
+
+class RangeNotSatisfiableError(ResumeError):
+    """416 untuk Range .part (file remote menyusut/berubah); .part dibuang, retry tanpa Range"""
+
+def parse_content_range(value):
+    """Parse 'bytes start-end/total' jadi (start, end, total atau None)"""
+    match = CONTENT_RANGE_RE.match(value or '')
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+class PartialDownload:
+    """State satu download: file .part dan metadata validator-nya"""
+
+    def __init__(self, store, url, file_path):
+        self.store = store
+        self.url = url
+        self.file_path = Path(file_path)
+        self.part_path = self.file_path.with_name(self.file_path.name + '.part')
+        self.meta_path = self.file_path.with_name(self.file_path.name + '.part.json')
+        self.meta = self.load()
+        self.offset = self.part_path.stat().st_size if self.meta else 0
+        self.resumable = False
+
+    def load(self):
+        """Load metadata .part.json; hanya valid untuk URL yang sama dan .part yang masih ada"""
+        if not self.part_path.exists() or not self.meta_path.exists():
+            return None
+
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return meta if meta.get('url') == self.url else None
+
+    def save_meta(self, received):
+        self.meta['received'] = received
+        tmp_file = self.meta_path.with_name(self.meta_path.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_file, self.meta_path)
+
+    def discard(self):
+        """Buang .part dan metadata"""
+        for path in (self.part_path, self.meta_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.meta = None
+        self.offset = 0
+
+    def validator(self):
+        """Validator untuk If-Range: ETag kuat, atau Last-Modified"""
+        etag = self.meta.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return self.meta.get('last_modified')
+
+    def request_headers(self):
+        """Header Range/If-Range jika ada .part yang bisa dilanjutkan"""
+        if not self.offset or not self.validator():
+            return {}
+
+        return {
+            'Range': f'bytes={self.offset}-',
+            'If-Range': self.validator(),
+            # Range dihitung dalam byte asli, jadi jangan minta gzip
+            'Accept-Encoding': 'identity'
+        }
+
+    def begin(self, status, headers):
+        """Cek response lalu buka .part: append (206) atau tulis ulang (200)"""
+        return open(self.part_path, self.prepare(status, headers))
+
+    def prepare(self, status, headers):
+        """Cek response + simpan metadata, return mode open .part ('ab' atau 'wb')"""
+        if status == 206 and self.offset:
+            content_range = parse_content_range(headers.get('Content-Range'))
+            etag = headers.get('ETag')
+            if (not content_range or content_range[0] != self.offset
+                    or content_range[2] != self.meta.get('total')
+                    or (etag and self.meta.get('etag') and etag != self.meta['etag'])):
+                self.discard()
+                raise ResumeMismatchError(f"Range response does not match partial file for {self.url}")
+
+            self.resumable = True
+            self.store.record_resume(self.offset)
+            self.save_meta(self.offset)
+            return 'ab'
+
+        # Response penuh (server abaikan Range atau validator berubah): mulai dari 0
+        self.offset = 0
+
+        # Body ter-encode (gzip) di-decode saat ditulis, offset tidak bisa dipetakan ke Range
+        total = headers.get('Content-Length')
+        self.resumable = not headers.get('Content-Encoding') and bool(
+            headers.get('ETag') or headers.get('Last-Modified'))
+        self.meta = {
+            'url': self.url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'total': int(total) if total and total.isdigit() else None
+        }
+
+        if self.resumable:
+            self.save_meta(0)
+        else:
+            try:
+                self.meta_path.unlink()
+            except FileNotFoundError:
+                pass
+
+        return 'wb'
+
+    def range_not_satisfiable(self, headers):
+        """416 untuk Range .part: .part yang ternyata sudah lengkap di-rename, selain itu dibuang lalu raise
+
+        .part lengkap terjadi jika crash antara write terakhir dan rename; Range bytes=<total>- pasti 416.
+        """
+        match = UNSATISFIED_RANGE_RE.match(headers.get('Content-Range') or '')
+        remote_total = int(match.group(1)) if match else None
+        total = self.meta.get('total') if self.meta else None
+        etag = headers.get('ETag')
+
+        if (total is not None and self.offset == total and remote_total in (None, total)
+                and not (etag and self.meta.get('etag') and etag != self.meta['etag'])):
+            self.finish()
+            return
+
+        self.discard()
+        self.store.record_unsatisfiable()
+        raise RangeNotSatisfiableError(f"Range not satisfiable for {self.url}, restarting without Range")
+
+    def begin_preallocated(self, size):
+        """Alokasikan .part ukuran penuh untuk segmented download (tidak di-resume)"""
+        self.offset = 0
+        self.resumable = False
+        self.meta = None
+        try:
+            self.meta_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        with open(self.part_path, 'wb') as f:
+            f.truncate(size)
+
+    def interrupted(self):
+        """Dipanggil saat body terputus: catat byte yang sudah diterima untuk resume"""
+        if self.resumable and self.part_path.exists():
+            received = self.part_path.stat().st_size
+            self.save_meta(received)
+            self.store.record_interrupted()
+
+    def finish(self):
+        """Integrity check ukuran lalu rename .part jadi file final"""
+        size = self.part_path.stat().st_size
+        total = self.meta.get('total') if self.meta else None
+
+        if total is not None and self.resumable and size != total:
+            if size > total:
+                self.discard()
+            else:
+                self.interrupted()
+            raise IntegrityError(f"Size mismatch for {self.url}: got {size} of {total} bytes")
+
+        os.replace(self.part_path, self.file_path)
+        try:
+            self.meta_path.unlink()
+        except FileNotFoundError:
+            pass
+
+class ResumableDownloads:
+    """Factory PartialDownload + statistik resume untuk report"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {
+            'resumed': 0,
+            'bytes_resumed': 0,
+            'interrupted': 0,
+            'unsatisfiable': 0
+        }
+
+    def open(self, url, file_path):
+        return PartialDownload(self, url, file_path)
+
+    def record_resume(self, offset):
+        with self.lock:
+            self.stats['resumed'] += 1
+            self.stats['bytes_resumed'] += offset
+
+    def record_interrupted(self):
+        with self.lock:
+            self.stats['interrupted'] += 1
+
+    def record_unsatisfiable(self):
+        with self.lock:
+            self.stats['unsatisfiable'] += 1
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Retry Policy - retry dengan exponential backoff + jitter dan circuit breaker per host
+Error transient di-retry, error fatal langsung gagal, host yang down di-skip cepat
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+from adaptive_concurrency import parse_retry_after
+from resumable_download import ResumeError
+
+# Try import aiohttp (hanya untuk klasifikasi error engine async)
+AIOHTTP_AVAILABLE = False
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    pass
+
+# Status HTTP yang layak dicoba lagi
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Host sedang dianggap down, request tidak dikirim"""
+
+class CircuitBreaker:
+    """Circuit breaker per host: closed -> open (setelah N gagal) -> half-open (probe)"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def get_state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = {'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0,
+                     'probing': False, 'times_opened': 0, 'rejected': 0}
+            self.hosts[host] = state
+        return state
+
+    def allow(self, host):
+        """Boleh kirim request ke host ini?"""
+        with self.lock:
+            state = self.get_state(host)
+
+            if state['state'] == self.CLOSED:
+                return True
+
+            if state['state'] == self.OPEN and time.monotonic() - state['opened_at'] >= self.reset_timeout:
+                state['state'] = self.HALF_OPEN
+                state['probing'] = False
+
+            # Half-open: hanya satu probe sekaligus
+            if state['state'] == self.HALF_OPEN and not state['probing']:
+                state['probing'] = True
+                return True
+
+            state['rejected'] += 1
+            return False
+
+    def is_closed(self, host):
+        """Host sehat (closed)? Tidak mengubah state, beda dengan allow() yang bisa mengambil jatah probe"""
+        with self.lock:
+            state = self.hosts.get(host)
+            return state is None or state['state'] == self.CLOSED
+
+    def record_success(self, host):
+        with self.lock:
+            state = self.get_state(host)
+            state['state'] = self.CLOSED
+            state['failures'] = 0
+            state['probing'] = False
+
+    def record_failure(self, host):
+        with self.lock:
+            state = self.get_state(host)
+            state['failures'] += 1
+            state['probing'] = False
+
+            if state['state'] == self.HALF_OPEN or state['failures'] >= self.failure_threshold:
+                if state['state'] != self.OPEN:
+                    state['times_opened'] += 1
+                state['state'] = self.OPEN
+                state['opened_at'] = time.monotonic()
+
+    def summary(self):
+        with self.lock:
+            return {
+                host: {'state': state['state'], 'times_opened': state['times_opened'], 'rejected': state['rejected']}
+                for host, state in self.hosts.items()
+                if state['times_opened']
+            }
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30, circuit_breaker=None, logger=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'retries': 0,
+            'recovered': 0,
+            'circuit_rejected': 0
+        }
+
+    def classify(self, error):
+        """Return (retryable, host_failure, retry_after) untuk sebuah exception"""
+        if isinstance(error, CircuitOpenError):
+            return False, False, None
+
+        # .part dibuang (mismatch/416/ukuran salah): retry dari awal, host-nya sendiri sehat
+        if isinstance(error, ResumeError):
+            return True, False, None
+
+        # HTTP error: tergantung status code
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+        if status:
+            headers = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            retryable = status in RETRYABLE_STATUSES
+            return retryable, retryable and status != 429, retry_after
+
+        # Koneksi putus, timeout, body terpotong: transient
+        transient = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                     requests.exceptions.ChunkedEncodingError, ConnectionError, TimeoutError,
+                     asyncio.TimeoutError)
+        if AIOHTTP_AVAILABLE:
+            transient += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+        if isinstance(error, transient):
+            return True, True, None
+
+        # Sisanya (URL invalid, redirect loop, disk penuh, dll) fatal
+        return False, False, None
+
+    def backoff(self, attempt, retry_after=None):
+        """Exponential backoff dengan full jitter, minimal Retry-After dari server"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def before_attempt(self, url, host):
+        if not self.circuit_breaker.allow(host):
+            with self.lock:
+                self.stats['circuit_rejected'] += 1
+            raise CircuitOpenError(f"Circuit open for {host}, skipping {url}")
+
+    def after_error(self, url, host, attempt, error):
+        """Catat error, return detik backoff jika perlu retry (atau raise ulang)"""
+        retryable, host_failure, retry_after = self.classify(error)
+
+        if host_failure:
+            self.circuit_breaker.record_failure(host)
+        else:
+            self.circuit_breaker.record_success(host)
+
+        if not retryable or attempt + 1 >= self.max_attempts:
+            raise error
+
+        delay = self.backoff(attempt, retry_after)
+        with self.lock:
+            self.stats['retries'] += 1
+        self.logger.warning(f"↻ Retry {attempt + 1}/{self.max_attempts - 1} for {url} in {delay:.1f}s: {error}")
+        return delay
+
+    def after_success(self, host, attempt):
+        self.circuit_breaker.record_success(host)
+        if attempt:
+            with self.lock:
+                self.stats['recovered'] += 1
+
+    def execute(self, url, func):
+        """Jalankan func() dengan retry; func harus raise untuk hasil gagal"""
+        host = urlparse(url).netloc
+
+        for attempt in range(self.max_attempts):
+            self.before_attempt(url, host)
+            try:
+                result = func()
+            except Exception as e:
+                time.sleep(self.after_error(url, host, attempt, e))
+            else:
+                self.after_success(host, attempt)
+                return result
+
+    async def execute_async(self, url, coro_func):
+        """Versi async dari execute(); coro_func() return coroutine baru tiap attempt"""
+        host = urlparse(url).netloc
+
+        for attempt in range(self.max_attempts):
+            self.before_attempt(url, host)
+            try:
+                result = await coro_func()
+            except Exception as e:
+                await asyncio.sleep(self.after_error(url, host, attempt, e))
+            else:
+                self.after_success(host, attempt)
+                return result
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, open_circuits=self.circuit_breaker.summary())
+
+def get_with_retry(session, url, retry_policy, **kwargs):
+    """session.get() dengan retry; status retryable (5xx/429) dianggap error"""
+    def attempt():
+        response = session.get(url, **kwargs)
+        if response.status_code in RETRYABLE_STATUSES:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    return retry_policy.execute(url, attempt)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Robots Cache - robots.txt per host di-cache dengan TTL
+URL yang disallow dibuang sebelum di-request, Crawl-delay diteruskan ke rate limiter
+"""
+
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+# Batas memo keputusan per host (dikosongkan jika penuh)
+MAX_DECISIONS_PER_HOST = 50000
+
+def parse_crawl_delay(lines, user_agent='*'):
+    """Crawl-delay untuk user agent ini; RobotFileParser hanya menerima angka bulat"""
+    agent = user_agent.split('/')[0].lower()
+    delays = {}
+    group = []
+    in_rules = False
+
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        key, _, value = line.partition(':')
+        key, value = key.strip().lower(), value.strip()
+
+        if key == 'user-agent':
+            # User-agent setelah rule = group baru
+            if in_rules:
+                group = []
+                in_rules = False
+            group.append(value.lower())
+        elif key:
+            in_rules = True
+            if key == 'crawl-delay':
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for name in group:
+                    delays.setdefault(name, delay)
+
+    # Group spesifik menang atas '*'
+    for name, delay in delays.items():
+        if name != '*' and name in agent:
+            return delay
+    return delays.get('*')
+
+class HostRobots:
+    """robots.txt satu host + memo keputusan per path"""
+
+    def __init__(self, parser, expires_at, crawl_delay=None):
+        self.parser = parser
+        self.expires_at = expires_at
+        self.crawl_delay = crawl_delay
+        self.decisions = {}
+
+class RobotsCache:
+    def __init__(self, session=None, user_agent='*', ttl=3600, error_ttl=300, timeout=10,
+                 rate_limiter=None, logger=None):
+        self.session = session or requests.Session()
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        # Crawl-delay diteruskan ke HostRateLimiter.set_host_delay (boleh di-set belakangan)
+        self.rate_limiter = rate_limiter
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.hosts = {}
+        self.fetch_locks = {}
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'fetched': 0,
+            'checked': 0,
+            'disallowed': 0
+        }
+
+    def fetch(self, scheme, host):
+        """Download dan parse robots.txt; semantik status sama dengan RobotFileParser.read()"""
+        robots_url = f"{scheme}://{host}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        ttl = self.ttl
+        crawl_delay = None
+
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                parser.allow_all = True
+            elif response.status_code >= 500:
+                # Server error: izinkan sementara, coba lagi lebih cepat
+                parser.allow_all = True
+                ttl = self.error_ttl
+            else:
+                lines = response.text.splitlines()
+                parser.parse(lines)
+                crawl_delay = parse_crawl_delay(lines, self.user_agent)
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"🤖 robots.txt unavailable for {host}: {e}")
+            parser.allow_all = True
+            ttl = self.error_ttl
+
+        parser.modified()
+
+        request_rate = parser.request_rate(self.user_agent)
+        if request_rate and request_rate.requests:
+            crawl_delay = max(crawl_delay or 0, request_rate.seconds / request_rate.requests)
+
+        with self.lock:
+            self.stats['fetched'] += 1
+
+        return HostRobots(parser, time.monotonic() + ttl, float(crawl_delay) if crawl_delay else None)
+
+    def robots_for(self, url):
+        """HostRobots untuk host URL ini; fetch hanya saat pertama kali / setelah TTL habis"""
+        parsed = urlparse(url)
+        host = parsed.netloc
+
+        robots = self.hosts.get(host)
+        if robots is not None and time.monotonic() < robots.expires_at:
+            return robots
+
+        # Satu fetch per host, thread lain menunggu hasilnya
+        with self.lock:
+            fetch_lock = self.fetch_locks.setdefault(host, threading.Lock())
+
+        with fetch_lock:
+            robots = self.hosts.get(host)
+            if robots is None or time.monotonic() >= robots.expires_at:
+                robots = self.fetch(parsed.scheme or 'http', host)
+                self.hosts[host] = robots
+
+                if robots.crawl_delay and self.rate_limiter is not None:
+                    self.apply_crawl_delay(host, robots.crawl_delay)
+
+        return robots
+
+    def apply_crawl_delay(self, host, crawl_delay):
+        """Crawl-delay hanya boleh memperlambat, tidak mempercepat --delay dari user"""
+        default_rate = self.rate_limiter.default_rate
+        if default_rate is None or 1.0 / crawl_delay < default_rate:
+            self.rate_limiter.set_host_delay(host, crawl_delay)
+            self.logger.info(f"🤖 Crawl-delay {crawl_delay}s applied for {host}")
+
+    def allowed(self, url):
+        """Boleh di-crawl menurut robots.txt? O(1) untuk path yang sudah pernah dicek"""
+        robots = self.robots_for(url)
+
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+
+        decision = robots.decisions.get(path)
+        if decision is None:
+            decision = robots.parser.can_fetch(self.user_agent, url)
+            if len(robots.decisions) >= MAX_DECISIONS_PER_HOST:
+                robots.decisions.clear()
+            robots.decisions[path] = decision
+
+        with self.lock:
+            self.stats['checked'] += 1
+            if not decision:
+                self.stats['disallowed'] += 1
+
+        return decision
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, crawl_delays={
+                host: robots.crawl_delay for host, robots in self.hosts.items() if robots.crawl_delay
+            })
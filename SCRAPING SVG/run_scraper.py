@@ -7,8 +7,18 @@ import argparse
 import sys
 from pathlib import Path
 from web_scraper import WebScraper
+from async_scraper import AsyncWebScraper
+from crawl_priority import parse_weights
+from host_scheduler import SCHEDULING_POLICIES
 from analyze_downloads import ScrapingAnalyzer
 
+def url_policy(args):
+    """Policy URLCanonicalizer dari argumen CLI"""
+    policy = {'sort_query': not args.keep_query_order, 'strip_index': not args.keep_index}
+    if args.drop_params is not None:
+        policy['drop_params'] = args.drop_params
+    return policy
+
 def main():
     parser = argparse.ArgumentParser(description='Web Scraper untuk Mofi Template')
     
@@ -23,7 +33,16 @@ def main():
     
     parser.add_argument('--workers', '-w',
                        type=int, default=8,
-                       help='Jumlah worker threads (default: 8)')
+                       help='Jumlah worker threads, atau request in-flight untuk engine async (default: 8)')
+    
+    parser.add_argument('--engine', '-e',
+                       choices=['threaded', 'async'],
+                       default='threaded',
+                       help='Crawl engine: threaded (requests) atau async (aiohttp) (default: threaded)')
+    
+    parser.add_argument('--adaptive',
+                       action='store_true',
+                       help='Atur request in-flight per host otomatis (latency, 429/503); --workers jadi batas atas')
     
     parser.add_argument('--analyze', '-a',
                        action='store_true',
@@ -31,11 +50,103 @@ def main():
     
     parser.add_argument('--depth', '-d',
                        type=int, default=None,
-                       help='Kedalaman maksimum scraping (default: unlimited)')
+                       help='Kedalaman link maksimum dari URL awal; CSS/JS/gambar ikut halamannya (default: unlimited)')
+    
+    parser.add_argument('--path-prefix',
+                       nargs='+', default=None,
+                       help='Hanya crawl halaman dengan path berawalan ini, contoh: /docs/ /blog/')
+    
+    parser.add_argument('--exclude-prefix',
+                       nargs='+', default=None,
+                       help='Lewati halaman dengan path berawalan ini, contoh: /archive/')
+    
+    parser.add_argument('--max-pages-per-prefix',
+                       type=int, default=None,
+                       help='Maksimum halaman per prefix (direktori pertama atau --path-prefix yang cocok)')
+    
+    parser.add_argument('--allow-host',
+                       nargs='+', default=None,
+                       help='Host lain yang ikut di-crawl penuh, contoh: blog.example.com *.example.com')
+    
+    parser.add_argument('--asset-host',
+                       nargs='+', default=None,
+                       help='Host yang hanya diambil asset-nya (CDN), contoh: cdn.example.com')
+    
+    parser.add_argument('--per-host-limit',
+                       type=int, default=None,
+                       help='Maksimum request in-flight per host (default: unlimited)')
+    
+    parser.add_argument('--host-scheduling',
+                       choices=SCHEDULING_POLICIES, default='round_robin',
+                       help='Giliran antar host: round_robin atau deficit berbobot (default: round_robin)')
+    
+    parser.add_argument('--host-weights',
+                       default=None,
+                       help="Bobot host untuk --host-scheduling deficit, contoh: 'example.com=3,cdn.example.com=1'")
     
     parser.add_argument('--delay', 
                        type=float, default=0.5,
-                       help='Delay antar request dalam detik (default: 0.5)')
+                       help='Delay antar request ke host yang sama dalam detik (default: 0.5)')
+    
+    parser.add_argument('--burst',
+                       type=int, default=1,
+                       help='Jumlah request beruntun yang boleh lewat sebelum --delay berlaku (default: 1)')
+    
+    parser.add_argument('--io-workers',
+                       type=int, default=2,
+                       help='Jumlah thread I/O yang menulis file ke disk, terpisah dari --workers (default: 2)')
+    
+    parser.add_argument('--segments',
+                       type=int, default=0,
+                       help='Download file besar (>= 4 MB, Accept-Ranges) dalam N range paralel (default: 0 = off)')
+    
+    parser.add_argument('--max-bandwidth',
+                       type=float, default=None,
+                       help='Batas total bandwidth semua worker dalam KB/s (default: unlimited)')
+    
+    parser.add_argument('--bandwidth-shares',
+                       default=None,
+                       help='Porsi bandwidth per content type, contoh: html=8,css=6,image=3,media=1')
+    
+    parser.add_argument('--time-budget',
+                       type=float, default=None,
+                       help='Batas waktu seluruh crawl dalam detik; menjelang habis hanya HTML/CSS/JS yang diambil')
+    
+    parser.add_argument('--timeouts',
+                       type=float, nargs=3, default=[10, 30, 300], metavar=('CONNECT', 'READ', 'TOTAL'),
+                       help='Timeout connect, read (antar byte) dan total transfer per request dalam detik (default: 10 30 300)')
+    
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Lanjutkan crawl yang terhenti (crash / Ctrl-C) dari frontier di --output')
+    
+    parser.add_argument('--seen-set',
+                       choices=['exact', 'bloom'], default='exact',
+                       help='Backend dedupe URL: exact (set) atau bloom (hemat memori, ada false positive) (default: exact)')
+    
+    parser.add_argument('--seen-error-rate',
+                       type=float, default=0.001,
+                       help='False positive rate maksimum untuk --seen-set bloom (default: 0.001)')
+    
+    parser.add_argument('--keep-query-order',
+                       action='store_true',
+                       help='Jangan urutkan parameter query saat membuat URL canonical')
+    
+    parser.add_argument('--keep-index',
+                       action='store_true',
+                       help='Anggap dir/index.html berbeda dari dir/ (default: sama)')
+    
+    parser.add_argument('--drop-params',
+                       nargs='*', default=None,
+                       help='Pola nama parameter query yang dibuang dari URL (default: utm_* fbclid gclid mc_cid mc_eid)')
+    
+    parser.add_argument('--ignore-robots',
+                       action='store_true',
+                       help='Jangan cek robots.txt (default: URL disallow dilewati, Crawl-delay dipatuhi)')
+    
+    parser.add_argument('--weights',
+                       default=None,
+                       help='Bobot prioritas per content type, contoh: html=100,css=80,image=10,media=1')
     
     parser.add_argument('--extensions',
                        nargs='+',
@@ -61,10 +172,29 @@ def main():
     print("="*70)
     print(f"Target URL: {args.url}")
     print(f"Output Directory: {output_path.absolute()}")
-    print(f"Workers: {args.workers}")
-    if args.depth:
+    print(f"Engine: {args.engine}")
+    print(f"Workers: {args.workers}{' (adaptive max)' if args.adaptive else ''}")
+    if args.depth is not None:
         print(f"Max Depth: {args.depth}")
-    print(f"Request Delay: {args.delay}s")
+    if args.path_prefix or args.exclude_prefix:
+        print(f"Path Scope: {' '.join(args.path_prefix or ['/'])}"
+              f"{' (excluding ' + ' '.join(args.exclude_prefix) + ')' if args.exclude_prefix else ''}")
+    if args.max_pages_per_prefix:
+        print(f"Max Pages per Prefix: {args.max_pages_per_prefix}")
+    if args.allow_host or args.asset_host:
+        print(f"Extra Hosts: {' '.join(args.allow_host or [])}"
+              f"{' (assets: ' + ' '.join(args.asset_host) + ')' if args.asset_host else ''}")
+    if args.per_host_limit or args.host_scheduling != 'round_robin':
+        print(f"Host Scheduling: {args.host_scheduling}, {args.per_host_limit or 'unlimited'} in flight per host")
+    print(f"Request Delay: {args.delay}s (burst {args.burst})")
+    if args.max_bandwidth:
+        print(f"Max Bandwidth: {args.max_bandwidth:g} KB/s")
+    if args.time_budget:
+        print(f"Time Budget: {args.time_budget:g}s")
+    if args.resume:
+        print("Resume: continuing previous crawl")
+    if args.seen_set != 'exact':
+        print(f"Seen-set: {args.seen_set} (error rate {args.seen_error_rate:g})")
     if args.extensions:
         print(f"Include Extensions: {', '.join(args.extensions)}")
     if args.exclude_extensions:
@@ -88,10 +218,37 @@ def main():
     
     # Start scraping
     try:
-        scraper = WebScraper(
+        scraper_class = AsyncWebScraper if args.engine == 'async' else WebScraper
+        scraper = scraper_class(
             base_url=args.url,
             download_dir=str(output_path),
-            max_workers=args.workers
+            max_workers=args.workers,
+            adaptive=args.adaptive,
+            delay=args.delay,
+            burst=args.burst,
+            segments=args.segments,
+            priority_weights=parse_weights(args.weights),
+            respect_robots=not args.ignore_robots,
+            max_bandwidth=args.max_bandwidth * 1024 if args.max_bandwidth else None,
+            bandwidth_shares=parse_weights(args.bandwidth_shares),
+            connect_timeout=args.timeouts[0],
+            read_timeout=args.timeouts[1],
+            total_timeout=args.timeouts[2],
+            time_budget=args.time_budget,
+            io_workers=args.io_workers,
+            resume=args.resume,
+            seen_set=args.seen_set,
+            seen_error_rate=args.seen_error_rate,
+            url_policy=url_policy(args),
+            max_depth=args.depth,
+            path_prefixes=args.path_prefix,
+            exclude_prefixes=args.exclude_prefix,
+            max_pages_per_prefix=args.max_pages_per_prefix,
+            allowed_hosts=args.allow_host,
+            asset_hosts=args.asset_host,
+            per_host_limit=args.per_host_limit,
+            host_scheduling=args.host_scheduling,
+            host_weights=parse_weights(args.host_weights)
         )
         
         # Apply custom settings if provided
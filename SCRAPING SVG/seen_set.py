@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Seen Set - set URL yang bisa diganti backend-nya: exact (set biasa) atau scalable Bloom filter
+Bloom filter memakai ~1-2 byte per URL (bukan puluhan byte string + overhead set), dengan false positive rate yang diatur
+"""
+
+import sys
+import math
+import hashlib
+import threading
+
+# Backend yang tersedia untuk make_seen_set
+SEEN_BACKENDS = ('exact', 'bloom')
+
+class ExactSeenSet(set):
+    """set biasa: tanpa false positive, bisa di-iterate (untuk report); add() return True jika baru"""
+
+    exact = True
+    backend = 'exact'
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.lock = threading.Lock()
+
+    def add(self, item):
+        with self.lock:
+            if item in self:
+                return False
+            super().add(item)
+            return True
+
+    def memory_bytes(self):
+        """Ukuran set + semua string di dalamnya"""
+        return sys.getsizeof(self) + sum(sys.getsizeof(item) for item in list(self))
+
+    def summary(self):
+        return {'backend': self.backend, 'count': len(self), 'memory_bytes': self.memory_bytes()}
+
+class BloomFilter:
+    """Bloom filter kapasitas tetap; posisi bit ke-i = (h1 + i * h2) mod num_bits"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def contains(self, h1, h2):
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, h1, h2):
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+class ScalableBloomSeenSet:
+    """Rangkaian Bloom filter yang tumbuh (Almeida et al.): filter baru 2x lebih besar dengan error rate
+    setengahnya, jadi total false positive tetap <= error_rate berapapun jumlah URL-nya.
+
+    Tidak bisa di-iterate; len() = jumlah add() yang dianggap baru.
+    """
+
+    exact = False
+    backend = 'bloom'
+
+    def __init__(self, error_rate=0.001, initial_capacity=20000, growth=2, tightening=0.5):
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters = []
+        self.lock = threading.Lock()
+        self.new_filter(initial_capacity, error_rate * (1 - tightening))
+
+    def new_filter(self, capacity, error_rate):
+        self.filters.append(BloomFilter(capacity, error_rate))
+
+    @staticmethod
+    def hashes(item):
+        """Dua hash 64-bit untuk double hashing (h2 ganjil supaya semua posisi terjangkau)"""
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def __contains__(self, item):
+        h1, h2 = self.hashes(item)
+        with self.lock:
+            return any(bloom.contains(h1, h2) for bloom in self.filters)
+
+    def add(self, item):
+        """Return False jika item (mungkin) sudah pernah dilihat"""
+        h1, h2 = self.hashes(item)
+        with self.lock:
+            if any(bloom.contains(h1, h2) for bloom in self.filters):
+                return False
+
+            last = self.filters[-1]
+            if last.full:
+                self.new_filter(last.capacity * self.growth, last.error_rate * self.tightening)
+                last = self.filters[-1]
+            last.add(h1, h2)
+            return True
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def __iter__(self):
+        raise TypeError("Bloom seen-set cannot list its members, use the exact backend")
+
+    def memory_bytes(self):
+        return sys.getsizeof(self.filters) + sum(sys.getsizeof(bloom.bits) for bloom in self.filters)
+
+    def summary(self):
+        with self.lock:
+            return {'backend': self.backend, 'count': len(self), 'memory_bytes': self.memory_bytes(),
+                    'error_rate': self.error_rate, 'filters': len(self.filters)}
+
+def make_seen_set(backend='exact', error_rate=0.001, initial_capacity=20000):
+    """Seen-set sesuai backend ('exact' / 'bloom')"""
+    if backend == 'exact':
+        return ExactSeenSet()
+    if backend == 'bloom':
+        return ScalableBloomSeenSet(error_rate, initial_capacity)
+    raise ValueError(f"Unknown seen-set backend: {backend} (choose from {', '.join(SEEN_BACKENDS)})")
+
+def members(seen):
+    """Isi seen-set untuk report; None jika backend tidak bisa di-iterate (Bloom)"""
+    return list(seen) if seen.exact else None
+
+def seen_sets_summary(**sets):
+    """{nama: summary} untuk semua seen-set sebuah scraper"""
+    return {name: seen.summary() for name, seen in sets.items()}
+
+def format_seen_sets(summary):
+    """'visited_urls 1,234 (bloom, 12.3 KB), ...' untuk log"""
+    return ', '.join(f"{name} {stats['count']:,} ({stats['backend']}, {stats['memory_bytes'] / 1024:,.1f} KB)"
+                     for name, stats in summary.items())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Segmented Download - file besar dipecah jadi N byte range yang di-download paralel
+File .part dialokasikan penuh di awal, tiap segment menulis langsung ke offset-nya
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from resumable_download import parse_content_range
+from chunk_reader import iter_chunks
+from host_scheduler import url_host
+
+# Segment async menulis ke disk lewat executor per buffer sebesar ini, bukan per chunk
+ASYNC_WRITE_BUFFER = 1024 * 1024
+
+class SegmentError(requests.exceptions.ConnectionError):
+    """Segment gagal atau range dari server tidak cocok; download diulang utuh"""
+
+def write_at(path, offset, data):
+    """Tulis data ke offset di file yang sudah dialokasikan (dipanggil dari thread executor)"""
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+class SegmentGate:
+    """Jatah request range tambahan untuk satu file: circuit breaker, per_host_limit, slot concurrency, rate limiter
+
+    Request utama sudah memegang satu slot; slot untuk segment lain diambil tanpa blocking
+    (menunggu slot host yang sama sambil memegang slot bisa deadlock), jadi jumlah segment
+    mengikuti sisa jatah host. Tiap request range tetap menunggu token rate limiter.
+    """
+
+    def __init__(self, rate_limiter, concurrency, circuit_breaker=None, scheduler=None):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
+        self.scheduler = scheduler
+
+    def claim(self, url, wanted):
+        """Ambil sampai wanted slot tambahan untuk host URL, return jumlah yang didapat"""
+        host = url_host(url)
+        if self.circuit_breaker is not None and not self.circuit_breaker.is_closed(host):
+            return 0
+
+        # per_host_limit dihitung per URL yang di-lease; URL ini sendiri sudah termasuk in_flight
+        if self.scheduler is not None and self.scheduler.per_host_limit is not None:
+            wanted = min(wanted, self.scheduler.per_host_limit - self.scheduler.in_flight.get(host, 1))
+
+        granted = 0
+        while granted < wanted:
+            acquired, _ = self.concurrency.try_acquire(host)
+            if not acquired:
+                break
+            granted += 1
+        return granted
+
+    def release(self, url, status=None, latency=None, error=False):
+        self.concurrency.release(url_host(url), status=status, latency=latency, error=error)
+
+    def wait(self, url):
+        return self.rate_limiter.wait(url)
+
+    def reserve(self, url):
+        return self.rate_limiter.reserve(url)
+
+class SegmentedDownloader:
+    def __init__(self, segments=4, min_size=4 * 1024 * 1024, timeout=30, gate=None):
+        self.segments = segments
+        self.min_size = min_size
+        self.timeout = timeout
+        # SegmentGate dari scraper; None = segment tidak dibatasi (pemakaian standalone)
+        self.gate = gate
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'files': 0,
+            'segments': 0,
+            'bytes': 0,
+            'limited': 0
+        }
+
+    def should_segment(self, status, headers):
+        """Hanya response 200 penuh, Accept-Ranges: bytes, tanpa encoding, dan cukup besar"""
+        if self.segments < 2 or status != 200:
+            return False
+        if headers.get('Accept-Ranges', '').lower() != 'bytes' or headers.get('Content-Encoding'):
+            return False
+
+        length = headers.get('Content-Length', '')
+        return length.isdigit() and int(length) >= self.min_size
+
+    def plan(self, total, segments=None):
+        """Bagi [0, total) jadi daftar (start, end) inklusif, maksimal segments bagian"""
+        segments = segments or self.segments
+        count = max(1, min(segments, total // max(1, self.min_size // self.segments)))
+        size = -(-total // count)
+        return [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+    def range_headers(self, start, end, headers):
+        """Header Range; If-Range memastikan semua segment dari versi file yang sama"""
+        range_headers = {'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+        etag = headers.get('ETag')
+        validator = etag if etag and not etag.startswith('W/') else headers.get('Last-Modified')
+        if validator:
+            range_headers['If-Range'] = validator
+        return range_headers
+
+    def check_range(self, url, status, headers, start, end):
+        content_range = parse_content_range(headers.get('Content-Range'))
+        if status != 206 or not content_range or content_range[:2] != (start, end):
+            raise SegmentError(f"Server did not honour range {start}-{end} for {url} (status {status})")
+
+    def write_chunk(self, f, chunk, remaining):
+        """Tulis chunk, potong jika melewati batas segment; return sisa byte"""
+        chunk = chunk[:remaining]
+        f.write(chunk)
+        return remaining - len(chunk)
+
+    def fetch_segment(self, session, url, part_path, start, end, headers, response=None, transfer=None, deadline=None):
+        """Download satu segment; segment pertama memakai body response awal"""
+        if response is None:
+            return self.fetch_range(session, url, part_path, start, end, headers, transfer, deadline)
+
+        remaining = end - start + 1
+        try:
+            with open(part_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in iter_chunks(response, deadline, decode_content=True):
+                    if transfer is not None:
+                        transfer.consume(len(chunk))
+                    remaining = self.write_chunk(f, chunk, remaining)
+                    if remaining <= 0:
+                        break
+        finally:
+            response.close()
+
+        if remaining > 0:
+            raise SegmentError(f"Segment {start}-{end} of {url} incomplete ({remaining} bytes missing)")
+
+    def fetch_range(self, session, url, part_path, start, end, headers, transfer=None, deadline=None):
+        """Request range untuk segment selain yang pertama; slot dari gate dilepas setelah segment selesai"""
+        status = None
+        started = time.monotonic()
+        try:
+            if self.gate is not None:
+                self.gate.wait(url)
+            if deadline is not None:
+                deadline.check()
+            response = session.get(url, headers=self.range_headers(start, end, headers), stream=True, timeout=self.timeout)
+            status = response.status_code
+            try:
+                self.check_range(url, response.status_code, response.headers, start, end)
+            except SegmentError:
+                response.close()
+                raise
+            self.fetch_segment(session, url, part_path, start, end, headers, response, transfer, deadline)
+        finally:
+            if self.gate is not None:
+                self.gate.release(url, status=status, latency=time.monotonic() - started, error=status is None)
+
+    def claim(self, url, total):
+        """Rencana range untuk file ini; dengan gate jumlah segment = 1 + slot tambahan yang didapat"""
+        if self.gate is None:
+            return self.plan(total)
+
+        wanted = len(self.plan(total)) - 1
+        granted = self.gate.claim(url, wanted)
+        ranges = self.plan(total, 1 + granted)
+        # Slot yang tidak terpakai (pembulatan plan) langsung dikembalikan
+        for _ in range(granted - (len(ranges) - 1)):
+            self.gate.release(url)
+        if granted < wanted:
+            with self.lock:
+                self.stats['limited'] += 1
+        return ranges
+
+    def download(self, session, url, response, partial, transfer=None, deadline=None):
+        """Download response 200 (Accept-Ranges) secara tersegmen ke partial.part_path
+
+        transfer (BandwidthTransfer) dipakai bersama semua segment supaya tetap di bawah batas bandwidth,
+        deadline (TransferDeadline) berlaku untuk seluruh file, bukan per segment
+        """
+        total = int(response.headers['Content-Length'])
+        ranges = self.claim(url, total)
+        try:
+            partial.begin_preallocated(total)
+        except BaseException:
+            self.release_unused(url, len(ranges) - 1)
+            raise
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(self.fetch_segment, session, url, partial.part_path, start, end,
+                                response.headers, response if i == 0 else None, transfer, deadline)
+                for i, (start, end) in enumerate(ranges)
+            ]
+            for future in futures:
+                future.result()
+
+        self.record(len(ranges), total)
+
+    async def fetch_segment_async(self, http, url, part_path, start, end, headers, response=None, transfer=None,
+                                  deadline=None):
+        """Versi aiohttp dari fetch_segment; tulis ke disk lewat executor supaya event loop tidak terblokir"""
+        if response is None:
+            return await self.fetch_range_async(http, url, part_path, start, end, headers, transfer, deadline)
+
+        loop = asyncio.get_running_loop()
+        remaining = end - start + 1
+        offset = start
+        buffer = bytearray()
+        async for chunk in response.content.iter_any():
+            if deadline is not None:
+                deadline.check()
+            if transfer is not None:
+                wait_time = transfer.reserve(len(chunk))
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+            chunk = chunk[:remaining]
+            buffer += chunk
+            remaining -= len(chunk)
+            if len(buffer) >= ASYNC_WRITE_BUFFER or remaining <= 0:
+                await loop.run_in_executor(None, write_at, part_path, offset, bytes(buffer))
+                offset += len(buffer)
+                buffer.clear()
+            if remaining <= 0:
+                break
+        if buffer:
+            await loop.run_in_executor(None, write_at, part_path, offset, bytes(buffer))
+
+        if remaining > 0:
+            raise SegmentError(f"Segment {start}-{end} of {url} incomplete ({remaining} bytes missing)")
+
+    async def fetch_range_async(self, http, url, part_path, start, end, headers, transfer=None, deadline=None):
+        """Versi aiohttp dari fetch_range"""
+        status = None
+        started = time.monotonic()
+        try:
+            if self.gate is not None:
+                wait_time = self.gate.reserve(url)
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+            if deadline is not None:
+                deadline.check()
+            async with http.get(url, headers=self.range_headers(start, end, headers)) as response:
+                status = response.status
+                self.check_range(url, response.status, response.headers, start, end)
+                await self.fetch_segment_async(http, url, part_path, start, end, headers, response, transfer, deadline)
+        finally:
+            if self.gate is not None:
+                self.gate.release(url, status=status, latency=time.monotonic() - started, error=status is None)
+
+    async def download_async(self, http, url, response, partial, transfer=None, deadline=None):
+        """Versi aiohttp dari download"""
+        total = int(response.headers['Content-Length'])
+        ranges = self.claim(url, total)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, partial.begin_preallocated, total)
+        except BaseException:
+            self.release_unused(url, len(ranges) - 1)
+            raise
+
+        # Tunggu semua segment selesai sebelum raise, supaya tidak ada yang masih menulis ke .part
+        results = await asyncio.gather(*[
+            self.fetch_segment_async(http, url, partial.part_path, start, end,
+                                     response.headers, response if i == 0 else None, transfer, deadline)
+            for i, (start, end) in enumerate(ranges)
+        ], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        self.record(len(ranges), total)
+
+    def release_unused(self, url, count):
+        if self.gate is not None:
+            for _ in range(count):
+                self.gate.release(url)
+
+    def record(self, segments, total):
+        with self.lock:
+            self.stats['files'] += 1
+            self.stats['segments'] += segments
+            self.stats['bytes'] += total
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
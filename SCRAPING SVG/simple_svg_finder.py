@@ -9,15 +9,22 @@ import sys
 import time
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import re
 import json
+from url_canonical import make_canonicalizer
+from crawl_scope import SiteAllowlist
 
 class SimpleSVGFinder:
-    def __init__(self, base_url, output_dir="svg_results"):
+    def __init__(self, base_url, output_dir="svg_results", url_policy=None,
+                 allowed_hosts=None, asset_hosts=None):
+        # URL halaman dan SVG di-dedupe dalam bentuk canonical
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-scan: situs awal + allowed_hosts, SVG juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -63,8 +70,8 @@ class SimpleSVGFinder:
                 url = element.get(attr, '').strip()
                 if url and '.svg' in url:
                     clean_url = url.split('#')[0]  # Remove fragment
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         svg_urls.add(absolute_url)
                         print(f"   Found in <{tag} {attr}>: {absolute_url}")
         
@@ -75,8 +82,8 @@ class SimpleSVGFinder:
             svg_matches = re.findall(r'url\(["\']?([^"\']*\.svg[^"\']*)["\']?\)', css_content)
             for match in svg_matches:
                 clean_url = match.split('#')[0]
-                absolute_url = urljoin(base_url, clean_url)
-                if urlparse(absolute_url).netloc == self.domain:
+                absolute_url = self.canonical.join(base_url, clean_url)
+                if self.sites.allows(absolute_url, is_html=False):
                     svg_urls.add(absolute_url)
                     print(f"   Found in CSS: {absolute_url}")
         
@@ -87,8 +94,8 @@ class SimpleSVGFinder:
             svg_matches = re.findall(r'url\(["\']?([^"\']*\.svg[^"\']*)["\']?\)', style_attr)
             for match in svg_matches:
                 clean_url = match.split('#')[0]
-                absolute_url = urljoin(base_url, clean_url)
-                if urlparse(absolute_url).netloc == self.domain:
+                absolute_url = self.canonical.join(base_url, clean_url)
+                if self.sites.allows(absolute_url, is_html=False):
                     svg_urls.add(absolute_url)
                     print(f"   Found in style attr: {absolute_url}")
         
@@ -101,8 +108,8 @@ class SimpleSVGFinder:
             for match in svg_matches:
                 if '/' in match:  # Likely a path
                     clean_url = match.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         svg_urls.add(absolute_url)
                         print(f"   Found in JS: {absolute_url}")
         
@@ -112,8 +119,8 @@ class SimpleSVGFinder:
             for attr, value in element.attrs.items():
                 if isinstance(value, str) and '.svg' in value:
                     clean_url = value.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
-                    if urlparse(absolute_url).netloc == self.domain:
+                    absolute_url = self.canonical.join(base_url, clean_url)
+                    if self.sites.allows(absolute_url, is_html=False):
                         svg_urls.add(absolute_url)
                         print(f"   Found in {attr}: {absolute_url}")
         
@@ -130,8 +137,8 @@ class SimpleSVGFinder:
         for pattern in common_patterns:
             matches = re.findall(pattern, html_text, re.IGNORECASE)
             for match in matches:
-                absolute_url = urljoin(base_url, match)
-                if urlparse(absolute_url).netloc == self.domain:
+                absolute_url = self.canonical.join(base_url, match)
+                if self.sites.allows(absolute_url, is_html=False):
                     svg_urls.add(absolute_url)
                     print(f"   Found by pattern: {absolute_url}")
         
@@ -194,8 +201,8 @@ class SimpleSVGFinder:
         for a_tag in soup.find_all('a', href=True):
             href = a_tag['href'].strip()
             if href and not href.startswith(('#', 'javascript:', 'mailto:')):
-                absolute_url = urljoin(base_url, href)
-                if (urlparse(absolute_url).netloc == self.domain and
+                absolute_url = self.canonical.join(base_url, href)
+                if (self.sites.allows(absolute_url) and
                     (absolute_url.endswith('.html') or '.' not in Path(urlparse(absolute_url).path).name)):
                     links.add(absolute_url)
         
@@ -205,7 +212,7 @@ class SimpleSVGFinder:
         """Scan website untuk SVG files"""
         print(f"🚀 Starting SVG scan of {self.base_url}")
         
-        to_visit = [self.base_url]
+        to_visit = [self.canonical.canonicalize(self.base_url)]
         pages_scanned = 0
         
         while to_visit and pages_scanned < max_pages:
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Singleflight - satu fetch per URL; pemanggil lain untuk URL yang sama
+menunggu hasil fetch pertama, bukan men-download (dan menimpa file) lagi
+
+Hanya fetch yang sedang berjalan yang diingat: setelah selesai key dibuang,
+dedupe sesudahnya urusan seen-set scraper (memori tetap datar)
+"""
+
+import asyncio
+import threading
+from urllib.parse import urldefrag
+
+def flight_key(url):
+    """Key coalescing: URL tanpa fragment (#...)"""
+    return urldefrag(url)[0]
+
+class Call:
+    """Satu eksekusi yang sedang berjalan"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Versi thread: dipakai queue worker dan ThreadPoolExecutor"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+        self.stats = {
+            'executed': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key, func, *args):
+        """Jalankan func(*args) sekali per key selama masih in-flight; pemanggil yang datang saat itu ikut hasilnya"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Call()
+                self.calls[key] = call
+                self.stats['executed'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.event.set()
+
+        return call.result
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
+
+class AsyncSingleFlight:
+    """Versi asyncio: semua coroutine jalan di satu event loop, tidak perlu lock"""
+
+    def __init__(self):
+        self.calls = {}
+
+        self.stats = {
+            'executed': 0,
+            'coalesced': 0
+        }
+
+    async def do(self, key, coro_func, *args):
+        """Jalankan await coro_func(*args) sekali per key selama in-flight; yang lain await Future yang sama"""
+        future = self.calls.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        self.stats['executed'] += 1
+
+        try:
+            result = await coro_func(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Hindari warning "exception never retrieved" jika tidak ada yang menunggu
+            future.exception()
+            raise
+        finally:
+            self.calls.pop(key, None)
+
+        future.set_result(result)
+        return result
+
+    def summary(self):
+        return dict(self.stats)
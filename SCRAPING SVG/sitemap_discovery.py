@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Sitemap Discovery - seed frontier dari Sitemap: di robots.txt dan /sitemap.xml
+Mendukung sitemap index dan .xml.gz; XML di-parse streaming (iterparse) beserta lastmod
+"""
+
+import gzip
+import logging
+import xml.etree.ElementTree as ET
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+
+from robots_cache import RobotsCache
+
+def local_name(tag):
+    """'{http://www.sitemaps.org/...}loc' -> 'loc'"""
+    return tag.rsplit('}', 1)[-1]
+
+class SitemapDiscovery:
+    def __init__(self, session=None, robots=None, max_sitemaps=100, max_urls=50000, timeout=30, logger=None):
+        self.session = session or requests.Session()
+        self.robots = robots or RobotsCache(self.session)
+        self.max_sitemaps = max_sitemaps
+        self.max_urls = max_urls
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.stats = {
+            'sitemaps_fetched': 0,
+            'sitemaps_failed': 0,
+            'urls_found': 0
+        }
+
+    def initial_sitemaps(self, base_url):
+        """Sitemap dari robots.txt, plus /sitemap.xml sebagai fallback"""
+        parsed = urlparse(base_url)
+        root = f"{parsed.scheme}://{parsed.netloc}"
+
+        sitemaps = list(self.robots.robots_for(base_url).parser.site_maps() or [])
+        sitemaps.append(f"{root}/sitemap.xml")
+        return sitemaps
+
+    def open_stream(self, response, sitemap_url):
+        """File-like body; .gz tanpa Content-Encoding di-gunzip sambil jalan"""
+        response.raw.decode_content = True
+        content_type = response.headers.get('Content-Type', '').lower()
+        if not response.headers.get('Content-Encoding') and (
+                urlparse(sitemap_url).path.endswith('.gz') or 'gzip' in content_type):
+            return gzip.GzipFile(fileobj=response.raw)
+        return response.raw
+
+    def iter_entries(self, sitemap_url):
+        """Yield (kind, loc, lastmod) dengan kind 'url' atau 'sitemap' (sitemap index)"""
+        response = self.session.get(sitemap_url, timeout=self.timeout, stream=True)
+        try:
+            if response.status_code != 200:
+                raise requests.exceptions.HTTPError(f"{response.status_code} for {sitemap_url}", response=response)
+
+            loc = lastmod = None
+            root = None
+            path = []
+            for event, elem in ET.iterparse(self.open_stream(response, sitemap_url), events=('start', 'end')):
+                name = local_name(elem.tag)
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    path.append(name)
+                    continue
+
+                path.pop()
+                parent = path[-1] if path else None
+
+                # Hanya <loc>/<lastmod> langsung di bawah <url>/<sitemap> (bukan image:loc dll)
+                if name == 'loc' and parent in ('url', 'sitemap'):
+                    loc = (elem.text or '').strip()
+                elif name == 'lastmod' and parent in ('url', 'sitemap'):
+                    lastmod = (elem.text or '').strip() or None
+                elif name in ('url', 'sitemap') and parent is not None:
+                    if loc:
+                        yield name, loc, lastmod
+                    loc = lastmod = None
+                    # Buang elemen yang sudah diproses supaya memori tetap kecil
+                    root.clear()
+        finally:
+            response.close()
+
+    def discover(self, base_url):
+        """Yield (page_url, lastmod) dari semua sitemap yang terjangkau"""
+        queue = deque(self.initial_sitemaps(base_url))
+        seen_sitemaps = set()
+        found = 0
+
+        while queue and len(seen_sitemaps) < self.max_sitemaps and found < self.max_urls:
+            sitemap_url = queue.popleft()
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            try:
+                for kind, loc, lastmod in self.iter_entries(sitemap_url):
+                    if kind == 'sitemap':
+                        queue.append(loc)
+                        continue
+
+                    found += 1
+                    yield loc, lastmod
+                    if found >= self.max_urls:
+                        break
+
+                self.stats['sitemaps_fetched'] += 1
+            except (requests.exceptions.RequestException, ET.ParseError, OSError, EOFError) as e:
+                self.stats['sitemaps_failed'] += 1
+                self.logger.debug(f"🗺️ Sitemap {sitemap_url} skipped: {e}")
+
+        self.stats['urls_found'] += found
+        if found:
+            self.logger.info(f"🗺️ Sitemap discovery: {found} URLs from {self.stats['sitemaps_fetched']} sitemaps")
+
+    def summary(self):
+        return dict(self.stats)
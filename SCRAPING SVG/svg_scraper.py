@@ -9,12 +9,25 @@ import sys
 import time
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse, unquote
+from urllib.parse import urlparse, unquote
 from bs4 import BeautifulSoup
 import logging
 import json
 import re
 from collections import defaultdict
+from http_cache import HTTPCache, mark_not_modified
+from rate_limiter import HostRateLimiter
+from retry_policy import RetryPolicy
+from crawl_budget import CrawlBudget, RequestTimeouts, get_with_deadline
+from svg_stream import SVGStream, DEFAULT_MAX_BYTES
+from crawl_priority import DEFAULT_WEIGHTS, parse_weights
+from robots_cache import RobotsCache
+from sitemap_discovery import SitemapDiscovery
+from crawl_frontier import CrawlFrontier, FRONTIER_FILE, QUEUED, LEASED, DONE, FAILED, SKIPPED
+from crawl_scope import CrawlScope, SiteAllowlist
+from host_scheduler import HostScheduler, SCHEDULING_POLICIES
+from seen_set import make_seen_set, ExactSeenSet, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
 
 # Try import Selenium
 SELENIUM_AVAILABLE = False
@@ -30,9 +43,17 @@ except ImportError:
     pass
 
 class SVGScraper:
-    def __init__(self, base_url, download_dir="svg_download", use_selenium=True):
+    def __init__(self, base_url, download_dir="svg_download", use_selenium=True, use_cache=True, respect_robots=True, use_sitemaps=True,
+                 connect_timeout=10, read_timeout=15, total_timeout=120, time_budget=None, resume=False,
+                 seen_set='exact', seen_error_rate=0.001, url_policy=None, max_svg_bytes=DEFAULT_MAX_BYTES,
+                 max_depth=None, path_prefixes=None, exclude_prefixes=None, max_pages_per_prefix=None,
+                 allowed_hosts=None, asset_hosts=None, host_scheduling='round_robin', host_weights=None):
+        # Halaman dan URL SVG di-dedupe dalam bentuk canonical
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-scan: situs awal + allowed_hosts, SVG juga dari asset_hosts (CDN)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
@@ -42,11 +63,23 @@ class SVGScraper:
         self.svg_dir.mkdir(exist_ok=True)
         self.html_dir.mkdir(exist_ok=True)
         
-        self.visited_urls = set()
-        self.svg_urls = set()
-        self.downloaded_svgs = set()
-        self.failed_urls = set()
-        self.pending_urls = set([base_url])
+        # visited_urls memakai backend pilihan (exact / bloom); set SVG dan failed di-list di report, selalu exact
+        self.visited_urls = make_seen_set(seen_set, seen_error_rate)
+        self.svg_urls = ExactSeenSet()
+        self.downloaded_svgs = ExactSeenSet()
+        self.failed_urls = ExactSeenSet()
+        
+        # Halaman pending + yang sudah dilihat disimpan di SQLite (dibuka di scan_for_svgs, jadi membuat scraper tidak menghapus frontier lama)
+        # resume=True melanjutkan scan sebelumnya
+        self.start_url = self.canonical.canonicalize(base_url)
+        self.resume = resume
+        self.frontier = None
+        
+        # Halaman diambil bergiliran per host
+        self.host_scheduler = HostScheduler(None, host_scheduling, host_weights)
+        
+        # Batas kedalaman link / prefix path / halaman per prefix
+        self.scope = CrawlScope(max_depth, path_prefixes, exclude_prefixes, max_pages_per_prefix)
         
         # SVG detection patterns
         self.svg_patterns = [
@@ -80,12 +113,39 @@ class SVGScraper:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-scan
+        self.http_cache = HTTPCache(self.download_dir / '.http_cache.json') if use_cache else None
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy(logger=self.logger)
+        
+        # Batas waktu crawl (time_budget detik): saat menipis hanya HTML/CSS/JS yang dikerjakan
+        self.budget = CrawlBudget(time_budget, min_score=DEFAULT_WEIGHTS['js'])
+        
+        # Timeout connect/read per request + deadline total body (slow-drip tidak menahan crawl)
+        self.timeouts = RequestTimeouts(connect_timeout, read_timeout, total_timeout, budget=self.budget)
+        
+        # Body SVG divalidasi dari KB pertama (halaman error HTML tidak disimpan sebagai .svg), dibatasi max_svg_bytes
+        self.max_svg_bytes = max_svg_bytes
+        
+        # robots.txt per host (cache dengan TTL), URL disallow tidak masuk frontier
+        self.robots = RobotsCache(self.session, logger=self.logger) if respect_robots else None
+        
+        # Token bucket per host untuk halaman dan asset; delay diatur saat crawl mulai
+        self.rate_limiter = HostRateLimiter()
+        
+        # Seed dari sitemap.xml supaya halaman diketahui sejak awal (lastmod disimpan untuk report)
+        self.use_sitemaps = use_sitemaps
+        self.sitemap_lastmod = {}
+        
         # Statistics
         self.stats = {
             'pages_scanned': 0,
             'svg_files_found': 0,
             'svg_files_downloaded': 0,
+            'svg_files_unchanged': 0,
             'svg_total_size': 0,
+            'sitemap_urls': 0,
             'errors': 0,
             'method_used': self.method
         }
@@ -114,6 +174,10 @@ class SVGScraper:
             self.method = "Requests + BeautifulSoup (Fallback)"
             self.stats['method_used'] = self.method
     
+    def robots_allowed(self, url):
+        """Cek robots.txt (selalu True jika respect_robots=False)"""
+        return self.robots is None or self.robots.allowed(url)
+    
     def get_page_content(self, url):
         """Get page content dengan method yang tersedia"""
         if self.use_selenium:
@@ -151,7 +215,7 @@ class SVGScraper:
         try:
             self.logger.info(f"🌐 [Requests] Scanning: {url}")
             
-            response = self.session.get(url, timeout=15)
+            response = get_with_deadline(self.session, url, self.retry_policy, self.timeouts)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -198,7 +262,7 @@ class SVGScraper:
                     if svg_url and '.svg' in svg_url:
                         # Clean URL (remove fragment identifiers)
                         clean_url = svg_url.split('#')[0]
-                        absolute_url = urljoin(base_url, clean_url)
+                        absolute_url = self.canonical.join(base_url, clean_url)
                         svg_refs.add(absolute_url)
         
         # 2. CSS background-image dengan SVG
@@ -214,7 +278,7 @@ class SVGScraper:
             svg_matches = re.findall(r'url\(["\']?([^"\']*\.svg[^"\']*)["\']?\)', style_content)
             for match in svg_matches:
                 clean_url = match.split('#')[0]
-                absolute_url = urljoin(base_url, clean_url)
+                absolute_url = self.canonical.join(base_url, clean_url)
                 svg_refs.add(absolute_url)
         
         # 3. JavaScript strings containing SVG URLs
@@ -225,7 +289,7 @@ class SVGScraper:
             for match in svg_matches:
                 if '/' in match:  # Likely a URL path
                     clean_url = match.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
+                    absolute_url = self.canonical.join(base_url, clean_url)
                     svg_refs.add(absolute_url)
         
         # 4. Data attributes
@@ -234,7 +298,7 @@ class SVGScraper:
             for attr, value in element.attrs.items():
                 if isinstance(value, str) and '.svg' in value:
                     clean_url = value.split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
+                    absolute_url = self.canonical.join(base_url, clean_url)
                     svg_refs.add(absolute_url)
         
         # 5. Look for common SVG sprite patterns in any text
@@ -246,13 +310,13 @@ class SVGScraper:
                 svg_part = re.search(r'[^"\'\s]*\.svg[^"\'\s]*', match)
                 if svg_part:
                     clean_url = svg_part.group().replace('"', '').replace("'", '').split('#')[0]
-                    absolute_url = urljoin(base_url, clean_url)
+                    absolute_url = self.canonical.join(base_url, clean_url)
                     svg_refs.add(absolute_url)
         
-        # Filter only same-domain SVGs
+        # Filter SVG dari host di allowlist (situs + asset_hosts)
         same_domain_svgs = []
         for svg_url in svg_refs:
-            if urlparse(svg_url).netloc == self.domain:
+            if self.sites.allows(svg_url, is_html=False):
                 same_domain_svgs.append(svg_url)
                 self.svg_urls.add(svg_url)
         
@@ -266,11 +330,41 @@ class SVGScraper:
         if svg_url in self.downloaded_svgs:
             return True
         
+        # SVG yang disallow di robots.txt tidak di-request
+        if not self.robots_allowed(svg_url):
+            return False
+        
+        # Budget menipis: SVG tetap diambil (target utama), habis: berhenti
+        if not self.budget.allows():
+            return False
+        
         try:
             self.logger.info(f"📥 Downloading SVG: {svg_url}")
             
-            response = self.session.get(svg_url, timeout=15)
-            response.raise_for_status()
+            # --delay / Crawl-delay berlaku juga untuk download SVG, bukan hanya halaman
+            self.rate_limiter.wait(svg_url)
+            headers = self.http_cache.conditional_headers(svg_url) if self.http_cache else {}
+            self.budget.check(svg_url)
+            stream = SVGStream(self.session, svg_url, self.retry_policy, headers=headers,
+                               timeout=self.timeouts.requests_timeout(), max_bytes=self.max_svg_bytes,
+                               deadline=self.timeouts.deadline(svg_url))
+            
+            # 304: SVG di disk masih sama, skip write
+            if stream.status == 304:
+                mark_not_modified(self.http_cache, svg_url)
+                self.downloaded_svgs.add(svg_url)
+                self.stats['svg_files_unchanged'] += 1
+                self.logger.info(f"♻️ Unchanged SVG: {self.http_cache.cached_path(svg_url)}")
+                return True
+            
+            stream.response.raise_for_status()
+            
+            # Halaman error / soft-404 dengan URL .svg: putus, jangan disimpan
+            if not stream.is_svg:
+                stream.close()
+                self.logger.warning(f"⚠️ Not an SVG ({stream.content_type or 'unknown'}): {svg_url}")
+                self.stats['errors'] += 1
+                return False
             
             # Determine filename
             url_path = urlparse(svg_url).path
@@ -281,20 +375,25 @@ class SVGScraper:
             else:
                 filename = f"svg_{len(self.downloaded_svgs)}.svg"
             
-            # Save SVG
-            svg_file_path = self.svg_dir / filename
+            # Save SVG (timpa file lama jika URL ini sudah pernah didownload)
+            svg_file_path = self.http_cache.cached_path(svg_url) if self.http_cache else None
+            
+            if svg_file_path is None:
+                svg_file_path = self.svg_dir / filename
+                
+                # Handle duplicate names
+                counter = 1
+                original_name = svg_file_path.stem
+                while svg_file_path.exists():
+                    svg_file_path = self.svg_dir / f"{original_name}_{counter}.svg"
+                    counter += 1
             
-            # Handle duplicate names
-            counter = 1
-            original_name = svg_file_path.stem
-            while svg_file_path.exists():
-                svg_file_path = self.svg_dir / f"{original_name}_{counter}.svg"
-                counter += 1
+            # Stream ke disk (.part lalu rename), berhenti jika melebihi max_svg_bytes
+            file_size = stream.save(svg_file_path)
             
-            with open(svg_file_path, 'wb') as f:
-                f.write(response.content)
+            if self.http_cache:
+                self.http_cache.store(svg_url, stream.headers, svg_file_path)
             
-            file_size = len(response.content)
             self.stats['svg_total_size'] += file_size
             self.stats['svg_files_downloaded'] += 1
             self.downloaded_svgs.add(svg_url)
@@ -307,7 +406,7 @@ class SVGScraper:
                 'filename': filename,
                 'size_bytes': file_size,
                 'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'content_type': response.headers.get('content-type', '')
+                'content_type': stream.content_type
             }
             
             metadata_file = svg_file_path.with_suffix('.json')
@@ -337,10 +436,10 @@ class SVGScraper:
             if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
                 continue
             
-            absolute_url = urljoin(base_url, href)
+            absolute_url = self.canonical.join(base_url, href)
             
-            # Check if same domain and likely HTML
-            if (urlparse(absolute_url).netloc == self.domain and
+            # Check host di allowlist and likely HTML
+            if (self.sites.allows(absolute_url) and
                 (absolute_url.endswith('.html') or 
                  not '.' in Path(urlparse(absolute_url).path).name or
                  absolute_url.endswith('/'))):
@@ -362,6 +461,11 @@ class SVGScraper:
                 clean_path = ''.join(c for c in clean_path if c.isalnum() or c in '._-')
                 filename = f"{clean_path}.html" if clean_path else f"page_{len(self.visited_urls)}.html"
             
+            # Halaman host lain (allowed_hosts) diberi prefix host supaya tidak menimpa halaman situs awal
+            netloc = urlparse(page_data['url']).netloc
+            if netloc != self.domain:
+                filename = f"{netloc.replace(':', '_')}_{filename}"
+            
             html_file = self.html_dir / filename
             
             with open(html_file, 'w', encoding='utf-8') as f:
@@ -372,6 +476,21 @@ class SVGScraper:
         except Exception as e:
             self.logger.error(f"❌ Error saving page {page_data['url']}: {e}")
     
+    def seed_from_sitemaps(self):
+        """Isi frontier dari sitemap (robots.txt Sitemap: + /sitemap.xml) sebelum crawl"""
+        discovery = SitemapDiscovery(self.session, robots=self.robots, logger=self.logger)
+        
+        for url, lastmod in discovery.discover(self.base_url):
+            url = self.canonical.canonicalize(url)
+            if not self.sites.allows(url) or not self.robots_allowed(url):
+                continue
+            # Entry sitemap dihitung satu link dari halaman awal
+            if not self.scope.allows(url, 1) or not self.frontier.add(url, depth=1):
+                continue
+            if lastmod:
+                self.sitemap_lastmod[url] = lastmod
+            self.stats['sitemap_urls'] += 1
+    
     def scan_for_svgs(self, max_pages=30, delay=1):
         """Main SVG scanning function"""
         self.logger.info(f"🎨 Starting SVG scanning of {self.base_url}")
@@ -379,19 +498,48 @@ class SVGScraper:
         
         pages_scanned = 0
         
+        # Delay antar halaman per host; waktu proses halaman ikut dihitung
+        self.rate_limiter = HostRateLimiter(delay=delay)
+        if self.robots:
+            self.robots.rate_limiter = self.rate_limiter
+        
+        self.budget.start()
+        self.frontier = CrawlFrontier(self.download_dir / FRONTIER_FILE, resume=self.resume,
+                                      max_depth=self.scope.max_depth)
+        self.frontier.add(self.start_url)
+        if self.frontier.resumed:
+            self.logger.info(f"♻️ Resuming scan: {len(self.frontier)} pages pending, "
+                             f"{self.frontier.counts[DONE]} pages already scanned")
+            if self.scope.max_pages_per_prefix is not None:
+                self.scope.restore(self.frontier.urls(DONE, FAILED))
+        elif self.use_sitemaps:
+            self.seed_from_sitemaps()
+        
         try:
-            while self.pending_urls and pages_scanned < max_pages:
-                url = self.pending_urls.pop()
+            while len(self.frontier) and pages_scanned < max_pages:
+                # Budget menipis: jangan buka halaman baru, sisa waktu untuk SVG yang sudah ditemukan
+                if self.budget.low:
+                    self.logger.warning(f"⏰ Time budget low, {len(self.frontier)} pages left unscanned")
+                    break
+                
+                entry = self.frontier.pop_next(self.host_scheduler)
+                if entry is None:
+                    break
+                url, depth = entry[2], entry[4]
                 
-                if url in self.visited_urls:
+                # Kuota halaman prefix ini sudah habis (tidak antri lagi saat --resume);
+                # halaman yang di-readmit (ditemukan lebih dangkal) sudah memakai kuotanya
+                if url not in self.visited_urls and not self.scope.take(url):
+                    self.frontier.finish(url, SKIPPED)
                     continue
                 
                 # Get page content
+                self.rate_limiter.wait(url)
                 page_data = self.get_page_content(url)
                 
                 if page_data:
-                    self.visited_urls.add(url)
-                    self.stats['pages_scanned'] += 1
+                    if self.visited_urls.add(url):
+                        self.stats['pages_scanned'] += 1
                     pages_scanned += 1
                     
                     # Save page for reference
@@ -407,8 +555,10 @@ class SVGScraper:
                     # Extract more page links
                     new_links = self.extract_page_links(page_data)
                     for link in new_links:
-                        if link not in self.visited_urls:
-                            self.pending_urls.add(link)
+                        if self.scope.allows(link, depth + 1) and self.robots_allowed(link):
+                            self.frontier.add(link, depth=depth + 1)
+                    
+                    self.frontier.finish(url, DONE)
                     
                     # Progress report
                     if pages_scanned % 3 == 0:
@@ -416,12 +566,11 @@ class SVGScraper:
                 
                 else:
                     self.failed_urls.add(url)
+                    self.frontier.finish(url, FAILED)
                     self.stats['errors'] += 1
                 
-                time.sleep(delay)
-                
         except KeyboardInterrupt:
-            self.logger.info("⏹️ SVG scanning interrupted by user")
+            self.logger.info("⏹️ SVG scanning interrupted by user (continue with --resume)")
         
         finally:
             self.cleanup()
@@ -437,8 +586,12 @@ class SVGScraper:
         if hasattr(self, 'driver'):
             self.driver.quit()
         
+        if self.http_cache:
+            self.http_cache.save()
+        
         self.save_svg_report()
         self.print_final_summary()
+        self.frontier.close()
     
     def save_svg_report(self):
         """Save detailed SVG report"""
@@ -447,10 +600,22 @@ class SVGScraper:
             'base_url': self.base_url,
             'method_used': self.method,
             'statistics': self.stats,
-            'pages_scanned': list(self.visited_urls),
+            'pages_scanned': self.frontier.urls(DONE),
+            'pages_pending': self.frontier.urls(QUEUED, LEASED),
+            'frontier': self.frontier.summary(),
+            'canonical_urls': self.canonical.summary(),
+            'scope': self.scope.summary(),
+            'sites': self.sites.summary(),
+            'hosts': self.host_scheduler.summary(),
+            'seen_sets': self.seen_sets_summary(),
             'svg_urls_found': list(self.svg_urls),
             'downloaded_svgs': list(self.downloaded_svgs),
             'failed_urls': list(self.failed_urls),
+            'http_cache': self.http_cache.summary() if self.http_cache else None,
+            'robots': self.robots.summary() if self.robots else None,
+            'sitemap_lastmod': self.sitemap_lastmod,
+            'retries': self.retry_policy.summary(),
+            'budget': self.budget.summary(),
             'svg_files_info': {
                 'total_count': len(self.downloaded_svgs),
                 'total_size_bytes': self.stats['svg_total_size'],
@@ -477,6 +642,10 @@ class SVGScraper:
         
         self.logger.info(f"📝 SVG List saved: {svg_list_file}")
     
+    def seen_sets_summary(self):
+        return seen_sets_summary(visited_urls=self.visited_urls, svg_urls=self.svg_urls,
+                                 downloaded_svgs=self.downloaded_svgs, failed_urls=self.failed_urls)
+    
     def print_final_summary(self):
         """Print final summary"""
         self.logger.info("\n" + "="*70)
@@ -484,10 +653,20 @@ class SVGScraper:
         self.logger.info("="*70)
         self.logger.info(f"🔧 Method: {self.method}")
         self.logger.info(f"📄 Pages Scanned: {self.stats['pages_scanned']}")
+        self.logger.info(f"🗺️ Sitemap URLs: {self.stats['sitemap_urls']}")
         self.logger.info(f"🎨 SVG Files Found: {self.stats['svg_files_found']}")
         self.logger.info(f"📥 SVG Files Downloaded: {self.stats['svg_files_downloaded']}")
+        self.logger.info(f"♻️ SVG Files Unchanged (304): {self.stats['svg_files_unchanged']}")
         self.logger.info(f"💾 Total SVG Size: {self.stats['svg_total_size']:,} bytes ({self.stats['svg_total_size']/(1024*1024):.2f} MB)")
         self.logger.info(f"❌ Errors: {self.stats['errors']}")
+        self.logger.info(f"🧮 Seen-sets: {format_seen_sets(self.seen_sets_summary())}")
+        if self.scope.limited:
+            scope_stats = self.scope.summary()
+            self.logger.info(f"🔭 Scope: {scope_stats['too_deep']} links too deep, {scope_stats['out_of_scope']} outside path prefixes, "
+                             f"{scope_stats['prefix_full']} over the per-prefix page limit")
+        host_stats = self.host_scheduler.summary()['hosts']
+        if len(host_stats) > 1:
+            self.logger.info("🌍 Hosts: " + ", ".join(f"{host} {stats['served']} pages" for host, stats in host_stats.items()))
         self.logger.info(f"📁 SVG Files Location: {self.svg_dir.absolute()}")
         self.logger.info(f"📄 HTML References: {self.html_dir.absolute()}")
         self.logger.info("="*70)
@@ -517,6 +696,46 @@ def main():
     parser.add_argument('--no-selenium',
                        action='store_true',
                        help='Force use requests only')
+    parser.add_argument('--time-budget',
+                       type=float, default=None,
+                       help='Batas waktu seluruh crawl dalam detik (default: unlimited)')
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Lanjutkan crawl sebelumnya dari frontier di output directory')
+    parser.add_argument('--seen-set',
+                       choices=['exact', 'bloom'], default='exact',
+                       help='Backend dedupe halaman: exact atau bloom (hemat memori, ada false positive)')
+    parser.add_argument('--seen-error-rate',
+                       type=float, default=0.001,
+                       help='False positive rate maksimum untuk --seen-set bloom (default: 0.001)')
+    parser.add_argument('--depth',
+                       type=int, default=None,
+                       help='Kedalaman link maksimum dari URL awal (default: unlimited)')
+    parser.add_argument('--path-prefix',
+                       nargs='+', default=None,
+                       help='Hanya crawl halaman dengan path berawalan ini, contoh: /docs/ /blog/')
+    parser.add_argument('--exclude-prefix',
+                       nargs='+', default=None,
+                       help='Lewati halaman dengan path berawalan ini, contoh: /archive/')
+    parser.add_argument('--max-pages-per-prefix',
+                       type=int, default=None,
+                       help='Maksimum halaman per prefix (direktori pertama atau --path-prefix yang cocok)')
+    
+    parser.add_argument('--allow-host',
+                       nargs='+', default=None,
+                       help='Host lain yang ikut di-crawl, contoh: blog.example.com *.example.com')
+    
+    parser.add_argument('--asset-host',
+                       nargs='+', default=None,
+                       help='Host yang hanya diambil asset-nya (CDN), contoh: cdn.example.com')
+    
+    parser.add_argument('--host-scheduling',
+                       choices=SCHEDULING_POLICIES, default='round_robin',
+                       help='Giliran halaman antar host: round_robin atau deficit berbobot (default: round_robin)')
+    
+    parser.add_argument('--host-weights',
+                       default=None,
+                       help="Bobot host untuk --host-scheduling deficit, contoh: 'example.com=3,blog.example.com=1'")
     
     args = parser.parse_args()
     
@@ -534,7 +753,19 @@ def main():
         scraper = SVGScraper(
             base_url=args.url,
             download_dir=args.output,
-            use_selenium=not args.no_selenium
+            use_selenium=not args.no_selenium,
+            time_budget=args.time_budget,
+            resume=args.resume,
+            seen_set=args.seen_set,
+            seen_error_rate=args.seen_error_rate,
+            max_depth=args.depth,
+            path_prefixes=args.path_prefix,
+            exclude_prefixes=args.exclude_prefix,
+            max_pages_per_prefix=args.max_pages_per_prefix,
+            allowed_hosts=args.allow_host,
+            asset_hosts=args.asset_host,
+            host_scheduling=args.host_scheduling,
+            host_weights=parse_weights(args.host_weights)
         )
         
         scraper.scan_for_svgs(
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+SVG Stream - probe + download dalam satu GET streaming (tanpa HEAD terpisah)
+Header dan byte pertama divalidasi dulu; bukan SVG / terlalu besar = koneksi diputus
+"""
+
+import os
+import re
+
+import requests
+
+from retry_policy import get_with_retry
+from chunk_reader import iter_chunks
+
+# Byte pertama yang dibaca sebelum memutuskan lanjut atau putus
+SNIFF_BYTES = 1024
+
+# Batas default ukuran body SVG (sprite besar masih muat)
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+# Content-Type yang pasti bukan SVG walaupun URL-nya .svg (halaman error, gambar lain)
+NON_SVG_TYPES = ('text/html', 'application/json', 'text/javascript', 'application/javascript', 'text/css')
+NON_SVG_PREFIXES = ('image/png', 'image/jpeg', 'image/gif', 'image/webp', 'video/', 'audio/', 'font/')
+
+# Prolog yang boleh muncul sebelum elemen root: BOM, whitespace, <?xml ?>, komentar, doctype
+PROLOG = re.compile(rb'(?:\xef\xbb\xbf|\s+|<\?.*?\?>|<!--.*?-->|<!doctype[^>\[]*(?:\[.*?\])?\s*>)*', re.S | re.I)
+ROOT_TAG = re.compile(rb'<([a-z_][\w.-]*:)?([a-z_][\w.-]*)', re.I)
+
+class BodyTooLargeError(requests.exceptions.RequestException):
+    """Body melebihi batas ukuran, download dihentikan"""
+
+def sniff_svg(head, content_type=''):
+    """True = SVG, False = bukan; dari Content-Type + elemen root di byte pertama"""
+    content_type = (content_type or '').lower()
+    if 'svg' in content_type:
+        return True
+    if content_type.startswith(NON_SVG_TYPES + NON_SVG_PREFIXES):
+        return False
+
+    head = head[:SNIFF_BYTES]
+    prolog = PROLOG.match(head)
+    rest = head[prolog.end():]
+    root = ROOT_TAG.match(rest)
+    if root:
+        return root.group(2).lower() == b'svg'
+
+    # Prolog lebih panjang dari SNIFF_BYTES: percaya doctype / tag yang terlihat
+    return b'<!doctype svg' in head.lower() or b'<svg' in head.lower()
+
+def content_length(headers):
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+class SVGStream:
+    """Satu response streaming yang sudah di-sniff"""
+
+    def __init__(self, session, url, retry_policy=None, headers=None, timeout=15, max_bytes=DEFAULT_MAX_BYTES,
+                 deadline=None):
+        self.url = url
+        self.max_bytes = max_bytes
+
+        if retry_policy is not None:
+            self.response = get_with_retry(session, url, retry_policy, timeout=timeout, stream=True, headers=headers)
+        else:
+            self.response = session.get(url, timeout=timeout, stream=True, headers=headers)
+
+        self.status = self.response.status_code
+        self.headers = self.response.headers
+        self.content_type = self.headers.get('content-type', '')
+        self.head = b''
+        self.chunks = None
+
+        if self.status != 200:
+            self.close()
+            return
+
+        # Sniff gagal (koneksi putus, deadline, decode error): koneksi dilepas, tidak bocor di pool
+        try:
+            # Content-Length sudah kelewat batas: putus sebelum body dibaca
+            declared = content_length(self.headers)
+            if max_bytes and declared is not None and declared > max_bytes:
+                raise BodyTooLargeError(f"{declared:,} bytes > limit {max_bytes:,} for {url}")
+
+            # deadline (TransferDeadline): batas waktu total body, slow-drip diputus
+            self.chunks = iter_chunks(self.response, deadline, decode_content=True)
+            self.sniff()
+        except BaseException:
+            self.close()
+            raise
+
+    def sniff(self):
+        """Baca sampai SNIFF_BYTES pertama (atau body habis)"""
+        head = []
+        size = 0
+        for chunk in self.chunks:
+            # chunk bisa memoryview ke buffer yang dipakai ulang: salin
+            head.append(bytes(chunk))
+            size += len(chunk)
+            if size >= SNIFF_BYTES:
+                break
+        self.head = b''.join(head)
+
+    @property
+    def is_svg(self):
+        return self.status == 200 and sniff_svg(self.head, self.content_type)
+
+    def iter_body(self):
+        """Byte yang sudah di-sniff lalu sisa body"""
+        if self.head:
+            yield self.head
+        for chunk in self.chunks or ():
+            if chunk:
+                yield chunk
+
+    def save(self, file_path):
+        """Stream seluruh body ke file, return jumlah byte; file lama utuh jika gagal / melebihi max_bytes"""
+        part_path = f"{file_path}.part"
+        size = 0
+        try:
+            with open(part_path, 'wb') as f:
+                for chunk in self.iter_body():
+                    size += len(chunk)
+                    if self.max_bytes and size > self.max_bytes:
+                        raise BodyTooLargeError(f"body > limit {self.max_bytes:,} bytes for {self.url}")
+                    f.write(chunk)
+            os.replace(part_path, file_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            self.close()
+        return size
+
+    def close(self):
+        """Putus koneksi (sisa body tidak di-download)"""
+        self.response.close()
@@ -5,7 +5,8 @@ SVG URLs Cross-Check - Manual check semua kemungkinan lokasi SVG
 
 import requests
 from urllib.parse import urljoin
-import time
+from http_cache import HTTPCache, mark_not_modified
+from probe_engine import ProbeEngine
 
 def test_svg_urls():
     """Test all possible SVG URLs"""
@@ -90,47 +91,35 @@ def test_svg_urls():
     
     found_svgs = []
     total_tests = len(directories) * len(filenames)
-    current_test = 0
+    progress = {'done': 0}
     
     print(f"🎯 Testing {total_tests} URLs...")
     print()
     
-    for directory in directories:
-        for filename in filenames:
-            current_test += 1
-            
-            svg_url = base_url + directory + filename
-            
-            try:
-                response = session.head(svg_url, timeout=5)
-                
-                if response.status_code == 200:
-                    content_type = response.headers.get('content-type', '')
-                    print(f"✅ FOUND: {svg_url}")
-                    print(f"   Content-Type: {content_type}")
-                    
-                    # Get file size
-                    content_length = response.headers.get('content-length', 'Unknown')
-                    print(f"   Size: {content_length} bytes")
-                    
-                    found_svgs.append({
-                        'url': svg_url,
-                        'content_type': content_type,
-                        'size': content_length
-                    })
-                    print()
-                    
-                elif current_test % 100 == 0:
-                    print(f"📊 Progress: {current_test}/{total_tests} tested...")
-                    
-            except Exception as e:
-                if current_test % 200 == 0:
-                    print(f"📊 Progress: {current_test}/{total_tests} tested...")
-                continue
+    def on_result(result):
+        """Dipanggil per probe yang selesai (hasil di-stream, tidak menunggu semua)"""
+        progress['done'] += 1
+        
+        if result.status == 200:
+            print(f"✅ FOUND: {result.url}")
+            print(f"   Content-Type: {result.content_type}")
+            print(f"   Size: {result.size or 'Unknown'} bytes")
+            print()
             
-            # Small delay to be nice to server
-            if current_test % 50 == 0:
-                time.sleep(0.1)
+            found_svgs.append({
+                'url': result.url,
+                'content_type': result.content_type,
+                'size': result.size or 'Unknown'
+            })
+        elif progress['done'] % 200 == 0:
+            print(f"📊 Progress: {progress['done']}/{total_tests} tested...")
+    
+    # Semua probe HEAD paralel lewat koneksi keep-alive
+    engine = ProbeEngine(concurrency=100, headers=dict(session.headers))
+    engine.run([base_url + directory + filename for directory in directories for filename in filenames], on_result)
+    
+    probe_stats = engine.summary()
+    print(f"⚡ {probe_stats['probes']} probes in {probe_stats['elapsed']}s ({probe_stats['probes_per_second']} probes/s)")
     
     print(f"\n🎉 RESULTS:")
     print("="*60)
@@ -145,10 +134,12 @@ def test_svg_urls():
             print(f"   Size: {svg['size']} bytes")
             print()
             
-        # Download all found SVGs
+        # Download all found SVGs (conditional GET terhadap hasil run sebelumnya)
         print(f"📥 DOWNLOADING ALL FOUND SVGs...")
+        cache = HTTPCache("found_svgs/.http_cache.json")
         for svg in found_svgs:
-            download_svg(session, svg['url'])
+            download_svg(session, svg['url'], cache)
+        cache.save()
     else:
         print("❌ No SVG files found in standard locations")
         print("💡 SVG files might be:")
@@ -157,10 +148,18 @@ def test_svg_urls():
         print("   • In non-standard locations")
         print("   • Require authentication")
 
-def download_svg(session, svg_url):
+def download_svg(session, svg_url, cache=None):
     """Download individual SVG"""
     try:
-        response = session.get(svg_url, timeout=10)
+        headers = cache.conditional_headers(svg_url) if cache else {}
+        response = session.get(svg_url, timeout=10, headers=headers)
+        
+        # 304: SVG di disk masih sama, skip write (tanpa salinan di cache = gagal)
+        if response.status_code == 304:
+            mark_not_modified(cache, svg_url)
+            print(f"♻️ Unchanged: {cache.cached_path(svg_url)}")
+            return
+        
         response.raise_for_status()
         
         from pathlib import Path
@@ -174,17 +173,25 @@ def download_svg(session, svg_url):
         filename = Path(urlparse(svg_url).path).name
         svg_file = output_dir / filename
         
-        # Handle duplicates
-        counter = 1
-        original_stem = svg_file.stem
-        while svg_file.exists():
-            svg_file = output_dir / f"{original_stem}_{counter}.svg"
-            counter += 1
+        # Timpa file lama jika URL ini sudah pernah didownload
+        cached_file = cache.cached_path(svg_url) if cache else None
+        if cached_file:
+            svg_file = cached_file
+        else:
+            # Handle duplicates
+            counter = 1
+            original_stem = svg_file.stem
+            while svg_file.exists():
+                svg_file = output_dir / f"{original_stem}_{counter}.svg"
+                counter += 1
         
         # Save file
         with open(svg_file, 'wb') as f:
             f.write(response.content)
         
+        if cache:
+            cache.store(svg_url, response.headers, svg_file)
+        
         print(f"✅ Downloaded: {svg_file}")
         
     except Exception as e:
@@ -5,13 +5,19 @@ Targeted SVG Hunter - Langsung cek URL SVG yang diketahui dan scan lebih dalam
 
 import requests
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import time
 import json
+from http_cache import HTTPCache, mark_not_modified
+from retry_policy import RetryPolicy
+from svg_stream import SVGStream
+from seen_set import make_seen_set, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
 
 class TargetedSVGHunter:
-    def __init__(self, output_dir="targeted_svg"):
+    def __init__(self, output_dir="targeted_svg", use_cache=True, seen_set='exact', seen_error_rate=0.001,
+                 url_policy=None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -20,34 +26,31 @@ class TargetedSVGHunter:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         })
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-run
+        self.http_cache = HTTPCache(self.output_dir / '.http_cache.json') if use_cache else None
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy()
+        
         self.found_svgs = []
+        # URL yang sudah dites (ketemu atau tidak, dalam bentuk canonical) tidak di-GET lagi
+        self.canonical = make_canonicalizer(url_policy)
+        self.tested_urls = make_seen_set(seen_set, seen_error_rate)
         
     def test_svg_url(self, svg_url):
-        """Test apakah URL SVG bisa diakses"""
-        try:
-            print(f"🔍 Testing: {svg_url}")
-            response = self.session.head(svg_url, timeout=10)
-            
-            if response.status_code == 200:
-                content_type = response.headers.get('content-type', '')
-                print(f"✅ Found SVG: {svg_url}")
-                print(f"   Content-Type: {content_type}")
-                return True
-            else:
-                print(f"❌ Not found ({response.status_code}): {svg_url}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Error testing {svg_url}: {e}")
+        """Test + download URL SVG dalam satu GET streaming (tanpa HEAD terpisah)"""
+        svg_url = self.canonical.canonicalize(svg_url)
+        if not self.tested_urls.add(svg_url):
             return False
+        
+        print(f"🔍 Testing: {svg_url}")
+        return self.download_svg(svg_url, probe=True)
     
-    def download_svg(self, svg_url):
-        """Download SVG file"""
+    def download_svg(self, svg_url, probe=False):
+        """Download SVG file (probe=True: 404 / bukan SVG hanya dilaporkan)"""
         try:
-            print(f"📥 Downloading: {svg_url}")
-            
-            response = self.session.get(svg_url, timeout=15)
-            response.raise_for_status()
+            headers = self.http_cache.conditional_headers(svg_url) if self.http_cache else {}
+            stream = SVGStream(self.session, svg_url, self.retry_policy, headers=headers)
             
             # Get filename
             filename = Path(urlparse(svg_url).path).name
@@ -56,17 +59,48 @@ class TargetedSVGHunter:
             
             svg_file = self.output_dir / filename
             
-            # Save SVG
-            with open(svg_file, 'wb') as f:
-                f.write(response.content)
+            # 304: SVG di disk masih sama, skip write
+            if stream.status == 304:
+                mark_not_modified(self.http_cache, svg_url)
+                file_size = svg_file.stat().st_size
+                self.found_svgs.append({
+                    'url': svg_url,
+                    'filename': filename,
+                    'size_bytes': file_size,
+                    'content_type': 'image/svg+xml',
+                    'unchanged': True,
+                    'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S')
+                })
+                print(f"♻️ Unchanged: {svg_file} ({file_size:,} bytes)")
+                return True
             
-            file_size = len(response.content)
+            if probe:
+                if stream.status != 200:
+                    print(f"❌ Not found ({stream.status}): {svg_url}")
+                    return False
+                if not stream.is_svg:
+                    # Bukan SVG: putus koneksi, sisa body tidak di-download
+                    stream.close()
+                    print(f"❌ Not an SVG ({stream.content_type or 'unknown'}): {svg_url}")
+                    return False
+                print(f"✅ Found SVG: {svg_url}")
+                print(f"   Content-Type: {stream.content_type}")
+            
+            stream.response.raise_for_status()
+            print(f"📥 Downloading: {svg_url}")
+            
+            # Save SVG (stream langsung ke disk)
+            file_size = stream.save(svg_file)
+            
+            if self.http_cache:
+                self.http_cache.store(svg_url, stream.headers, svg_file)
             
             svg_info = {
                 'url': svg_url,
                 'filename': filename,
                 'size_bytes': file_size,
-                'content_type': response.headers.get('content-type', ''),
+                'content_type': stream.content_type,
+                'unchanged': False,
                 'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
@@ -74,9 +108,10 @@ class TargetedSVGHunter:
             
             print(f"✅ Saved: {svg_file} ({file_size:,} bytes)")
             
-            # Also save a preview of content
+            # Also save a preview of content (dari byte yang sudah di-sniff)
             try:
-                content_preview = response.text[:500] + "..." if len(response.text) > 500 else response.text
+                preview = stream.head.decode('utf-8', errors='replace')
+                content_preview = preview[:500] + "..." if file_size > 500 else preview
                 print(f"📄 Content preview:\n{content_preview}")
             except:
                 pass
@@ -84,7 +119,7 @@ class TargetedSVGHunter:
             return True
             
         except Exception as e:
-            print(f"❌ Failed to download {svg_url}: {e}")
+            print(f"❌ {'Error testing' if probe else 'Failed to download'} {svg_url}: {e}")
             return False
     
     def scan_page_for_svg_refs(self, page_url):
@@ -114,7 +149,7 @@ class TargetedSVGHunter:
                 matches = re.findall(pattern, page_text)
                 for match in matches:
                     if match and not match.startswith('#'):
-                        absolute_url = urljoin(page_url, match)
+                        absolute_url = self.canonical.join(page_url, match)
                         svg_mentions.append(absolute_url)
             
             # Remove duplicates
@@ -151,8 +186,7 @@ class TargetedSVGHunter:
         # Test each known URL
         print(f"\n1️⃣ Testing known SVG locations...")
         for svg_url in known_svg_urls:
-            if self.test_svg_url(svg_url):
-                self.download_svg(svg_url)
+            self.test_svg_url(svg_url)
         
         # Scan specific pages
         print(f"\n2️⃣ Scanning pages for SVG references...")
@@ -176,9 +210,7 @@ class TargetedSVGHunter:
         # Test and download found SVGs
         print(f"\n3️⃣ Testing discovered SVG references...")
         for svg_url in all_found_svgs:
-            if svg_url not in [svg['url'] for svg in self.found_svgs]:
-                if self.test_svg_url(svg_url):
-                    self.download_svg(svg_url)
+            self.test_svg_url(svg_url)
         
         # Try directory listing approach
         print(f"\n4️⃣ Trying common SVG directories...")
@@ -199,12 +231,14 @@ class TargetedSVGHunter:
                     for link in links:
                         href = link['href']
                         if href.endswith('.svg'):
-                            svg_url = urljoin(dir_url, href)
-                            if self.test_svg_url(svg_url):
-                                self.download_svg(svg_url)
+                            svg_url = self.canonical.join(dir_url, href)
+                            self.test_svg_url(svg_url)
             except Exception as e:
                 print(f"❌ Error checking directory {dir_url}: {e}")
         
+        if self.http_cache:
+            self.http_cache.save()
+        
         self.print_results()
     
     def print_results(self):
@@ -212,6 +246,7 @@ class TargetedSVGHunter:
         print("\n" + "="*60)
         print("🎨 SVG HUNTING RESULTS")
         print("="*60)
+        print(f"🧮 Seen-sets: {format_seen_sets(seen_sets_summary(tested_urls=self.tested_urls))}")
         
         if self.found_svgs:
             print(f"✅ Found {len(self.found_svgs)} SVG files!")
@@ -238,7 +273,9 @@ class TargetedSVGHunter:
         report = {
             'hunt_completed': time.strftime('%Y-%m-%d %H:%M:%S'),
             'svgs_found': len(self.found_svgs),
+            'seen_sets': seen_sets_summary(tested_urls=self.tested_urls),
             'total_size_bytes': sum(svg['size_bytes'] for svg in self.found_svgs) if self.found_svgs else 0,
+            'retries': self.retry_policy.summary(),
             'svg_files': self.found_svgs
         }
         
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test state machine CrawlFrontier: QUEUED -> LEASED -> DONE/FAILED, dan apa yang antri lagi saat resume
+Jalankan: python -m pytest -q test_crawl_frontier.py
+"""
+
+import asyncio
+import importlib
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from crawl_frontier import (CrawlFrontier, AsyncFrontier, FRONTIER_FILE,
+                            QUEUED, LEASED, DONE, FAILED, DROPPED, SKIPPED)
+
+def state_of(frontier, url):
+    return frontier.conn.execute('SELECT state FROM urls WHERE url = ?', (url,)).fetchone()[0]
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / FRONTIER_FILE
+
+def test_pop_leases_and_finish_records_state(path):
+    frontier = CrawlFrontier(path)
+    assert frontier.add('https://example.com/a')
+    assert frontier.add('https://example.com/b')
+    assert state_of(frontier, 'https://example.com/a') == QUEUED
+
+    _, _, url, is_html, depth = frontier.pop()
+    assert (url, is_html, depth) == ('https://example.com/a', True, 0)
+    assert state_of(frontier, url) == LEASED
+    assert frontier.counts[QUEUED] == 1 and frontier.counts[LEASED] == 1
+    assert frontier.unfinished == 2
+
+    frontier.finish(url, DONE)
+    assert state_of(frontier, url) == DONE
+
+    _, _, url, _, _ = frontier.pop()
+    frontier.finish(url, FAILED)
+    assert state_of(frontier, url) == FAILED
+
+    assert frontier.pop() is None
+    assert frontier.unfinished == 0
+    assert frontier.counts[DONE] == 1 and frontier.counts[FAILED] == 1
+    frontier.close()
+
+def test_seen_urls_are_not_queued_again(path):
+    frontier = CrawlFrontier(path)
+    assert frontier.add('https://example.com/a')
+    _, _, url, _, _ = frontier.pop()
+    frontier.finish(url, DONE)
+
+    assert not frontier.add('https://example.com/a')
+    assert len(frontier) == 0
+    assert frontier.stats['duplicates'] == 1
+    frontier.close()
+
+def test_resume_requeues_leased_and_dropped_only(path):
+    frontier = CrawlFrontier(path)
+    for name in ('done', 'failed', 'leased', 'dropped', 'skipped', 'queued'):
+        frontier.add(f'https://example.com/{name}')
+    for state in (DONE, FAILED, None, DROPPED, SKIPPED):
+        _, _, url, _, _ = frontier.pop()
+        if state is not None:
+            frontier.finish(url, state)
+    # Crash: /leased masih LEASED, /queued belum di-pop
+    frontier.close()
+
+    resumed = CrawlFrontier(path, resume=True)
+    assert resumed.resumed
+    assert sorted(resumed.urls(QUEUED)) == ['https://example.com/dropped', 'https://example.com/leased',
+                                            'https://example.com/queued']
+    assert resumed.urls(DONE) == ['https://example.com/done']
+    assert resumed.urls(FAILED) == ['https://example.com/failed']
+    assert resumed.urls(SKIPPED) == ['https://example.com/skipped']
+    assert resumed.counts[LEASED] == 0
+    assert resumed.stats['resumed_queued'] == 3
+    resumed.close()
+
+def test_without_resume_starts_empty(path):
+    frontier = CrawlFrontier(path)
+    frontier.add('https://example.com/a')
+    frontier.close()
+
+    fresh = CrawlFrontier(path, resume=False)
+    assert not fresh.resumed
+    assert len(fresh) == 0
+    assert fresh.add('https://example.com/a')
+    fresh.close()
+
+def test_refound_queued_url_keeps_shallowest_depth(path):
+    # /page dicapai lewat 3 link dan lewat 1 link; jalur dalam ditemukan lebih dulu
+    frontier = CrawlFrontier(path, max_depth=3)
+    assert frontier.add('https://example.com/page', depth=3)
+    assert not frontier.add('https://example.com/page', depth=1)
+    assert not frontier.add('https://example.com/page', depth=2)
+
+    _, _, url, _, depth = frontier.pop()
+    assert (url, depth) == ('https://example.com/page', 1)
+    assert frontier.stats['depth_lowered'] == 1
+    assert len(frontier) == 0
+    frontier.close()
+
+def test_page_cut_off_at_max_depth_is_readmitted_shallower(path):
+    frontier = CrawlFrontier(path, max_depth=3)
+    frontier.add('https://example.com/page', depth=3)
+    _, _, url, _, _ = frontier.pop()
+    frontier.finish(url, DONE)
+
+    # Link halaman depth 3 terpotong batas; ditemukan di depth 1 -> antri lagi dengan depth baru
+    assert frontier.add('https://example.com/page', depth=1)
+    assert frontier.counts[QUEUED] == 1 and frontier.counts[DONE] == 0
+    assert frontier.queued_by_host == {'example.com': 1}
+    _, _, url, _, depth = frontier.pop()
+    assert (url, depth) == ('https://example.com/page', 1)
+    frontier.finish(url, DONE)
+
+    # Sudah di-crawl di depth 1: tidak antri lagi
+    assert not frontier.add('https://example.com/page', depth=0)
+    assert frontier.stats['readmitted'] == 1
+    frontier.close()
+
+@pytest.mark.parametrize('max_depth, is_html, state, old_depth', [
+    (None, True, DONE, 3),    # tanpa batas depth tidak ada link yang terpotong
+    (3, True, DONE, 2),       # link halaman depth 2 sudah masuk semua
+    (3, False, DONE, 3),      # asset tidak punya link
+    (3, True, FAILED, 3),
+    (3, True, SKIPPED, 3),
+    (3, True, LEASED, 3),     # sedang dikerjakan dengan depth lama
+])
+def test_other_refound_urls_are_not_readmitted(path, max_depth, is_html, state, old_depth):
+    frontier = CrawlFrontier(path, max_depth=max_depth)
+    frontier.add('https://example.com/page', is_html=is_html, depth=old_depth)
+    _, _, url, _, _ = frontier.pop()
+    if state != LEASED:
+        frontier.finish(url, state)
+
+    assert not frontier.add('https://example.com/page', is_html=is_html, depth=1)
+    assert len(frontier) == 0
+    assert state_of(frontier, url) == state
+    frontier.close()
+
+def test_async_frontier_commits_off_event_loop(path):
+    threads = []
+
+    async def crawl():
+        frontier = AsyncFrontier(path, batch_size=2)
+        commit = frontier.store.commit
+
+        def recording_commit():
+            threads.append(threading.get_ident())
+            commit()
+
+        frontier.store.commit = recording_commit
+        for i in range(6):
+            frontier.put_nowait((0, 0, f'https://example.com/{i}', True, 0))
+        for _ in range(6):
+            _, _, url, _, _ = await frontier.get()
+            frontier.task_done(url)
+        await frontier.join()
+        frontier.close()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(crawl())
+    assert threads
+    assert loop_thread not in threads
+
+    resumed = CrawlFrontier(path, resume=True)
+    assert resumed.counts[DONE] == 6
+    resumed.close()
+
+def test_async_frontier_put_does_not_wait_for_slow_commit(path):
+    commit_started = threading.Event()
+
+    async def crawl():
+        frontier = AsyncFrontier(path, batch_size=1)
+        commit = frontier.store.commit
+
+        def slow_commit():
+            # fsync lambat: thread SQLite sibuk, event loop tidak boleh ikut menunggu
+            commit_started.set()
+            time.sleep(0.5)
+            commit()
+
+        frontier.store.commit = slow_commit
+        await frontier.put_nowait((0, 0, 'https://example.com/first', True, 0))
+        await asyncio.get_running_loop().run_in_executor(None, commit_started.wait)
+
+        started = time.monotonic()
+        added = [frontier.put_nowait((0, 0, f'https://example.com/{i}', True, 0)) for i in range(100)]
+        put_time = time.monotonic() - started
+        assert frontier.committing is not None and not frontier.committing.done()
+
+        assert all(await asyncio.gather(*added))
+        assert frontier.qsize() == 101
+        frontier.close()
+        return put_time
+
+    assert asyncio.run(crawl()) < 0.1
+
+def test_async_frontier_commit_error_finishes_url_then_fails_join(path):
+    async def crawl():
+        frontier = AsyncFrontier(path, batch_size=2)
+
+        def broken_commit():
+            raise sqlite3.OperationalError('disk I/O error')
+
+        frontier.store.commit = broken_commit
+        frontier.put_nowait((0, 0, 'https://example.com/a', True, 0))
+        _, _, url, _, _ = await frontier.get()
+        # Commit batch gagal di sini; task_done tetap mencatat URL dan melepas slot host
+        frontier.task_done(url)
+        with pytest.raises(sqlite3.OperationalError):
+            await frontier.join()
+        with pytest.raises(sqlite3.OperationalError):
+            await frontier.get()
+        return frontier
+
+    frontier = asyncio.run(crawl())
+    assert frontier.in_flight() == 0 and frontier.store.counts[DONE] == 1
+    assert frontier.scheduler.in_flight['example.com'] == 0
+    frontier.db.shutdown()
+    frontier.store.conn.close()
+
+@pytest.mark.parametrize('module, class_name', [('hybrid_scraper', 'HybridWebScraper'), ('svg_scraper', 'SVGScraper')])
+def test_constructing_scraper_keeps_existing_frontier(tmp_path, monkeypatch, module, class_name):
+    # Log file scraper ditulis di cwd
+    monkeypatch.chdir(tmp_path)
+    frontier = CrawlFrontier(tmp_path / FRONTIER_FILE)
+    frontier.add('https://example.com/pending')
+    frontier.close()
+
+    scraper_class = getattr(importlib.import_module(module), class_name)
+    scraper_class('https://example.com', download_dir=str(tmp_path), use_selenium=False, resume=False)
+
+    frontier = CrawlFrontier(tmp_path / FRONTIER_FILE, resume=True)
+    assert frontier.urls(QUEUED) == ['https://example.com/pending']
+    frontier.close()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test HostScheduler: giliran host berbobot (deficit) dan per_host_limit lewat PersistentFrontier
+Jalankan: python -m pytest -q test_host_scheduler.py
+"""
+
+from collections import deque
+
+import pytest
+
+from crawl_frontier import PersistentFrontier, FRONTIER_FILE
+from host_scheduler import HostScheduler, url_host
+
+WEIGHTS = {'a.example': 3, 'b.example': 1}
+
+def picks(scheduler, queued, count):
+    return ''.join(scheduler.next_host(queued)[0] for _ in range(count))
+
+def test_deficit_serves_hosts_in_weight_ratio():
+    scheduler = HostScheduler(per_host_limit=None, policy='deficit', host_weights=WEIGHTS)
+    queued = {'a.example': 100, 'b.example': 100}
+    assert picks(scheduler, queued, 16) == 'aaab' * 4
+    assert scheduler.summary()['hosts'] == {'a.example': {'served': 12, 'peak_in_flight': 0},
+                                            'b.example': {'served': 4, 'peak_in_flight': 0}}
+
+def test_round_robin_ignores_weights():
+    scheduler = HostScheduler(per_host_limit=None, policy='round_robin', host_weights=WEIGHTS)
+    assert picks(scheduler, {'a.example': 100, 'b.example': 100}, 6) == 'ababab'
+
+def test_host_with_empty_queue_is_skipped():
+    scheduler = HostScheduler(per_host_limit=None, policy='deficit', host_weights=WEIGHTS)
+    assert picks(scheduler, {'a.example': 0, 'b.example': 100}, 3) == 'bbb'
+    assert scheduler.next_host({'a.example': 0, 'b.example': 0}) is None
+    assert scheduler.stats['saturated'] == 0
+
+def test_saturated_hosts_return_none():
+    scheduler = HostScheduler(per_host_limit=1, policy='deficit', host_weights=WEIGHTS)
+    queued = {'a.example': 5, 'b.example': 5}
+    for _ in range(2):
+        scheduler.lease(scheduler.next_host(queued))
+    assert scheduler.next_host(queued) is None
+    assert scheduler.stats['saturated'] == 1
+
+    scheduler.release('b.example')
+    assert scheduler.next_host(queued) == 'b.example'
+
+def test_frontier_lease_order_respects_weights_and_per_host_limit(tmp_path):
+    scheduler = HostScheduler(per_host_limit=2, policy='deficit', host_weights=WEIGHTS)
+    frontier = PersistentFrontier(tmp_path / FRONTIER_FILE, scheduler=scheduler)
+    for i in range(12):
+        for host in ('a.example', 'b.example'):
+            frontier.put((0, 0, f'https://{host}/{i}.html', True, 0))
+
+    # Worker selesai urut FIFO: URL paling lama di-lease dikembalikan saat semua host penuh
+    order = []
+    leased = deque()
+    in_flight = {'a.example': 0, 'b.example': 0}
+    while frontier.qsize() or leased:
+        try:
+            _, _, url, _, _ = frontier.get(timeout=0)
+        except TimeoutError:
+            url = leased.popleft()
+            frontier.task_done(url)
+            in_flight[url_host(url)] -= 1
+            continue
+
+        host = url_host(url)
+        in_flight[host] += 1
+        assert in_flight[host] <= 2
+        leased.append(url)
+        order.append(host[0])
+
+    assert ''.join(order) == 'aabb' * 6
+    assert frontier.in_flight() == 0
+    assert {host: stats['peak_in_flight'] for host, stats in frontier.summary()['hosts']['hosts'].items()} == \
+        {'a.example': 2, 'b.example': 2}
+    frontier.close()
+
+def test_frontier_without_limit_leases_in_weight_ratio(tmp_path):
+    scheduler = HostScheduler(per_host_limit=None, policy='deficit', host_weights=WEIGHTS)
+    frontier = PersistentFrontier(tmp_path / FRONTIER_FILE, scheduler=scheduler)
+    for i in range(12):
+        for host in ('a.example', 'b.example'):
+            frontier.put((0, 0, f'https://{host}/{i}.html', True, 0))
+
+    order = ''.join(url_host(frontier.get(timeout=0)[2])[0] for _ in range(16))
+    assert order == 'aaab' * 4
+    frontier.close()
+
+@pytest.mark.parametrize('kwargs', [{'policy': 'fair'}, {'host_weights': {'a.example': 0}}])
+def test_invalid_configuration_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        HostScheduler(**kwargs)
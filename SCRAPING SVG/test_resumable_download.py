@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test resume .part: 416 (Range Not Satisfiable) dan klasifikasi error resume di RetryPolicy
+Jalankan: python -m pytest -q test_resumable_download.py
+"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from resumable_download import (ResumableDownloads, RangeNotSatisfiableError, ResumeMismatchError,
+                                IntegrityError)
+from retry_policy import RetryPolicy
+from web_scraper import WebScraper
+
+URL = 'http://example.com/video.mp4'
+BODY = bytes(range(256)) * 40
+
+def write_part(file_path, data, total, etag='"v1"', url=URL):
+    """.part + .part.json seperti yang ditinggalkan download yang terputus"""
+    file_path.with_name(file_path.name + '.part').write_bytes(data)
+    meta = {'url': url, 'etag': etag, 'last_modified': None, 'total': total, 'received': len(data)}
+    file_path.with_name(file_path.name + '.part.json').write_text(json.dumps(meta))
+
+def test_complete_part_is_finished_on_416(tmp_path):
+    # Crash setelah byte terakhir ditulis tapi sebelum rename
+    file_path = tmp_path / 'video.mp4'
+    write_part(file_path, BODY, len(BODY))
+
+    partial = ResumableDownloads().open(URL, file_path)
+    assert partial.request_headers()['Range'] == f'bytes={len(BODY)}-'
+    partial.range_not_satisfiable({'Content-Range': f'bytes */{len(BODY)}', 'ETag': '"v1"'})
+
+    assert file_path.read_bytes() == BODY
+    assert not partial.part_path.exists() and not partial.meta_path.exists()
+
+@pytest.mark.parametrize('headers', [
+    {'Content-Range': 'bytes */100'},                        # file remote menyusut
+    {'Content-Range': f'bytes */{len(BODY)}', 'ETag': '"v2"'},  # file remote berubah
+])
+def test_shrunk_or_changed_remote_discards_part(tmp_path, headers):
+    file_path = tmp_path / 'video.mp4'
+    write_part(file_path, BODY, len(BODY))
+
+    downloads = ResumableDownloads()
+    partial = downloads.open(URL, file_path)
+    with pytest.raises(RangeNotSatisfiableError):
+        partial.range_not_satisfiable(headers)
+
+    assert not partial.part_path.exists() and not partial.meta_path.exists()
+    assert not file_path.exists()
+    assert downloads.summary()['unsatisfiable'] == 1
+    # Percobaan berikutnya tanpa Range
+    assert downloads.open(URL, file_path).request_headers() == {}
+
+@pytest.mark.parametrize('error', [RangeNotSatisfiableError('416'), ResumeMismatchError('range'),
+                                   IntegrityError('size')])
+def test_resume_errors_are_retryable_but_not_host_failures(error):
+    assert RetryPolicy().classify(error) == (True, False, None)
+
+def test_resume_errors_do_not_open_circuit():
+    def mismatch():
+        raise ResumeMismatchError('range')
+
+    policy = RetryPolicy(max_attempts=1)
+    for _ in range(10):
+        with pytest.raises(ResumeMismatchError):
+            policy.execute(URL, mismatch)
+    assert policy.circuit_breaker.allow('example.com')
+
+class RangeServer(BaseHTTPRequestHandler):
+    """Server yang file-nya sekarang lebih kecil dari .part lama: Range -> 416, tanpa Range -> 200"""
+
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('Range'))
+        body = BODY[:1000]
+        if self.headers.get('Range'):
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(body)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v2"')
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def server():
+    RangeServer.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RangeServer)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+
+def test_web_scraper_restarts_without_range_after_416(tmp_path, monkeypatch, server):
+    # Log file scraper ditulis di cwd
+    monkeypatch.chdir(tmp_path)
+    url = f'{server}/video.mp4'
+    file_path = tmp_path / 'video.mp4'
+    write_part(file_path, BODY, len(BODY), url=url)
+
+    scraper = WebScraper(server, str(tmp_path / 'site'), use_cache=False, respect_robots=False)
+    assert scraper.download_file_once(url, file_path)
+
+    assert RangeServer.requests == [f'bytes={len(BODY)}-', None]
+    assert file_path.read_bytes() == BODY[:1000]
+    assert scraper.resumable.summary()['unsatisfiable'] == 1
+    assert scraper.retry_policy.circuit_breaker.allow(server.split('//')[1])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test seen-set: Bloom filter tanpa false negative, false positive rate tetap terjaga setelah filter bertambah
+Jalankan: python -m pytest -q test_seen_set.py
+"""
+
+import pytest
+
+from seen_set import ExactSeenSet, ScalableBloomSeenSet, make_seen_set, members
+
+def urls(prefix, count):
+    return [f'https://example.com/{prefix}/{i}.html' for i in range(count)]
+
+@pytest.mark.parametrize('backend', ['exact', 'bloom'])
+def test_add_returns_true_only_for_new_items(backend):
+    seen = make_seen_set(backend)
+    assert seen.add('https://example.com/a')
+    assert not seen.add('https://example.com/a')
+    assert seen.add('https://example.com/b')
+    assert 'https://example.com/a' in seen
+    assert len(seen) == 2
+
+def test_bloom_has_no_false_negatives_across_expansions():
+    seen = ScalableBloomSeenSet(error_rate=0.01, initial_capacity=500)
+    items = urls('seen', 10000)
+    for item in items:
+        seen.add(item)
+
+    # 500 + 1000 + 2000 + 4000 + 8000: kapasitas awal terlampaui beberapa kali
+    assert len(seen.filters) >= 4
+    assert all(item in seen for item in items)
+    assert all(not seen.add(item) for item in items)
+
+@pytest.mark.parametrize('error_rate', [0.01, 0.001])
+def test_bloom_false_positive_rate_stays_bounded(error_rate):
+    seen = ScalableBloomSeenSet(error_rate=error_rate, initial_capacity=500)
+    for item in urls('seen', 10000):
+        seen.add(item)
+    assert len(seen.filters) >= 4
+
+    probes = urls('unseen', 50000)
+    false_positives = sum(item in seen for item in probes)
+    assert false_positives / len(probes) <= 2 * error_rate
+
+def test_bloom_len_counts_accepted_adds():
+    seen = ScalableBloomSeenSet(error_rate=0.001, initial_capacity=100)
+    accepted = sum(seen.add(item) for item in urls('seen', 1000))
+    assert len(seen) == accepted
+    assert accepted >= 998
+
+def test_exact_backend_lists_members():
+    seen = make_seen_set('exact')
+    assert isinstance(seen, ExactSeenSet)
+    seen.add('https://example.com/a')
+    assert members(seen) == ['https://example.com/a']
+
+def test_bloom_backend_cannot_list_members():
+    seen = make_seen_set('bloom')
+    seen.add('https://example.com/a')
+    assert members(seen) is None
+    with pytest.raises(TypeError):
+        list(seen)
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        make_seen_set('redis')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test SegmentedDownloader: request range ikut slot concurrency, per_host_limit, circuit breaker,
+rate limiter, dan deadline transfer (async)
+Jalankan: python -m pytest -q test_segmented_download.py
+"""
+
+import asyncio
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import aiohttp
+import pytest
+import requests
+
+import segmented_download
+from segmented_download import SegmentedDownloader, SegmentGate
+from adaptive_concurrency import AdaptiveConcurrencyController
+from rate_limiter import HostRateLimiter
+from retry_policy import CircuitBreaker
+from host_scheduler import HostScheduler
+from resumable_download import ResumableDownloads
+from crawl_budget import TransferDeadline, TransferTimeout
+
+BODY = bytes(range(256)) * 64
+MIN_SIZE = 1024
+
+class RangeServer(BaseHTTPRequestHandler):
+    """File BODY dengan Accept-Ranges; request range dicatat"""
+
+    ranges = []
+    drip = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range') or '')
+        if not match:
+            self.send_response(200)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Content-Length', str(len(BODY)))
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            self.wfile.write(BODY)
+            return
+
+        start, end = int(match.group(1)), int(match.group(2))
+        self.ranges.append((start, end))
+        self.send_response(206)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{len(BODY)}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        for offset in range(start, end + 1, 256):
+            time.sleep(self.drip)
+            self.wfile.write(BODY[offset:min(offset + 256, end + 1)])
+
+@pytest.fixture
+def server():
+    RangeServer.ranges = []
+    RangeServer.drip = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RangeServer)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}/big.bin'
+    httpd.shutdown()
+
+def host_of(url):
+    return url.split('/')[2]
+
+def download(url, tmp_path, gate):
+    """Request utama memegang satu slot (seperti concurrency.slot di fetch_to_file), lalu download tersegmen"""
+    downloader = SegmentedDownloader(segments=4, min_size=MIN_SIZE, gate=gate)
+    partial = ResumableDownloads().open(url, tmp_path / 'big.bin')
+    session = requests.Session()
+    with gate.concurrency.slot(url):
+        response = session.get(url, stream=True)
+        assert downloader.should_segment(response.status_code, response.headers)
+        downloader.download(session, url, response, partial)
+    partial.finish()
+    assert (tmp_path / 'big.bin').read_bytes() == BODY
+    return downloader
+
+def test_segments_are_capped_by_free_concurrency_slots(server, tmp_path):
+    concurrency = AdaptiveConcurrencyController(initial_limit=2)
+    downloader = download(server, tmp_path, SegmentGate(HostRateLimiter(), concurrency))
+
+    # Satu slot dipegang request utama, satu slot tersisa -> 2 segment, 1 request range
+    assert len(RangeServer.ranges) == 1
+    assert downloader.summary()['segments'] == 2 and downloader.summary()['limited'] == 1
+    assert concurrency.hosts[host_of(server)].in_flight == 0
+    assert concurrency.summary()[host_of(server)]['requests'] == 2
+
+def test_segments_are_capped_by_per_host_limit(server, tmp_path):
+    scheduler = HostScheduler(per_host_limit=3)
+    scheduler.add_host(host_of(server))
+    scheduler.lease(host_of(server))
+    scheduler.lease(host_of(server))
+    gate = SegmentGate(HostRateLimiter(), AdaptiveConcurrencyController(initial_limit=8), scheduler=scheduler)
+    download(server, tmp_path, gate)
+
+    # 2 URL host ini sedang di-lease, per_host_limit 3 -> satu request range tambahan
+    assert len(RangeServer.ranges) == 1
+
+def test_no_extra_segments_while_circuit_is_not_closed(server, tmp_path):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure(host_of(server))
+    gate = SegmentGate(HostRateLimiter(), AdaptiveConcurrencyController(initial_limit=8), breaker)
+    downloader = download(server, tmp_path, gate)
+
+    assert RangeServer.ranges == []
+    assert downloader.summary()['segments'] == 1
+    # Pengecekan gate tidak memakai jatah probe half-open
+    assert breaker.allow(host_of(server))
+
+def test_each_range_request_waits_for_rate_limiter(server, tmp_path):
+    rate_limiter = HostRateLimiter(delay=0.2)
+    download(server, tmp_path, SegmentGate(rate_limiter, AdaptiveConcurrencyController(initial_limit=8)))
+
+    assert len(RangeServer.ranges) == 3
+    assert rate_limiter.summary()['requests'] == 3
+    assert rate_limiter.summary()['total_wait'] >= 0.2 + 0.4 - 0.1
+
+def run_async(url, tmp_path, monkeypatch, deadline):
+    writer_threads = []
+    write_at = segmented_download.write_at
+
+    def recording_write_at(path, offset, data):
+        writer_threads.append(threading.get_ident())
+        write_at(path, offset, data)
+
+    monkeypatch.setattr(segmented_download, 'write_at', recording_write_at)
+    downloader = SegmentedDownloader(segments=4, min_size=MIN_SIZE,
+                                     gate=SegmentGate(HostRateLimiter(), AdaptiveConcurrencyController(initial_limit=8)))
+    partial = ResumableDownloads().open(url, tmp_path / 'big.bin')
+
+    async def fetch():
+        async with aiohttp.ClientSession() as http, http.get(url) as response:
+            await downloader.download_async(http, url, response, partial, deadline=deadline)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(fetch())
+    partial.finish()
+    return downloader, loop_thread, writer_threads
+
+def test_async_segments_write_off_event_loop(server, tmp_path, monkeypatch):
+    downloader, loop_thread, writer_threads = run_async(server, tmp_path, monkeypatch, TransferDeadline(server, 30))
+
+    assert (tmp_path / 'big.bin').read_bytes() == BODY
+    assert len(RangeServer.ranges) == 3
+    assert writer_threads and loop_thread not in writer_threads
+    assert downloader.gate.concurrency.hosts[host_of(server)].in_flight == 0
+
+def test_async_segments_enforce_transfer_deadline(server, tmp_path, monkeypatch):
+    RangeServer.drip = 0.05
+    started = time.monotonic()
+    with pytest.raises(TransferTimeout):
+        run_async(server, tmp_path, monkeypatch, TransferDeadline(server, 0.2))
+    assert time.monotonic() - started < 2
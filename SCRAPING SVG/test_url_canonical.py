@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test URLCanonicalizer: tabel varian URL -> canonical form
+Jalankan: python -m pytest -q test_url_canonical.py
+"""
+
+import pytest
+
+from url_canonical import URLCanonicalizer, make_canonicalizer
+
+CASES = [
+    # Port default
+    ('http://example.com:80/a', 'http://example.com/a'),
+    ('https://example.com:443/a', 'https://example.com/a'),
+    ('https://example.com:8080/a', 'https://example.com:8080/a'),
+    ('http://example.com:443/a', 'http://example.com:443/a'),
+    # Scheme/host lowercase, path tetap case-sensitive
+    ('HTTPS://Example.COM/Path', 'https://example.com/Path'),
+    ('https://example.com./a', 'https://example.com/a'),
+    ('https://example.com', 'https://example.com/'),
+    # Dot segment
+    ('https://example.com/a/./b/../c', 'https://example.com/a/c'),
+    ('https://example.com/../../a', 'https://example.com/a'),
+    ('https://example.com/a/b/..', 'https://example.com/a/'),
+    # Percent-encoding
+    ('https://example.com/%7euser', 'https://example.com/~user'),
+    ('https://example.com/a%2fb', 'https://example.com/a%2Fb'),
+    ('https://example.com/a b', 'https://example.com/a%20b'),
+    # index.html
+    ('https://example.com/dir/index.html', 'https://example.com/dir/'),
+    ('https://example.com/INDEX.HTM', 'https://example.com/'),
+    ('https://example.com/dir/index.php', 'https://example.com/dir/index.php'),
+    # Urutan query
+    ('https://example.com/x?b=2&a=1', 'https://example.com/x?a=1&b=2'),
+    ('https://example.com/x?a=2&a=1', 'https://example.com/x?a=1&a=2'),
+    ('https://example.com/x?&a=1&', 'https://example.com/x?a=1'),
+    # Parameter tracking
+    ('https://example.com/x?utm_source=mail&id=1', 'https://example.com/x?id=1'),
+    ('https://example.com/x?UTM_Campaign=a&fbclid=z', 'https://example.com/x'),
+    ('https://example.com/x?id=1&gclid=q', 'https://example.com/x?id=1'),
+    # Fragment
+    ('https://example.com/a#section', 'https://example.com/a'),
+    ('https://example.com/a?b=1#top', 'https://example.com/a?b=1'),
+    # Bukan http(s): apa adanya
+    ('mailto:someone@example.com', 'mailto:someone@example.com'),
+    ('data:image/svg+xml,<svg/>', 'data:image/svg+xml,<svg/>'),
+]
+
+@pytest.mark.parametrize('url, expected', CASES)
+def test_canonical_form(url, expected):
+    assert URLCanonicalizer().canonicalize(url) == expected
+
+@pytest.mark.parametrize('url', [expected for _, expected in CASES])
+def test_canonical_form_is_stable(url):
+    canonicalizer = URLCanonicalizer()
+    assert canonicalizer.canonicalize(url) == url
+
+@pytest.mark.parametrize('policy, url, expected', [
+    ({'sort_query': False}, 'https://example.com/x?b=2&a=1', 'https://example.com/x?b=2&a=1'),
+    ({'strip_index': False}, 'https://example.com/dir/index.html', 'https://example.com/dir/index.html'),
+    ({'index_files': ('default.aspx',)}, 'https://example.com/default.aspx', 'https://example.com/'),
+    ({'drop_params': ()}, 'https://example.com/x?utm_source=a', 'https://example.com/x?utm_source=a'),
+    ({'drop_params': ('sid',)}, 'https://example.com/x?sid=9&utm_source=a', 'https://example.com/x?utm_source=a'),
+])
+def test_policy(policy, url, expected):
+    assert make_canonicalizer(policy).canonicalize(url) == expected
+
+def test_join_resolves_then_canonicalizes():
+    canonicalizer = URLCanonicalizer()
+    assert canonicalizer.join('https://example.com/dir/page.html', '../index.html#x') == 'https://example.com/'
+    assert canonicalizer.join('https://example.com/dir/', 'img.svg?b=1&a=2') == 'https://example.com/dir/img.svg?a=2&b=1'
+
+def test_invalid_port_is_left_alone():
+    assert URLCanonicalizer().canonicalize('http://example.com:abc/') == 'http://example.com:abc/'
+
+def test_stats_count_rewritten_urls():
+    canonicalizer = URLCanonicalizer()
+    canonicalizer.canonicalize('https://example.com/')
+    canonicalizer.canonicalize('https://example.com/index.html')
+    assert canonicalizer.summary() == {'urls': 2, 'rewritten': 1}
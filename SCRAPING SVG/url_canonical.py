@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+URL Canonical - satu bentuk URL untuk semua varian yang menunjuk resource yang sama
+dir/ vs dir/index.html, urutan query, port default, %7e vs ~, fragment: semuanya jadi satu key
+"""
+
+import re
+import string
+import threading
+from fnmatch import fnmatchcase
+from urllib.parse import urljoin, urlsplit, urlunsplit, quote
+
+# File index yang dianggap sama dengan direktorinya
+DEFAULT_INDEX_FILES = ('index.html', 'index.htm')
+
+# Parameter tracking yang tidak mengubah isi halaman
+DEFAULT_DROP_PARAMS = ('utm_*', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Karakter yang tidak perlu di-escape (RFC 3986 unreserved)
+UNRESERVED = frozenset(string.ascii_letters + string.digits + '-._~')
+
+# Karakter yang dibiarkan apa adanya saat quote (reserved + '%' escape yang sudah ada)
+PATH_SAFE = "/:@!$&'()*+,;=-._~%"
+QUERY_SAFE = "/?:@!$'()*+,;=-._~%"
+
+ESCAPE_PATTERN = re.compile(r'%([0-9A-Fa-f]{2})')
+
+def normalize_escapes(text, safe):
+    """%7e -> ~, %2f -> %2F, spasi/non-ASCII -> %XX"""
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else '%' + match.group(1).upper()
+    return quote(ESCAPE_PATTERN.sub(fix, text), safe=safe)
+
+def remove_dot_segments(path):
+    """/a/./b/../c -> /a/c (RFC 3986 5.2.4)"""
+    output = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(output) > 1:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    if path.endswith(('/.', '/..')):
+        output.append('')
+    return '/'.join(output)
+
+class URLCanonicalizer:
+    """Canonical form URL http(s) sesuai policy; URL lain (mailto:, data:) dikembalikan apa adanya
+
+    Selalu: scheme/host lowercase, port default dibuang, fragment dibuang, dot segment diselesaikan,
+    percent-encoding dinormalisasi. Policy: sort_query, strip_index (index_files), drop_params (glob nama param).
+    """
+
+    def __init__(self, sort_query=True, strip_index=True, index_files=DEFAULT_INDEX_FILES,
+                 drop_params=DEFAULT_DROP_PARAMS):
+        self.sort_query = sort_query
+        self.strip_index = strip_index
+        self.index_files = tuple(name.lower() for name in index_files)
+        self.drop_params = tuple(drop_params or ())
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'urls': 0,
+            'rewritten': 0
+        }
+
+    def canonicalize(self, url):
+        try:
+            canonical = self.canonical_form(url)
+        except ValueError:
+            # Port/host tidak valid: biarkan, fetch yang akan gagal
+            canonical = url
+
+        with self.lock:
+            self.stats['urls'] += 1
+            if canonical != url:
+                self.stats['rewritten'] += 1
+        return canonical
+
+    def join(self, base_url, url):
+        """urljoin + canonicalize"""
+        return self.canonicalize(urljoin(base_url, url))
+
+    def canonical_form(self, url):
+        scheme, netloc, path, query, _ = urlsplit(url.strip())
+        scheme = scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            return url
+
+        return urlunsplit((scheme, self.canonical_netloc(scheme, netloc), self.canonical_path(path),
+                           self.canonical_query(query), ''))
+
+    def canonical_netloc(self, scheme, netloc):
+        userinfo, _, hostport = netloc.rpartition('@')
+        host, port = hostport, None
+        if hostport.startswith('['):
+            # IPv6 literal: [::1]:8080
+            end = hostport.find(']')
+            host, port = hostport[:end + 1], hostport[end + 2:] or None
+        elif ':' in hostport:
+            host, port = hostport.rsplit(':', 1)
+
+        host = host.lower().rstrip('.')
+        if not host.isascii():
+            host = host.encode('idna').decode('ascii')
+        if port is not None and (not port or int(port) == DEFAULT_PORTS[scheme]):
+            port = None
+
+        netloc = f"{host}:{int(port)}" if port is not None else host
+        return f"{userinfo}@{netloc}" if userinfo else netloc
+
+    def canonical_path(self, path):
+        path = remove_dot_segments(normalize_escapes(path, PATH_SAFE)) or '/'
+        if not path.startswith('/'):
+            path = '/' + path
+
+        if self.strip_index:
+            directory, _, filename = path.rpartition('/')
+            if filename.lower() in self.index_files:
+                path = directory + '/'
+        return path
+
+    def canonical_query(self, query):
+        params = []
+        for param in query.split('&'):
+            if not param:
+                continue
+            name, sep, value = param.partition('=')
+            name = normalize_escapes(name, QUERY_SAFE)
+            if any(fnmatchcase(name.lower(), pattern) for pattern in self.drop_params):
+                continue
+            params.append((name, sep, normalize_escapes(value, QUERY_SAFE)))
+
+        if self.sort_query:
+            params.sort()
+        return '&'.join(name + sep + value for name, sep, value in params)
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
+
+def make_canonicalizer(policy=None):
+    """URLCanonicalizer dari dict policy (None = default); instance dikembalikan apa adanya"""
+    if isinstance(policy, URLCanonicalizer):
+        return policy
+    return URLCanonicalizer(**(policy or {}))
@@ -7,27 +7,52 @@ dari https://admin.pixelstrap.net/mofi/template/
 import os
 import re
 import sys
-import time
 import requests
-from urllib.parse import urljoin, urlparse, unquote
-from urllib.robotparser import RobotFileParser
+from urllib.parse import urlparse, unquote
 import threading
-from queue import Queue
 import logging
 from pathlib import Path
 from bs4 import BeautifulSoup
 import mimetypes
 from collections import defaultdict
+from http_cache import HTTPCache, mark_not_modified
+from adaptive_concurrency import AdaptiveConcurrencyController, UnlimitedConcurrency
+from rate_limiter import HostRateLimiter, BandwidthLimiter
+from retry_policy import RetryPolicy, CircuitOpenError
+from resumable_download import ResumableDownloads
+from segmented_download import SegmentedDownloader, SegmentGate
+from content_decoding import accept_encoding, DecodingWriter, TransferStats
+from chunk_reader import iter_chunks
+from singleflight import SingleFlight, flight_key
+from crawl_priority import PriorityScorer, content_type
+from robots_cache import RobotsCache
+from crawl_budget import CrawlBudget, RequestTimeouts, BudgetExhaustedError
+from write_behind import WriteBehindPool
+from crawl_frontier import PersistentFrontier, FRONTIER_FILE, DONE, FAILED, DROPPED, SKIPPED
+from crawl_scope import CrawlScope, SiteAllowlist
+from host_scheduler import HostScheduler
+from seen_set import make_seen_set, ExactSeenSet, seen_sets_summary, format_seen_sets
+from url_canonical import make_canonicalizer
 
 class WebScraper:
-    def __init__(self, base_url, download_dir="downloaded_site", max_workers=5):
+    def __init__(self, base_url, download_dir="downloaded_site", max_workers=5, use_cache=True, adaptive=False,
+                 delay=0, burst=1, segments=0, priority_weights=None, respect_robots=True,
+                 max_bandwidth=None, bandwidth_shares=None, connect_timeout=10, read_timeout=30,
+                 total_timeout=300, time_budget=None, io_workers=2, resume=False, seen_set='exact',
+                 seen_error_rate=0.001, url_policy=None, max_depth=None, path_prefixes=None,
+                 exclude_prefixes=None, max_pages_per_prefix=None, allowed_hosts=None, asset_hosts=None,
+                 per_host_limit=None, host_scheduling='round_robin', host_weights=None):
+        # Semua URL (enqueue + dedupe) lewat canonicalizer: dir/ == dir/index.html, urutan query, port default
+        self.canonical = make_canonicalizer(url_policy)
         self.base_url = base_url.rstrip('/')
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(self.canonical.canonicalize(base_url)).netloc
+        # Host yang boleh di-crawl: situs awal + allowed_hosts (halaman) + asset_hosts (CDN, asset saja)
+        self.sites = SiteAllowlist(self.canonical.canonicalize(base_url), allowed_hosts, asset_hosts)
         self.download_dir = Path(download_dir)
-        self.downloaded_urls = set()
-        self.failed_urls = set()
-        self.url_queue = Queue()
-        self.resource_queue = Queue()
+        # Dedupe URL: 'bloom' hemat memori untuk crawl besar (false positive <= seen_error_rate)
+        self.downloaded_urls = make_seen_set(seen_set, seen_error_rate)
+        # failed_urls di-list di summary, selalu exact
+        self.failed_urls = ExactSeenSet()
         self.max_workers = max_workers
         
         # Setup logging
@@ -56,7 +81,7 @@ class WebScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': accept_encoding(),
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
@@ -65,6 +90,66 @@ class WebScraper:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
         
+        # Cache ETag/Last-Modified untuk conditional GET saat re-crawl
+        self.http_cache = HTTPCache(self.download_dir / '.http_cache.json') if use_cache else None
+        
+        # Adaptive: max_workers jadi batas atas, limit in-flight per host diatur otomatis
+        if adaptive:
+            self.concurrency = AdaptiveConcurrencyController(max_limit=max_workers)
+        else:
+            self.concurrency = UnlimitedConcurrency()
+        
+        # Politeness: token bucket per host (delay detik antar request, burst request beruntun)
+        self.rate_limiter = HostRateLimiter(delay=delay, burst=burst)
+        
+        # Batas byte/detik bersama untuk semua worker, dibagi per content type (HTML dulu, media terakhir)
+        self.bandwidth = BandwidthLimiter(max_bandwidth, bandwidth_shares)
+        
+        # robots.txt per host (cache dengan TTL); Crawl-delay ikut memperlambat rate limiter
+        self.robots = RobotsCache(self.session, rate_limiter=self.rate_limiter, logger=self.logger) if respect_robots else None
+        
+        # Retry error transient + circuit breaker per host
+        self.retry_policy = RetryPolicy(logger=self.logger)
+        
+        # Download terputus disimpan sebagai .part dan dilanjutkan dengan Range
+        self.resumable = ResumableDownloads()
+        
+        # File besar dengan Accept-Ranges di-download paralel per byte range (segments > 1)
+        self.segmented = SegmentedDownloader(segments=segments)
+        
+        # Write-behind: worker network hanya menyerahkan buffer, thread I/O yang menulis ke disk
+        self.io_pool = WriteBehindPool(io_workers)
+        self.created_dirs = set()
+        
+        # Body di-decode sendiri per chunk (br/zstd/gzip) supaya byte wire vs decoded tercatat
+        self.transfer_stats = TransferStats()
+        
+        # Asset yang sama dari banyak halaman: satu fetch, worker lain menunggu hasilnya
+        self.inflight = SingleFlight()
+        
+        # Satu frontier prioritas: HTML (penemu link) dulu, media besar terakhir
+        # Frontier + seen-set di SQLite (dibuka di start_scraping), resume=True melanjutkan crawl sebelumnya
+        self.priority = PriorityScorer(priority_weights)
+        self.resume = resume
+        self.frontier = None
+        
+        # Frontier di-shard per host: host bergiliran (round_robin / deficit berbobot),
+        # maksimal per_host_limit URL in-flight per host (None = tanpa batas)
+        self.host_scheduler = HostScheduler(per_host_limit, host_scheduling, host_weights)
+        
+        # Batas kedalaman link / prefix path / halaman per prefix (refresh dangkal situs besar)
+        self.scope = CrawlScope(max_depth, path_prefixes, exclude_prefixes, max_pages_per_prefix)
+        
+        # Batas waktu crawl: saat sisa waktu menipis hanya HTML/CSS/JS yang masih dikerjakan
+        self.budget = CrawlBudget(time_budget, min_score=self.priority.weights['js'])
+        
+        # Timeout connect/read per request + deadline total body (slow-drip tidak menahan worker)
+        self.timeouts = RequestTimeouts(connect_timeout, read_timeout, total_timeout, budget=self.budget)
+        self.segmented.timeout = (connect_timeout, read_timeout)
+        # Request range tambahan ikut rate limiter, slot concurrency, per_host_limit dan circuit breaker host
+        self.segmented.gate = SegmentGate(self.rate_limiter, self.concurrency,
+                                          self.retry_policy.circuit_breaker, self.host_scheduler)
+        
     def create_directory_structure(self, url_path):
         """Membuat struktur direktori berdasarkan URL path"""
         # Parse URL untuk mendapatkan path
@@ -83,17 +168,23 @@ class WebScraper:
         if path.endswith('/'):
             path += 'index.html'
         
+        # Host lain (CDN, allowed_hosts) di subdirektori sendiri supaya path yang sama tidak bertabrakan
+        if parsed_url.netloc and parsed_url.netloc != self.domain:
+            path = parsed_url.netloc.replace(':', '_') + '/' + path
+        
         # Buat path lengkap
         full_path = self.download_dir / path
         
-        # Buat direktori jika belum ada
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        # Buat direktori jika belum ada (sekali per direktori, mkdir di disk lambat mahal)
+        if full_path.parent not in self.created_dirs:
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            self.created_dirs.add(full_path.parent)
         
         return full_path
     
-    def is_same_domain(self, url):
-        """Cek apakah URL masih dalam domain yang sama"""
-        return urlparse(url).netloc == self.domain
+    def is_same_domain(self, url, is_html=True):
+        """Cek apakah host URL masuk allowlist situs (asset boleh juga dari asset_hosts)"""
+        return self.sites.allows(url, is_html)
     
     def get_file_extension(self, url):
         """Dapatkan ekstensi file dari URL"""
@@ -109,32 +200,101 @@ class WebScraper:
         except:
             return False
     
-    def download_file(self, url, file_path, is_html=False):
-        """Download file dari URL ke path yang ditentukan"""
-        try:
-            if url in self.downloaded_urls:
-                return True
+    def fetch_to_file(self, url, file_path, is_html=False):
+        """Satu percobaan request + tulis body, return (unchanged, response)"""
+        self.budget.check(url)
+        
+        # Ada .part dari percobaan/run sebelumnya: lanjutkan dengan Range
+        partial = self.resumable.open(url, file_path)
+        headers = partial.request_headers()
+        if not headers and self.http_cache:
+            headers = self.http_cache.conditional_headers(url)
+        
+        # Tunggu token host ini dulu, supaya tidak menahan slot concurrency saat menunggu
+        self.rate_limiter.wait(url)
+        
+        # Slot concurrency per host dipegang selama request + tulis body
+        with self.concurrency.slot(url) as slot:
+            response = self.session.get(url, timeout=self.timeouts.requests_timeout(), stream=True, headers=headers)
+            slot.record_response(response)
+            
+            # 304: file di disk masih sama, skip write
+            unchanged = response.status_code == 304
+            if unchanged:
+                response.close()
+                mark_not_modified(self.http_cache, url)
+            elif response.status_code == 416 and partial.offset:
+                # Range .part tidak bisa dipenuhi: .part lengkap di-rename, atau dibuang lalu retry tanpa Range
+                response.close()
+                partial.range_not_satisfiable(response.headers)
+            else:
+                response.raise_for_status()
                 
+                # Tulis ke .part, byte yang sudah diterima dicatat jika koneksi putus
+                with self.bandwidth.transfer(content_type(url, is_html)) as transfer:
+                    deadline = self.timeouts.deadline(url)
+                    if self.segmented.should_segment(response.status_code, response.headers):
+                        self.segmented.download(self.session, url, response, partial, transfer, deadline)
+                        total = int(response.headers['Content-Length'])
+                        self.transfer_stats.record('identity', total, total)
+                    else:
+                        try:
+                            # open/write/close di thread I/O; with menunggu sampai semua byte tertulis
+                            mode = partial.prepare(response.status_code, response.headers)
+                            with self.io_pool.open(partial.part_path, mode) as f:
+                                writer = DecodingWriter(f, response.headers.get('Content-Encoding'))
+                                for chunk in iter_chunks(response, deadline):
+                                    transfer.consume(len(chunk))
+                                    writer.write(chunk)
+                                writer.finish()
+                        except requests.exceptions.RequestException:
+                            partial.interrupted()
+                            raise
+                        self.transfer_stats.record(writer.encoding, writer.wire_bytes, writer.decoded_bytes)
+                partial.finish()
+        
+        return unchanged, response
+    
+    def download_file(self, url, file_path, is_html=False, depth=0):
+        """Download file dari URL ke path yang ditentukan (satu fetch per URL)"""
+        if url in self.downloaded_urls:
+            return True
+        
+        return self.inflight.do(flight_key(url), self.download_file_once, url, file_path, is_html, depth)
+    
+    def download_file_once(self, url, file_path, is_html=False, depth=0):
+        """Fetch + simpan + parse; hanya dipanggil lewat singleflight"""
+        # Fetch lain untuk URL ini baru selesai (key singleflight sudah dibuang): jangan fetch ulang
+        if url in self.downloaded_urls:
+            return True
+        
+        try:
             self.logger.info(f"Downloading: {url}")
             
-            response = self.session.get(url, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # Tulis file
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # Error transient di-retry dengan backoff, host yang down di-skip circuit breaker
+            unchanged, response = self.retry_policy.execute(url, lambda: self.fetch_to_file(url, file_path, is_html))
             
             self.downloaded_urls.add(url)
-            self.logger.info(f"✓ Downloaded: {file_path}")
+            if unchanged:
+                self.logger.info(f"= Unchanged: {file_path}")
+            else:
+                if self.http_cache:
+                    self.http_cache.store(url, response.headers, file_path)
+                self.logger.info(f"✓ Downloaded: {file_path}")
             
             # Jika ini HTML, parse untuk mencari resource dan link lain
             if is_html:
-                self.parse_html_for_resources(file_path, url)
+                self.parse_html_for_resources(file_path, url, depth)
             
             return True
             
+        except CircuitOpenError as e:
+            self.logger.warning(f"⏸ Skipped {url}: {e}")
+            self.failed_urls.add(url)
+            return False
+        except BudgetExhaustedError as e:
+            self.logger.warning(f"⏸ Skipped {url}: {e}")
+            return False
         except requests.exceptions.RequestException as e:
             self.logger.error(f"✗ Failed to download {url}: {e}")
             self.failed_urls.add(url)
@@ -144,13 +304,14 @@ class WebScraper:
             self.failed_urls.add(url)
             return False
     
-    def parse_html_for_resources(self, html_file_path, base_url):
-        """Parse HTML untuk mencari semua resource dan link"""
+    def parse_html_for_resources(self, html_file_path, base_url, depth=0):
+        """Parse HTML (depth = kedalaman halaman ini) untuk mencari semua resource dan link"""
         try:
             with open(html_file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
             
             soup = BeautifulSoup(content, 'html.parser')
+            discovered = []
             
             # Dictionary untuk berbagai jenis tag dan atribut
             resource_selectors = {
@@ -180,24 +341,27 @@ class WebScraper:
                                 if attr == 'srcset':
                                     urls = [url.strip().split(' ')[0] for url in resource_url.split(',')]
                                     for url in urls:
-                                        self.process_resource_url(url, base_url)
+                                        discovered.append(self.process_resource_url(url, base_url, depth))
                                 else:
-                                    self.process_resource_url(resource_url, base_url)
+                                    discovered.append(self.process_resource_url(resource_url, base_url, depth))
             
             # Parse inline CSS untuk resource
-            self.parse_css_resources(content, base_url)
+            discovered.extend(self.parse_css_resources(content, base_url, depth))
             
             # Parse style tags
             style_tags = soup.find_all('style')
             for style_tag in style_tags:
                 if style_tag.string:
-                    self.parse_css_resources(style_tag.string, base_url)
+                    discovered.extend(self.parse_css_resources(style_tag.string, base_url, depth))
+            
+            self.enqueue_discovered(discovered)
                     
         except Exception as e:
             self.logger.error(f"Error parsing HTML {html_file_path}: {e}")
     
-    def parse_css_resources(self, css_content, base_url):
-        """Parse CSS untuk mencari resource seperti gambar, font, dll"""
+    def parse_css_resources(self, css_content, base_url, depth=0):
+        """Parse CSS untuk mencari resource seperti gambar, font, dll (return kandidat frontier)"""
+        discovered = []
         try:
             # Pattern untuk mencari URL dalam CSS
             url_pattern = re.compile(r'url\s*\(\s*["\']?([^"\'\)]+)["\']?\s*\)', re.IGNORECASE)
@@ -206,76 +370,114 @@ class WebScraper:
             for url in urls:
                 url = url.strip()
                 if url:
-                    self.process_resource_url(url, base_url)
+                    discovered.append(self.process_resource_url(url, base_url, depth))
                     
         except Exception as e:
             self.logger.error(f"Error parsing CSS: {e}")
+        return discovered
     
-    def process_resource_url(self, url, base_url):
-        """Proses URL resource dan tambahkan ke queue jika valid"""
+    def process_resource_url(self, url, base_url, depth=0):
+        """Cek URL resource; return (url, is_html, depth) kandidat frontier, None jika tidak valid"""
         try:
             # Skip data URLs, javascript, dan mailto
             if url.startswith(('data:', 'javascript:', 'mailto:', '#')):
                 return
             
-            # Resolve relative URLs
-            absolute_url = urljoin(base_url, url)
+            # Resolve relative URLs ke bentuk canonical
+            absolute_url = self.canonical.join(base_url, url)
+            
+            # Tentukan apakah ini HTML atau resource
+            extension = self.get_file_extension(absolute_url)
             
-            # Skip jika bukan domain yang sama
-            if not self.is_same_domain(absolute_url):
+            # HTML kemungkinan halaman, selain itu resource (CSS, JS, gambar, dll)
+            is_html = extension in self.html_extensions or not extension
+            
+            # Skip jika host tidak ada di allowlist situs
+            if not self.is_same_domain(absolute_url, is_html):
                 return
             
-            # Skip jika sudah didownload
-            if absolute_url in self.downloaded_urls:
+            # Skip jika sudah didownload; dengan batas depth halaman tetap ke frontier (bisa di-readmit lebih dangkal)
+            if absolute_url in self.downloaded_urls and not (is_html and self.scope.max_depth is not None):
                 return
             
-            # Tentukan apakah ini HTML atau resource
-            extension = self.get_file_extension(absolute_url)
+            # Disallow di robots.txt: buang sebelum memakan request
+            if self.robots and not self.robots.allowed(absolute_url):
+                return
             
-            if extension in self.html_extensions or not extension:
-                # Ini kemungkinan halaman HTML
-                self.url_queue.put(absolute_url)
-            else:
-                # Ini resource (CSS, JS, gambar, dll)
-                self.resource_queue.put(absolute_url)
+            # Terlalu dalam / di luar prefix: tidak masuk frontier
+            child_depth = self.scope.child_depth(depth, is_html)
+            if not self.scope.allows(absolute_url, child_depth, is_html):
+                return
+            
+            return absolute_url, is_html, child_depth
                 
         except Exception as e:
             self.logger.error(f"Error processing URL {url}: {e}")
     
-    def worker_html(self):
-        """Worker thread untuk download halaman HTML"""
+    def enqueue_discovered(self, discovered):
+        """Masukkan kandidat dari satu halaman; bonus hub dari jumlah URL yang benar-benar baru di halaman ini"""
+        candidates = {}
+        for candidate in discovered:
+            if candidate is not None and candidate[0] not in candidates:
+                candidates[candidate[0]] = candidate
+        
+        new_urls = sum(1 for url in candidates if url not in self.frontier)
+        hub_bonus = self.priority.hub_bonus(new_urls)
+        for url, is_html, depth in candidates.values():
+            self.enqueue_url(url, is_html, hub_bonus, depth)
+    
+    def enqueue_url(self, url, is_html, hub_bonus=0, depth=0):
+        """Masukkan URL ke frontier prioritas (di-override oleh engine lain)"""
+        if self.frontier.put(self.priority.entry(url, is_html, hub_bonus, depth)):
+            self.priority.accepted(url, is_html)
+    
+    def worker(self):
+        """Worker thread untuk HTML dan resource, selalu ambil URL prioritas tertinggi"""
         while True:
+            # Blok sampai ada URL atau sentinel stop; tidak ada timeout yang membuat worker keluar diam-diam
+            priority, _, url, is_html, depth = self.frontier.get()
+            if url is None:
+                break
+            
+            state = DROPPED
             try:
-                url = self.url_queue.get(timeout=5)
-                if url is None:
-                    break
+                # Budget menipis/habis: buang pekerjaan prioritas rendah, frontier tetap dikuras
+                # (DROPPED antri lagi saat --resume)
+                if not self.budget.allows(-priority):
+                    continue
                 
-                file_path = self.create_directory_structure(url)
+                # Halaman yang di-readmit frontier (ditemukan lebih dangkal) sudah ada di disk
+                readmitted = is_html and url in self.downloaded_urls
                 
-                # Pastikan file memiliki ekstensi HTML
-                if not file_path.suffix:
-                    file_path = file_path.with_suffix('.html')
+                # Kuota halaman prefix ini sudah habis (tidak antri lagi saat --resume)
+                if not readmitted and not self.scope.take(url, is_html):
+                    state = SKIPPED
+                    continue
                 
-                self.download_file(url, file_path, is_html=True)
-                self.url_queue.task_done()
+                file_path = self.create_directory_structure(url)
                 
-            except:
-                break
-    
-    def worker_resource(self):
-        """Worker thread untuk download resource"""
-        while True:
-            try:
-                url = self.resource_queue.get(timeout=5)
-                if url is None:
-                    break
+                # Pastikan file HTML memiliki ekstensi
+                if is_html and not file_path.suffix:
+                    file_path = file_path.with_suffix('.html')
                 
-                file_path = self.create_directory_structure(url)
-                self.download_file(url, file_path, is_html=False)
-                self.resource_queue.task_done()
+                # Parse ulang file lokal dengan depth baru, tanpa fetch lagi
+                if readmitted:
+                    self.parse_html_for_resources(file_path, url, depth)
+                    state = DONE
+                    continue
                 
-            except:
-                break
+                if self.download_file(url, file_path, is_html=is_html, depth=depth):
+                    state = DONE
+                elif url in self.failed_urls:
+                    state = FAILED
+            except Exception as e:
+                # Error tak terduga hanya menggagalkan URL ini, worker tetap hidup
+                self.logger.error(f"✗ Worker error on {url}: {e}")
+                self.failed_urls.add(url)
+                state = FAILED
+            finally:
+                # Selalu dicatat: in-flight turun dan join() bisa mendeteksi crawl selesai
+                self.frontier.task_done(url, state)
     
     def start_scraping(self):
         """Mulai proses scraping"""
@@ -284,59 +486,52 @@ class WebScraper:
         
         # Buat direktori download
         self.download_dir.mkdir(exist_ok=True)
+        self.budget.start()
         
-        # Tambahkan URL utama ke queue
-        self.url_queue.put(self.base_url)
+        self.frontier = PersistentFrontier(self.download_dir / FRONTIER_FILE, resume=self.resume,
+                                           scheduler=self.host_scheduler, max_depth=self.scope.max_depth)
+        if self.frontier.store.resumed:
+            frontier_stats = self.frontier.summary()
+            self.logger.info(f"Resuming crawl: {frontier_stats['queued']} URLs queued, "
+                             f"{frontier_stats['done']} already done")
+            if self.scope.max_pages_per_prefix is not None:
+                self.scope.restore(self.frontier.store.urls(DONE, FAILED, html_only=True))
         
-        # Start worker threads
-        html_workers = []
-        resource_workers = []
+        # Tambahkan URL utama ke frontier (diabaikan jika sudah pernah dilihat)
+        self.enqueue_url(self.canonical.canonicalize(self.base_url), True)
         
-        # Worker untuk HTML
-        for i in range(2):  # 2 worker untuk HTML
-            worker = threading.Thread(target=self.worker_html)
+        # Start worker threads (satu pool; 2 worker ekstra menggantikan pool HTML lama)
+        workers = []
+        for i in range(self.max_workers + 2):
+            worker = threading.Thread(target=self.worker)
             worker.daemon = True
             worker.start()
-            html_workers.append(worker)
+            workers.append(worker)
         
-        # Worker untuk resource
-        for i in range(self.max_workers):  # Lebih banyak worker untuk resource
-            worker = threading.Thread(target=self.worker_resource)
-            worker.daemon = True
-            worker.start()
-            resource_workers.append(worker)
-        
-        # Monitor progress
+        # Crawl selesai tepat saat frontier kosong dan tidak ada URL in-flight (dibangunkan put/task_done,
+        # bukan polling qsize); timeout hanya untuk log progress
         try:
-            while True:
-                html_remaining = self.url_queue.qsize()
-                resource_remaining = self.resource_queue.qsize()
-                
-                if html_remaining == 0 and resource_remaining == 0:
-                    time.sleep(2)  # Wait a bit untuk memastikan tidak ada yang ditambahkan
-                    if self.url_queue.qsize() == 0 and self.resource_queue.qsize() == 0:
-                        break
-                
-                self.logger.info(f"Queue status - HTML: {html_remaining}, Resources: {resource_remaining}, Downloaded: {len(self.downloaded_urls)}")
-                time.sleep(5)
-                
+            while not self.frontier.join(timeout=5):
+                self.logger.info(f"Queue status - Frontier: {self.frontier.qsize()}, In flight: {self.frontier.in_flight()}, "
+                                 f"Downloaded: {len(self.downloaded_urls)}")
         except KeyboardInterrupt:
+            # Sisa antrian tetap di disk; jalankan lagi dengan resume=True untuk melanjutkan
             self.logger.info("Scraping interrupted by user")
-        
-        # Wait for all tasks to complete
-        self.url_queue.join()
-        self.resource_queue.join()
+            self.frontier.stop()
+            self.frontier.join()
         
         # Stop workers
-        for _ in html_workers:
-            self.url_queue.put(None)
-        for _ in resource_workers:
-            self.resource_queue.put(None)
+        for _ in workers:
+            self.frontier.put(self.priority.sentinel())
         
         # Wait for workers to finish
-        for worker in html_workers + resource_workers:
+        for worker in workers:
             worker.join()
         
+        self.frontier.close()
+        if self.http_cache:
+            self.http_cache.save()
+        
         self.print_summary()
     
     def print_summary(self):
@@ -346,6 +541,86 @@ class WebScraper:
         self.logger.info("="*50)
         self.logger.info(f"Total files downloaded: {len(self.downloaded_urls)}")
         self.logger.info(f"Failed downloads: {len(self.failed_urls)}")
+        if self.http_cache:
+            cache_stats = self.http_cache.summary()
+            self.logger.info(f"Unchanged (304): {cache_stats['unchanged']} files, {cache_stats['bytes_saved']:,} bytes not re-downloaded")
+        retry_stats = self.retry_policy.summary()
+        if retry_stats['retries']:
+            self.logger.info(f"Retries: {retry_stats['retries']} ({retry_stats['recovered']} recovered)")
+        for host, breaker_stats in retry_stats['open_circuits'].items():
+            self.logger.info(f"Circuit breaker {host}: opened {breaker_stats['times_opened']}x, "
+                             f"{breaker_stats['rejected']} requests skipped")
+        resume_stats = self.resumable.summary()
+        if resume_stats['resumed'] or resume_stats['interrupted'] or resume_stats['unsatisfiable']:
+            self.logger.info(f"Resumed downloads: {resume_stats['resumed']} ({resume_stats['bytes_resumed']:,} bytes not re-downloaded), "
+                             f"{resume_stats['interrupted']} interrupted, {resume_stats['unsatisfiable']} restarted after 416")
+        frontier_stats = self.frontier.summary()
+        self.logger.info(f"Frontier: {frontier_stats['done']} done, {frontier_stats['failed']} failed, "
+                         f"{frontier_stats['queued'] + frontier_stats['dropped']} left for resume "
+                         f"({frontier_stats['duplicates']} duplicate URLs skipped)")
+        if frontier_stats['resumed_queued'] or frontier_stats['resumed_done']:
+            self.logger.info(f"Resumed from {frontier_stats['path']}: {frontier_stats['resumed_done']} done earlier, "
+                             f"{frontier_stats['resumed_queued']} were still queued")
+        enqueued = self.priority.summary()['enqueued']
+        self.logger.info("Seen-sets: " + format_seen_sets(seen_sets_summary(downloaded_urls=self.downloaded_urls,
+                                                                             failed_urls=self.failed_urls)))
+        if enqueued:
+            self.logger.info("Enqueued by type: " + ", ".join(f"{name} {count}" for name, count in
+                                                              sorted(enqueued.items(), key=lambda item: -self.priority.weights.get(item[0], 0))))
+        host_stats = frontier_stats['hosts']
+        if len(host_stats['hosts']) > 1:
+            self.logger.info(f"Hosts ({host_stats['policy']}, limit {host_stats['per_host_limit'] or 'none'} in flight): "
+                             + ", ".join(f"{host} {stats['served']} (peak {stats['peak_in_flight']})"
+                                         for host, stats in host_stats['hosts'].items()))
+        if self.sites.multi_host:
+            self.logger.info(f"Off-site: {self.sites.summary()['off_site']} links to hosts outside the allowlist skipped")
+        if self.scope.limited:
+            scope_stats = self.scope.summary()
+            self.logger.info(f"Scope: {scope_stats['too_deep']} URLs too deep, {scope_stats['out_of_scope']} outside path prefixes, "
+                             f"{scope_stats['prefix_full']} over the per-prefix page limit")
+        if self.robots:
+            robots_stats = self.robots.summary()
+            self.logger.info(f"robots.txt: {robots_stats['disallowed']} URLs disallowed, {robots_stats['fetched']} robots.txt fetched")
+            for host, crawl_delay in robots_stats['crawl_delays'].items():
+                self.logger.info(f"Crawl-delay {host}: {crawl_delay}s")
+        canonical_stats = self.canonical.summary()
+        if canonical_stats['rewritten']:
+            self.logger.info(f"Canonical URLs: {canonical_stats['rewritten']} of {canonical_stats['urls']} links rewritten "
+                             f"(duplicate variants fetched once)")
+        inflight_stats = self.inflight.summary()
+        if inflight_stats['coalesced']:
+            self.logger.info(f"Coalesced duplicate fetches: {inflight_stats['coalesced']} (waited on an in-flight download)")
+        transfer = self.transfer_stats.summary()
+        if transfer['decoded_bytes']:
+            self.logger.info(f"Transfer: {transfer['wire_bytes']:,} bytes on the wire, {transfer['decoded_bytes']:,} bytes decoded "
+                             f"({transfer['saved_percent']}% saved by compression)")
+            for encoding, encoding_stats in transfer['by_encoding'].items():
+                self.logger.info(f"  {encoding}: {encoding_stats['files']} files, {encoding_stats['wire_bytes']:,} -> "
+                                 f"{encoding_stats['decoded_bytes']:,} bytes")
+        segment_stats = self.segmented.summary()
+        if segment_stats['files']:
+            self.logger.info(f"Segmented downloads: {segment_stats['files']} files in {segment_stats['segments']} ranges, "
+                             f"{segment_stats['bytes']:,} bytes, {segment_stats['limited']} capped by host slots")
+        budget_stats = self.budget.summary()
+        if budget_stats['budget_seconds']:
+            self.logger.info(f"Time budget: {budget_stats['elapsed']}s of {budget_stats['budget_seconds']}s used, "
+                             f"{budget_stats['dropped_low']} low-priority URLs dropped, "
+                             f"{budget_stats['dropped_expired']} dropped after deadline")
+        io_stats = self.io_pool.summary()
+        if io_stats['files']:
+            self.logger.info(f"Write-behind: {io_stats['files']} files, {io_stats['bytes']:,} bytes by {io_stats['io_workers']} I/O threads, "
+                             f"backpressure {io_stats['backpressure_waits']}x ({io_stats['backpressure_time']}s)")
+        bandwidth_stats = self.bandwidth.summary()
+        if bandwidth_stats['limit_bytes_per_second']:
+            self.logger.info(f"Bandwidth: {bandwidth_stats['bytes_per_second']:,.0f} B/s average "
+                             f"(limit {bandwidth_stats['limit_bytes_per_second']:,.0f} B/s), "
+                             f"{bandwidth_stats['throttled']} chunks waited {bandwidth_stats['total_wait']}s in total")
+        limiter_stats = self.rate_limiter.summary()
+        if limiter_stats['throttled']:
+            self.logger.info(f"Rate limited: {limiter_stats['throttled']} requests waited {limiter_stats['total_wait']}s in total")
+        for host, host_stats in self.concurrency.summary().items():
+            self.logger.info(f"Concurrency {host}: limit {host_stats['current_limit']} (peak {host_stats['peak_limit']}), "
+                             f"{host_stats['throttled']} throttled, avg latency {host_stats['avg_latency_ms']} ms")
         self.logger.info(f"Download directory: {self.download_dir.absolute()}")
         
         if self.failed_urls:
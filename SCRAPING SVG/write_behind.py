@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Write-Behind I/O Pool - fetcher hanya menyerahkan buffer, thread I/O yang open/write/close
+Concurrency network dan disk diatur terpisah; antrian dibatasi byte (backpressure saat disk lambat)
+"""
+
+import time
+import itertools
+import threading
+from queue import Queue
+
+# Batas default byte yang boleh antri belum tertulis
+DEFAULT_MAX_PENDING_BYTES = 32 * 1024 * 1024
+
+class WriteBehindFile:
+    """Handle file milik thread I/O; write() hanya antri, close() menunggu semua selesai"""
+
+    def __init__(self, pool, lane):
+        self.pool = pool
+        self.lane = lane
+        self.f = None
+        self.error = None
+        self.closed = threading.Event()
+
+    def write(self, data):
+        # Error disk dari thread I/O dilaporkan ke fetcher secepatnya
+        if self.error is not None:
+            raise self.error
+        if data:
+            # memoryview dari buffer yang dipakai ulang (chunk_reader) harus disalin sebelum antri
+            if not isinstance(data, bytes):
+                data = bytes(data)
+            self.pool.submit(self.lane, self, 'write', data)
+
+    def try_write(self, data):
+        """Seperti write() tapi tidak pernah menunggu; False jika antrian penuh (caller async pakai executor)"""
+        if self.error is not None:
+            raise self.error
+        if not data:
+            return True
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return self.pool.submit(self.lane, self, 'write', data, block=False)
+
+    def close(self):
+        """Tunggu semua write antrian file ini tertulis, raise error I/O jika ada"""
+        if not self.closed.is_set():
+            self.pool.submit(self.lane, self, 'close', None)
+            self.closed.wait()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Selalu tunggu flush: byte yang sudah diterima harus ada di disk (resume .part)
+        if exc_type is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except Exception:
+                pass
+        return False
+
+class WriteBehindPool:
+    def __init__(self, io_workers=2, max_pending_bytes=DEFAULT_MAX_PENDING_BYTES):
+        self.io_workers = max(1, io_workers)
+        self.max_pending_bytes = max_pending_bytes
+        self.lanes = [Queue() for _ in range(self.io_workers)]
+        self.next_lane = itertools.count()
+        self.threads = []
+        self.pending_bytes = 0
+        self.capacity = threading.Condition()
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'files': 0,
+            'writes': 0,
+            'bytes': 0,
+            'backpressure_waits': 0,
+            'backpressure_time': 0.0,
+            'peak_pending_bytes': 0
+        }
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            for lane in self.lanes:
+                thread = threading.Thread(target=self.io_worker, args=(lane,), daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def open(self, path, mode='wb'):
+        """Buka file di thread I/O; semua operasi satu file lewat lane yang sama (urutan terjaga)"""
+        self.start()
+        lane = self.lanes[next(self.next_lane) % self.io_workers]
+        handle = WriteBehindFile(self, lane)
+        self.submit(lane, handle, 'open', (path, mode))
+        return handle
+
+    def submit(self, lane, handle, op, payload, block=True):
+        """Masukkan operasi ke lane; write menunggu jika byte antrian sudah penuh (backpressure)
+
+        block=False: write tidak menunggu, return False (tidak diantrikan) jika antrian penuh.
+        """
+        if op == 'write':
+            size = len(payload)
+            with self.capacity:
+                # Selalu izinkan satu buffer walau lebih besar dari batas, supaya tidak deadlock
+                if self.pending_bytes and self.pending_bytes + size > self.max_pending_bytes:
+                    if not block:
+                        return False
+                    started = time.monotonic()
+                    while self.pending_bytes and self.pending_bytes + size > self.max_pending_bytes:
+                        self.capacity.wait()
+                    with self.lock:
+                        self.stats['backpressure_waits'] += 1
+                        self.stats['backpressure_time'] += time.monotonic() - started
+                self.pending_bytes += size
+                with self.lock:
+                    self.stats['peak_pending_bytes'] = max(self.stats['peak_pending_bytes'], self.pending_bytes)
+
+        lane.put((handle, op, payload))
+        return True
+
+    def release(self, size):
+        with self.capacity:
+            self.pending_bytes -= size
+            self.capacity.notify_all()
+
+    def io_worker(self, lane):
+        """Thread I/O: jalankan open/write/close sesuai urutan antrian"""
+        while True:
+            handle, op, payload = lane.get()
+            try:
+                if op == 'open':
+                    path, mode = payload
+                    handle.f = open(path, mode)
+                    with self.lock:
+                        self.stats['files'] += 1
+                elif op == 'write':
+                    try:
+                        if handle.error is None:
+                            handle.f.write(payload)
+                            with self.lock:
+                                self.stats['writes'] += 1
+                                self.stats['bytes'] += len(payload)
+                    finally:
+                        self.release(len(payload))
+                elif op == 'close':
+                    if handle.f is not None:
+                        handle.f.close()
+                    handle.closed.set()
+            except Exception as e:
+                # Thread I/O tidak boleh mati; error dilaporkan lewat handle
+                handle.error = e
+                if op == 'close':
+                    handle.closed.set()
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats, io_workers=self.io_workers,
+                        backpressure_time=round(self.stats['backpressure_time'], 2))